@@ -0,0 +1,177 @@
+"""
+(헤드리스 일괄 처리) Tk 없이 매니페스트의 클립들을 프로세스 풀로 처리한다.
+
+클립마다: 구간 디코딩 → 품질 점수 계산(임시 파일 없음) → 상위 후보 선택 → 고른 프레임만 원본 PNG 저장.
+결과는 out_dir/results.json 에 클립이 끝날 때마다 기록되고, 다시 실행하면 성공한 행은 건너뛴다.
+
+매니페스트:
+    CSV  - 헤더 video,start,end (초 단위, 상대 경로는 매니페스트 폴더 기준)
+    JSON - [{"video": "...", "start": 1.5, "end": 4.0}, ...]
+
+사용 예:
+    python batch.py clips.csv --out batch_out
+    python batch.py clips.json --out batch_out --jobs 8 --count 4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from video_to_frames import (
+    info, warn, error, done,
+    VideoSource, get_video_meta, sec_to_frame_range, score_frames_span, extract_frames_at,
+    _init_worker
+)
+from frame_quality import FrameScorer
+from clip_queue import read_manifest, clip_dir_name
+from seek_index import load_or_build
+
+RESULTS_NAME = "results.json"
+
+
+def clip_key(clip: dict) -> str:
+    """결과 JSON 의 키 (행 순서가 바뀌어도 같은 클립은 같은 키)."""
+    return f"{clip['video']}|{clip['start']:g}|{clip['end']:g}"
+
+
+def load_results(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        warn(f"results unreadable, starting over: {path} ({e})")
+        return {}
+
+
+def save_results(path: Path, results: dict):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)  # 중간에 죽어도 결과 파일이 반쯤 써지지 않도록
+
+
+def process_clip(video_path: Path, start_sec: float, end_sec: float, out_root: Path,
+                 count: int = 4, seek_index: bool = True, verbose: bool = False) -> dict:
+    """
+    (워커 프로세스) 클립 1개 처리. 결과 dict 를 돌려준다 (실패 시 예외).
+    - 고른 프레임은 out_root/<영상이름>_<시작프레임>-<끝프레임>/ 에 GUI 와 같은 파일명 규칙으로 저장.
+    """
+    t0 = time.perf_counter()
+    log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        index = load_or_build(video_path, out_root / ".index") if seek_index else None
+        # 점수 계산과 선택 프레임 저장이 같은 캡처를 쓴다 (클립당 영상 1번만 열기)
+        with VideoSource(video_path, index, max_handles=1) as source:
+            _, fps = get_video_meta(source, index)
+            if fps <= 0:
+                raise RuntimeError("invalid FPS (0 or NaN).")
+            start_f, end_f = sec_to_frame_range(start_sec, end_sec, fps, index)
+
+            scorer = FrameScorer()
+            decoded = score_frames_span(source, start_f, end_f, scorer, index)
+            candidates = list(range(start_f, start_f + decoded))
+            k = min(count, len(candidates))
+            picked = scorer.pick_distinct(candidates, k)  # 거의 같은 장면은 되도록 피함 (모자라면 채움)
+
+            clip_dir = out_root / clip_dir_name(video_path, start_f, end_f)
+            saved = extract_frames_at(source, clip_dir, picked, base_frame=start_f,
+                                      frame_format="png", index=index)
+
+    names = {f: clip_dir / f"{f - start_f:06d}.png" for f in saved}
+    return {
+        "status": "ok",
+        "video": str(video_path),
+        "start": start_sec,
+        "end": end_sec,
+        "start_frame": start_f,
+        "end_frame": end_f,
+        "decoded": decoded,
+        "frames": [str(names[f]) for f in saved],
+        "frame_indices": saved,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def run_batch(manifest: Path, out_root: Path, jobs: int = 0, count: int = 4,
+              seek_index: bool = True, verbose: bool = False) -> dict:
+    """
+    (일괄 실행) 매니페스트 전체를 처리하고 요약 dict 를 돌려준다.
+    - jobs: 동시에 처리할 클립 수 (0 이하면 CPU 코어 수). 클립 하나는 프로세스 하나에서 처리.
+    - 이미 results.json 에 "ok" 로 기록된 클립은 건너뛴다 (중단 후 이어서 실행).
+    """
+    out_root.mkdir(parents=True, exist_ok=True)
+    results_path = out_root / RESULTS_NAME
+    results = load_results(results_path)
+
+    clips = read_manifest(manifest)
+    todo = [c for c in clips if results.get(clip_key(c), {}).get("status") != "ok"]
+    skipped = len(clips) - len(todo)
+    info(f"batch: {len(clips)} clips in manifest, {skipped} already done, {len(todo)} to process")
+    if not todo:
+        return {"clips": 0, "ok": 0, "failed": 0, "skipped": skipped, "seconds": 0.0, "clips_per_sec": 0.0}
+
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, len(todo))
+    ok = failed = 0
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as ex:
+        futures = {
+            ex.submit(process_clip, c["video"], c["start"], c["end"], out_root,
+                      count, seek_index, verbose): c
+            for c in todo
+        }
+        for fut in as_completed(futures):
+            clip = futures[fut]
+            key = clip_key(clip)
+            try:
+                results[key] = fut.result()
+                ok += 1
+            except Exception as e:
+                results[key] = {"status": "failed", "video": str(clip["video"]),
+                                "start": clip["start"], "end": clip["end"], "error": str(e)}
+                failed += 1
+                error(f"{key}: {e}")
+            # (재개) 클립이 끝날 때마다 기록 → 중단돼도 끝난 클립은 다시 안 함
+            save_results(results_path, results)
+
+            finished = ok + failed
+            if finished % 10 == 0 or finished == len(todo):
+                elapsed = time.perf_counter() - t0
+                info(f"batch: {finished}/{len(todo)} clips  {finished / elapsed:.2f} clips/s")
+
+    elapsed = time.perf_counter() - t0
+    summary = {
+        "clips": ok + failed,
+        "ok": ok,
+        "failed": failed,
+        "skipped": skipped,
+        "seconds": round(elapsed, 3),
+        "clips_per_sec": round((ok + failed) / elapsed, 3) if elapsed > 0 else 0.0,
+    }
+    done(f"batch: {ok} ok, {failed} failed, {skipped} skipped in {elapsed:.1f}s "
+         f"({summary['clips_per_sec']} clips/s) -> {results_path}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame selection over a manifest of clips")
+    parser.add_argument("manifest", type=Path, help="CSV (video,start,end) or JSON list")
+    parser.add_argument("--out", type=Path, required=True, help="output folder (frames + results.json)")
+    parser.add_argument("--jobs", type=int, default=0, help="parallel clips (0: CPU cores)")
+    parser.add_argument("--count", type=int, default=4, help="frames to keep per clip")
+    parser.add_argument("--no-seek-index", action="store_true", help="use container metadata only")
+    parser.add_argument("--verbose", action="store_true", help="show per-clip extraction logs")
+    args = parser.parse_args()
+
+    summary = run_batch(args.manifest, args.out, args.jobs, args.count,
+                        not args.no_seek_index, args.verbose)
+    if summary["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
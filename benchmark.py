@@ -0,0 +1,611 @@
+"""
+(벤치마크) 합성 영상으로 프레임 추출 성능을 측정한다.
+
+사용 예:
+    python benchmark.py parallel --size 1280x720 --frames 600
+    python benchmark.py parallel --workers 1 2 4 8 --json bench_parallel.json
+    python benchmark.py formats --size 1920x1080 --frames 120
+    python benchmark.py suite --json bench_now.json
+    python benchmark.py suite --baseline bench_base.json --json bench_now.json
+    python benchmark.py startup --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from video_to_frames import (
+    info, warn, done, extract_frames_range, extract_frames_span, extract_frames_at, get_video_meta,
+    iter_frames_at, write_frame, VideoSource
+)
+from thumb_cache import ThumbCache
+from frame_store import FrameStore
+from seek_index import SeekIndex
+
+
+def make_synthetic_video(path: Path, width: int, height: int, frames: int,
+                         fps: float = 30.0, fourcc: str = "mp4v", seed: int = 0) -> Path:
+    """
+    (합성 영상) 매번 같은 내용이 나오는 테스트 영상을 만든다.
+    - 고정 시드 노이즈 배경 + 움직이는 사각형 + 프레임 번호
+    - 노이즈가 있어야 PNG 압축이 실제 영상과 비슷한 비용이 된다.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"cannot create video ({fourcc}): {path}")
+
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    box = max(8, min(width, height) // 6)
+    for i in range(frames):
+        frame = np.roll(base, i * 3, axis=1)
+        x = (i * 7) % max(1, width - box)
+        y = (i * 5) % max(1, height - box)
+        frame[y:y + box, x:x + box] = (0, 0, 255)
+        cv2.putText(frame, str(i), (10, height // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                    max(1.0, height / 240), (255, 255, 255), 2)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def dir_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.iterdir() if p.is_file())
+
+
+def timed_extract(video: Path, out_dir: Path, start_sec: float, end_sec: float, **kwargs) -> dict:
+    """extract_frames_range 1회 실행 시간/처리량/디스크 사용량 측정 (로그는 숨김)."""
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        saved = extract_frames_range(video, out_dir, start_sec, end_sec, **kwargs)
+    elapsed = time.perf_counter() - t0
+    result = {
+        "frames": saved,
+        "seconds": round(elapsed, 4),
+        "fps": round(saved / elapsed, 2) if elapsed > 0 else 0.0,
+        "bytes": dir_bytes(out_dir),
+    }
+    shutil.rmtree(out_dir)
+    return result
+
+
+def _parse_size(text: str):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+# (중간 포맷) 비교할 (포맷, quality, 프록시 여부) 조합
+FORMAT_CASES = [
+    ("png", None, False), ("png", 1, False), ("png", 9, False),
+    ("jpg", 90, False), ("webp", 80, False),
+    ("npy", None, False),
+    ("png", None, True), ("jpg", 90, True),
+]
+
+
+def bench_formats(args) -> list[dict]:
+    """(중간 포맷) 포맷별 추출 처리량과 디스크 사용량."""
+    width, height = _parse_size(args.size)
+    with tempfile.TemporaryDirectory(prefix="fs_bench_") as tmp:
+        tmp = Path(tmp)
+        video = make_synthetic_video(tmp / "synthetic.mp4", width, height, args.frames, args.fps)
+        end_sec = (args.frames - 1) / args.fps
+
+        rows = []
+        proxy_size = _parse_size(args.proxy)
+        for fmt, quality, proxy in FORMAT_CASES:
+            r = timed_extract(video, tmp / "frames", 0, end_sec, writers=args.writers,
+                              frame_format=fmt, quality=quality,
+                              proxy_size=proxy_size if proxy else None)
+            r["format"] = fmt
+            r["quality"] = quality
+            r["proxy"] = args.proxy if proxy else None
+            r["bytes_per_frame"] = r["bytes"] // max(1, r["frames"])
+            rows.append(r)
+            info(f"{fmt:<4s} q={str(quality):<4s} proxy={str(r['proxy']):<8s} {r['fps']:7.1f} fps  "
+                 f"{r['bytes_per_frame'] / 1024:8.1f} KiB/frame")
+    return rows
+
+
+def bench_parallel(args) -> list[dict]:
+    """(병렬 추출) 워커 수별 처리량과 1 워커 대비 배율."""
+    width, height = _parse_size(args.size)
+    with tempfile.TemporaryDirectory(prefix="fs_bench_") as tmp:
+        tmp = Path(tmp)
+        video = make_synthetic_video(tmp / "synthetic.mp4", width, height, args.frames, args.fps)
+        end_sec = (args.frames - 1) / args.fps
+
+        worker_counts = args.workers or sorted({1, 2, 4, os.cpu_count() or 1})
+        rows = []
+        for n in worker_counts:
+            r = timed_extract(video, tmp / "frames", 0, end_sec, workers=n, writers=args.writers)
+            r["workers"] = n
+            rows.append(r)
+            info(f"workers={n:<3d} {r['frames']} frames  {r['seconds']:.2f}s  {r['fps']:.1f} fps")
+
+    base = next((r["fps"] for r in rows if r["workers"] == 1), rows[0]["fps"])
+    for r in rows:
+        r["speedup"] = round(r["fps"] / base, 2) if base else 0.0
+    return rows
+
+
+# (스위트) 기본 영상 목록 - 해상도/길이/FPS/코덱 축을 하나씩은 바꿔 가며 덮는다
+#  (size, frames, fps, fourcc)
+SUITE_VIDEOS = [
+    ("640x360", 240, 30.0, "mp4v"),
+    ("1280x720", 120, 30.0, "mp4v"),
+    ("1280x720", 120, 60.0, "MJPG"),
+    ("1920x1080", 60, 24.0, "mp4v"),
+    ("1920x1080", 60, 30.0, "XVID"),
+]
+FOURCC_EXT = {"mp4v": ".mp4", "MJPG": ".avi", "XVID": ".avi"}
+
+# (스위트) 추출 모드 → extract_frames_range 인자 ("sparse" 는 extract_frames_at 으로 따로 처리)
+SUITE_MODES = {
+    "serial": {},
+    "pipelined": {"writers": 4},
+    "parallel": {"workers": 0, "writers": 2},
+    "proxy": {"writers": 4, "proxy_size": (430, 220)},
+    "sparse": None,
+}
+SUITE_THUMB = (860, 440)    # run.py 기본 THUMB_SIZE
+SUITE_FIRST_BATCH = 48      # 앱 기본 STREAM_MIN_FRAMES (이만큼 모이면 첫 페이지 표시)
+
+
+def _peak_rss_mb():
+    """
+    이 프로세스와 (기다린) 자식 프로세스 중 최대 RSS (MB). 측정할 방법이 없으면 None.
+    - Linux 는 /proc 의 VmHWM 을 쓴다 (ru_maxrss 는 spawn 직전 부모의 RSS 까지 물려받음).
+    """
+    peak_kb = None
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    peak_kb = int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return round(peak_kb / 1024, 1) if peak_kb else None
+    scale = 1024 if sys.platform == "darwin" else 1  # macOS 는 바이트, Linux 는 KB
+    if peak_kb is None:
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return round(max(peak_kb, children_kb) / 1024, 1)
+
+
+def _load_thumb(fp, size):
+    """앱의 썸네일 경로와 같은 작업 (열기 → RGB → 축소). 걸린 시간(초) 반환."""
+    t0 = time.perf_counter()
+    img = Image.open(fp).convert("RGB")
+    img.thumbnail(size)
+    return time.perf_counter() - t0
+
+
+def _suite_case(video: str, mode: str, out_dir: str, conn):
+    """
+    (새 프로세스) 모드 1개 실행. 프로세스를 나눠야 peak RSS 가 케이스마다 따로 잡힌다.
+    - ttft: 확인 버튼 → 첫 썸네일 근사치 = 첫 진행 이벤트(SUITE_FIRST_BATCH 장)까지 + 첫 프레임 썸네일 로드
+    """
+    video, out_dir = Path(video), Path(out_dir)
+    try:
+        total, fps = get_video_meta(video)
+        end_sec = (total - 1) / fps
+        first = []
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if SUITE_MODES[mode] is None:
+                # (희소) 3 페이지 × 4 장만 추출 - 첫 페이지가 끝난 시점이 첫 진행 이벤트
+                picks = sorted(random.Random(0).sample(range(total), min(12, total)))
+                saved = len(extract_frames_at(video, out_dir, picks[:4]))
+                first.append(time.perf_counter())
+                saved += len(extract_frames_at(video, out_dir, picks[4:]))
+            else:
+                def on_progress(_):
+                    if not first:
+                        first.append(time.perf_counter())
+                saved = extract_frames_range(video, out_dir, 0, end_sec,
+                                             on_progress=on_progress,
+                                             progress_every=min(SUITE_FIRST_BATCH, total),
+                                             **SUITE_MODES[mode])
+        elapsed = time.perf_counter() - t0
+        first_file = min(out_dir.iterdir())
+        row = {
+            "frames": saved,
+            "seconds": round(elapsed, 4),
+            "fps": round(saved / elapsed, 2) if elapsed > 0 else 0.0,
+            "ttft": round(first[0] - t0 + _load_thumb(first_file, SUITE_THUMB), 4) if first else None,
+            "bytes": dir_bytes(out_dir),
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+        conn.send(row)
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def _run_isolated(video: Path, mode: str, out_dir: Path) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_suite_case, args=(str(video), mode, str(out_dir), child))
+    proc.start()
+    child.close()
+    try:
+        row = parent.recv()
+    except EOFError:
+        row = {"error": f"case process died (exit code {proc.exitcode})"}
+    proc.join()
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    return row
+
+
+def _bench_meta(video: Path, repeat: int = 5) -> dict:
+    """
+    get_video_meta 와 탐색 인덱스 스캔/읽기 시간 (ms).
+    - refetch_*: 프레임 1장 다시 읽기. reopen 은 매번 영상을 열고, shared 는 열린 VideoSource 재사용.
+    """
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        get_video_meta(video)
+    meta_ms = (time.perf_counter() - t0) / repeat * 1000
+
+    total, _ = get_video_meta(video)
+    target = [max(0, total // 2)]
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        list(iter_frames_at(video, target))
+    reopen_ms = (time.perf_counter() - t0) / repeat * 1000
+    with VideoSource(video) as source:
+        source.meta()  # 여는 비용은 처음 한 번 (앱 시작 시) 이미 낸 상태로 측정
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            list(iter_frames_at(source, target))
+        shared_ms = (time.perf_counter() - t0) / repeat * 1000
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        index = SeekIndex.build(video)
+    build_ms = (time.perf_counter() - t0) * 1000
+    sidecar = video.with_suffix(".seekidx.npz")
+    index.save(sidecar)
+    t0 = time.perf_counter()
+    SeekIndex.load(sidecar)
+    load_ms = (time.perf_counter() - t0) * 1000
+    return {"meta_ms": round(meta_ms, 3), "index_build_ms": round(build_ms, 3),
+            "index_load_ms": round(load_ms, 3), "refetch_reopen_ms": round(reopen_ms, 3),
+            "refetch_shared_ms": round(shared_ms, 3)}
+
+
+def _bench_thumbs(video: Path, work: Path, n: int = 24) -> dict:
+    """
+    (썸네일, 화면 없음) 앱과 같은 ThumbCache 경로로 디코딩+축소 시간 (ms/장).
+    - cold: 캐시 없음 (파일 디코딩 + 축소), warm: 캐시 적중,
+      derived: 중앙 썸네일에서 우측 패널 크기 만들기
+    - display_disk / display_mem: 디코딩된 프레임 → 표시용 썸네일까지
+      (PNG 쓰기 + 읽기/변환/축소 vs FrameStore 축소·RGBA 변환 1번 + frombuffer)
+    """
+    frames_dir = work / "thumbs"
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_frames_span(video, frames_dir, 0, n - 1)
+    files = sorted(frames_dir.iterdir())
+    cache = ThumbCache(lambda fp: Image.open(fp).convert("RGB"), max_mb=1024)
+    half = (SUITE_THUMB[0] // 2, SUITE_THUMB[1] // 2)
+
+    def per_thumb(fn):
+        t0 = time.perf_counter()
+        for fp in files:
+            fn(fp)
+        return round((time.perf_counter() - t0) / len(files) * 1000, 3)
+
+    row = {
+        "thumb_cold_ms": per_thumb(lambda fp: cache.get(fp, SUITE_THUMB)),
+        "thumb_warm_ms": per_thumb(lambda fp: cache.get(fp, SUITE_THUMB)),
+        "thumb_derived_ms": per_thumb(lambda fp: cache.get(fp, half, derive_from=SUITE_THUMB)),
+    }
+    shutil.rmtree(frames_dir)
+
+    frames = list(iter_frames_at(video, range(n)))
+    frames_dir.mkdir()
+    disk = ThumbCache(lambda fp: Image.open(fp).convert("RGB"), max_mb=1024)
+    t0 = time.perf_counter()
+    for f, frame in frames:
+        fp = frames_dir / f"{f:06d}.png"
+        write_frame(fp, frame)
+        disk.get(fp, SUITE_THUMB)
+    row["display_disk_ms"] = round((time.perf_counter() - t0) / len(frames) * 1000, 3)
+    shutil.rmtree(frames_dir)
+
+    store = FrameStore(SUITE_THUMB, max_mb=4096)
+    mem = ThumbCache(store.image, max_mb=1024, stamp=store.version)
+    t0 = time.perf_counter()
+    for f, frame in frames:
+        key = frames_dir / f"{f:06d}.mem"
+        store.put(key, frame)
+        mem.get(key, SUITE_THUMB)
+    row["display_mem_ms"] = round((time.perf_counter() - t0) / len(frames) * 1000, 3)
+    return row
+
+
+def _bench_clicks(video: Path, work: Path, rounds: int = 10) -> dict:
+    """
+    (클릭 지연, 화면 필요) 실제 앱 창에서 썸네일 클릭 1번 → 화면 반영(update_idletasks)까지 (ms/클릭, 중앙값).
+    - click_ms: 지금 방식 (클릭한 셀의 테두리 + 우측 패널의 달라진 칸만 고침)
+    - click_rebuild_ms: 예전 방식 (페이지의 셀 위젯 + 우측 패널을 전부 지우고 다시 만듦)
+    - 두 장 선택 → 두 장 해제를 rounds 번 (썸네일은 모두 캐시에 있는 상태)
+    화면이 없으면 빈 dict.
+    """
+    import tkinter as tk
+    from frame_selector import FrameSelectorApp
+    try:
+        app = FrameSelectorApp(video, work / "clicks", thumb_size=SUITE_THUMB,
+                               seek_index=False, timeline_frames=0)
+    except tk.TclError:
+        return {}
+
+    def pump(ready, timeout: float = 60.0):
+        deadline = time.perf_counter() + timeout
+        while not ready():
+            if time.perf_counter() > deadline:
+                raise RuntimeError("app did not become ready")
+            app.update()
+            time.sleep(0.005)
+
+    def click(fp, rebuild: bool) -> float:
+        t0 = time.perf_counter()
+        if rebuild:
+            if fp in app.selected_files:
+                app.selected_files.remove(fp)
+            else:
+                app.selected_files.append(fp)
+            app._render_thumbs(app.shown_stages[app.stage_idx], keep_scroll=True, rebuild=True)
+            app._refresh_selected_panel(rebuild=True)
+        else:
+            app._toggle_select(fp)
+        app.update_idletasks()
+        return (time.perf_counter() - t0) * 1000
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pump(lambda: app.video_ready)
+            app._begin_extraction(0.0, min(app.duration_sec, 2.0))
+            pump(lambda: app.thumb_grid is not None and not app._extracting
+                 and all(c.tkimg is not None for c in app.thumb_grid.cells()))
+            a, b = [c.item for c in app.thumb_grid.cells()][:2]
+            row = {}
+            for key, rebuild in (("click_rebuild_ms", True), ("click_ms", False)):
+                times = [click(fp, rebuild) for _ in range(rounds) for fp in (a, b, b, a)]
+                row[key] = round(statistics.median(times), 3)
+            app._cleanup_frames_dir()
+    finally:
+        app._close_app()
+    return row
+
+
+def _suite_videos(args):
+    """명령줄에서 축을 주면 그 조합 전체, 아니면 SUITE_VIDEOS."""
+    if not (args.sizes or args.frames or args.fps or args.codecs):
+        return SUITE_VIDEOS
+    return [(size, frames, fps, codec)
+            for size in (args.sizes or ["1280x720"])
+            for frames in (args.frames or [120])
+            for fps in (args.fps or [30.0])
+            for codec in (args.codecs or ["mp4v"])]
+
+
+def compare_baseline(rows: list[dict], baseline: list[dict], tolerance: float) -> list[dict]:
+    """
+    (기준 비교) 같은 case 끼리 fps(클수록 좋음) / ttft, *_ms(작을수록 좋음)를 비교해
+    tolerance 비율 이상 나빠진 항목 목록을 돌려준다.
+    """
+    base = {r["case"]: r for r in baseline}
+    worse = []
+    for r in rows:
+        b = base.get(r["case"])
+        if b is None:
+            continue
+        for key, val in r.items():
+            old = b.get(key)
+            if not isinstance(val, (int, float)) or not isinstance(old, (int, float)) or old <= 0:
+                continue
+            if key == "fps":
+                change = (old - val) / old
+            elif key == "ttft" or key.endswith("_ms"):
+                change = (val - old) / old
+            else:
+                continue
+            if change > tolerance:
+                worse.append({"case": r["case"], "metric": key, "baseline": old, "now": val,
+                              "change": round(change, 3)})
+    return worse
+
+
+def bench_suite(args) -> dict:
+    """(스위트) 영상 × 모드별 fps / ttft / 바이트 / peak RSS + 메타·썸네일·클릭 시간."""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="fs_bench_") as tmp:
+        tmp = Path(tmp)
+        for size, frames, fps, codec in _suite_videos(args):
+            width, height = _parse_size(size)
+            vid_id = f"{size}-{frames}f-{fps:g}fps-{codec}"
+            try:
+                video = make_synthetic_video(tmp / f"{vid_id}{FOURCC_EXT.get(codec, '.avi')}",
+                                             width, height, frames, fps, codec)
+            except RuntimeError as e:
+                warn(f"skip {vid_id}: {e}")
+                continue
+
+            r = {"case": f"{vid_id}/meta+thumbs", "video": vid_id}
+            r.update(_bench_meta(video))
+            r.update(_bench_thumbs(video, tmp))
+            r.update(_bench_clicks(video, tmp))
+            rows.append(r)
+            info(f"{vid_id:<28s} meta {r['meta_ms']:.1f} ms  index {r['index_build_ms']:.1f} ms  "
+                 f"refetch {r['refetch_reopen_ms']:.1f} -> {r['refetch_shared_ms']:.1f} ms  "
+                 f"thumb cold {r['thumb_cold_ms']:.1f} / warm {r['thumb_warm_ms']:.3f} ms  "
+                 f"display disk {r['display_disk_ms']:.1f} / memory {r['display_mem_ms']:.1f} ms")
+            if "click_ms" in r:
+                info(f"{vid_id:<28s} click {r['click_rebuild_ms']:.2f} ms (rebuild) -> {r['click_ms']:.2f} ms")
+
+            for mode in args.modes or SUITE_MODES:
+                r = {"case": f"{vid_id}/{mode}", "video": vid_id, "mode": mode}
+                r.update(_run_isolated(video, mode, tmp / "frames"))
+                rows.append(r)
+                if "error" in r:
+                    warn(f"{r['case']}: {r['error']}")
+                    continue
+                info(f"{r['case']:<38s} {r['fps']:7.1f} fps  ttft {r['ttft']}s  "
+                     f"{r['bytes'] / 1024 ** 2:7.1f} MB  rss {r['peak_rss_mb']} MB")
+            video.unlink()
+
+    report = {
+        "env": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": rows,
+    }
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["regressions"] = compare_baseline(rows, baseline["results"], args.tolerance)
+        for w in report["regressions"]:
+            warn(f"regression {w['case']} {w['metric']}: {w['baseline']} -> {w['now']} "
+                 f"({w['change']:+.0%})")
+        if not report["regressions"]:
+            done(f"no regressions beyond {args.tolerance:.0%} vs {args.baseline}")
+    return report
+
+
+# (시작 시간) 새 인터프리터에서 실행하는 측정 코드 - import 캐시가 없는 상태를 재려고 매번 새 프로세스
+#  gui_import: 창을 띄우기 전에 기다리는 import (frame_selector)
+#  window: Tk 창 + 첫 그리기 (화면이 없으면 null)
+#  heavy_import: 백그라운드 프로브가 하는 cv2 / numpy / PIL 모듈 import
+#  probe: 영상 열기 + 메타 읽기
+_STARTUP_PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import frame_selector
+t1 = time.perf_counter()
+window = None
+try:
+    import tkinter as tk
+    root = tk.Tk()
+    root.update()
+    window = (time.perf_counter() - t1) * 1000
+    root.destroy()
+except Exception:
+    pass
+t2 = time.perf_counter()
+import video_to_frames, thumb_cache, frame_cache, frame_quality, seek_index, PIL.ImageTk
+t3 = time.perf_counter()
+with video_to_frames.VideoSource(sys.argv[1]) as source:
+    source.meta()
+t4 = time.perf_counter()
+print(json.dumps({"gui_import_ms": (t1 - t0) * 1000, "window_ms": window,
+                  "heavy_import_ms": (t3 - t2) * 1000, "probe_ms": (t4 - t3) * 1000}))
+"""
+
+
+def bench_startup(args) -> dict:
+    """
+    (시작 시간) 창이 뜨기까지(gui_import + window)와 확인 버튼이 켜지기까지(+ heavy_import + probe)를
+    새 프로세스로 repeat 번 재서 중앙값 (ms). eager_ms 는 예전처럼 전부 끝낸 뒤 창을 띄웠을 때의 값.
+    """
+    with tempfile.TemporaryDirectory(prefix="fs_bench_") as tmp:
+        width, height = _parse_size(args.size)
+        video = make_synthetic_video(Path(tmp) / "synthetic.mp4", width, height, args.frames)
+        runs = []
+        for _ in range(args.repeat):
+            out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE, str(video)],
+                                 cwd=Path(__file__).resolve().parent,
+                                 capture_output=True, text=True, check=True)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    row = {}
+    for key in runs[0]:
+        vals = [r[key] for r in runs if r[key] is not None]
+        row[key] = round(statistics.median(vals), 1) if vals else None
+    window = row["window_ms"] or 0.0
+    row["first_window_ms"] = round(row["gui_import_ms"] + window, 1)
+    row["eager_ms"] = round(row["gui_import_ms"] + row["heavy_import_ms"] + row["probe_ms"] + window, 1)
+    row["repeat"] = args.repeat
+    info(f"window after {row['first_window_ms']} ms (was {row['eager_ms']} ms with eager imports + probe), "
+         f"background: imports {row['heavy_import_ms']} ms, probe {row['probe_ms']} ms")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame selector benchmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("parallel", help="extraction throughput vs. worker count")
+    p.add_argument("--size", default="1280x720")
+    p.add_argument("--frames", type=int, default=600)
+    p.add_argument("--fps", type=float, default=30.0)
+    p.add_argument("--workers", type=int, nargs="*")
+    p.add_argument("--writers", type=int, default=0, help="writer threads per worker")
+    p.add_argument("--json", type=Path, help="write results to this JSON file")
+    p.set_defaults(func=bench_parallel)
+
+    p = sub.add_parser("formats", help="extraction throughput and disk usage per frame format")
+    p.add_argument("--size", default="1280x720")
+    p.add_argument("--frames", type=int, default=240)
+    p.add_argument("--fps", type=float, default=30.0)
+    p.add_argument("--writers", type=int, default=0, help="writer threads")
+    p.add_argument("--proxy", default="430x220", help="proxy size for the proxy cases")
+    p.add_argument("--json", type=Path, help="write results to this JSON file")
+    p.set_defaults(func=bench_formats)
+
+    p = sub.add_parser("suite", help="extraction modes x synthetic videos, meta and thumbnail timings")
+    p.add_argument("--sizes", nargs="*", help="e.g. 640x360 1920x1080 (default: built-in matrix)")
+    p.add_argument("--frames", type=int, nargs="*")
+    p.add_argument("--fps", type=float, nargs="*")
+    p.add_argument("--codecs", nargs="*", help="fourcc codes, e.g. mp4v MJPG XVID")
+    p.add_argument("--modes", nargs="*", choices=list(SUITE_MODES))
+    p.add_argument("--baseline", type=Path, help="earlier suite JSON to compare against")
+    p.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown ratio")
+    p.add_argument("--json", type=Path, help="write results to this JSON file")
+    p.set_defaults(func=bench_suite)
+
+    p = sub.add_parser("startup", help="import and window/probe time of a fresh process")
+    p.add_argument("--size", default="1920x1080")
+    p.add_argument("--frames", type=int, default=30)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--json", type=Path, help="write results to this JSON file")
+    p.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    rows = args.func(args)
+
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        done(f"results written to {args.json}")
+    else:
+        print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
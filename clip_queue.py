@@ -0,0 +1,91 @@
+"""
+(큐 모드) 영상 여러 개를 한 창에서 차례로 고를 때의 클립 목록.
+
+클립 목록:
+    폴더      - 안의 영상 파일(VIDEO_EXTS)을 이름 순으로, 구간은 영상 전체
+    CSV/JSON  - batch.py 와 같은 매니페스트 (video,start,end 초 단위)
+    리스트    - 영상 경로 또는 {"video": ..., "start": ..., "end": ...} 를 섞어서
+
+cv2 를 쓰지 않는 가벼운 모듈이라 run.py / GUI 시작 시간에 영향을 주지 않는다.
+"""
+import csv
+import io
+import json
+from pathlib import Path
+
+VIDEO_EXTS = (".mp4", ".mov", ".mkv", ".avi", ".webm", ".m4v")
+
+
+def read_manifest(path: Path) -> list[dict]:
+    """CSV / JSON 매니페스트 → [{"video": Path, "start": float, "end": float}, ...]"""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        rows = json.loads(text)
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+    clips = []
+    for i, row in enumerate(rows):
+        try:
+            video = Path(row["video"])
+            start, end = float(row["start"]), float(row["end"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path}: bad manifest row {i + 1}: {row!r} ({e})") from None
+        if not video.is_absolute():
+            video = path.parent / video
+        clips.append({"video": video, "start": start, "end": end})
+    return clips
+
+
+def load_queue(spec) -> list[dict]:
+    """
+    폴더 / 매니페스트 / 리스트 → [{"video": Path, "start": float, "end": float 또는 None}, ...]
+    - end 가 None 이면 영상 끝까지 (영상 길이는 열어 봐야 알 수 있으므로 앱이 채움)
+    """
+    if isinstance(spec, (str, Path)):
+        path = Path(spec)
+        if path.is_dir():
+            videos = sorted(p for p in path.iterdir() if p.suffix.lower() in VIDEO_EXTS)
+            if not videos:
+                raise ValueError(f"no videos in {path} ({', '.join(VIDEO_EXTS)})")
+            return [{"video": p, "start": 0.0, "end": None} for p in videos]
+        return read_manifest(path)
+
+    clips = []
+    for item in spec:
+        if isinstance(item, dict):
+            end = item.get("end")
+            clips.append({"video": Path(item["video"]), "start": float(item.get("start", 0.0)),
+                          "end": None if end is None else float(end)})
+        else:
+            clips.append({"video": Path(item), "start": 0.0, "end": None})
+    if not clips:
+        raise ValueError("empty clip queue")
+    return clips
+
+
+def clip_dir_name(video_path: Path, start_f: int, end_f: int) -> str:
+    """클립별 결과 폴더 이름 (batch.py / 큐 모드 내보내기 공통)."""
+    return f"{Path(video_path).stem}_{start_f:06d}-{end_f:06d}"
+
+
+class PreparedClip:
+    """
+    (다음 클립 미리 준비) 백그라운드에서 열고 추출까지 끝낸 클립 - 앱이 그대로 넘겨받는다.
+    - frames 가 None 이면 영상만 열어 둔 상태 (희소/캐시 모드, 또는 기다릴 틈 없이 넘어온 경우)
+    """
+
+    def __init__(self, pos: int, clip: dict, source, seek_index, total: int, fps: float,
+                 workspace, output_dir: Path):
+        self.pos = pos                    # 큐 안의 순번
+        self.clip = clip
+        self.source = source              # video_to_frames.VideoSource (열린 캡처/메타)
+        self.seek_index = seek_index
+        self.total, self.fps = total, fps
+        self.workspace = workspace        # 이 클립의 세션 폴더
+        self.output_dir = output_dir
+        self.start_f = self.end_f = 0
+        self.stride = 1
+        self.frames = None                # 추출한 프레임 인덱스 (정렬됨)
+        self.scorer = None
+        self.first_stage = None           # 첫 페이지에 보일 파일 (썸네일까지 디코딩해 둠)
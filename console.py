@@ -0,0 +1,6 @@
+# (콘솔 로그) 모든 모듈이 같이 쓰는 출력 헬퍼
+#  - cv2 / numpy 를 import 하지 않으므로 GUI 가 무거운 모듈보다 먼저 불러도 시작이 느려지지 않는다
+def info(msg):  print(f"[info] {msg}")
+def warn(msg):  print(f"[warn] {msg}")
+def error(msg): print(f"[error] {msg}")
+def done(msg):  print(f"[done] {msg}")
@@ -0,0 +1,128 @@
+import errno
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from console import info
+from instrument import count
+from video_to_frames import read_frame, write_frame, frame_ext
+
+# (내보내기 변형) (포맷, 품질, 최대 크기) - 품질/크기가 None 이면 포맷 기본값 / 원본 해상도
+#  예: ("png", None, None) 원본 무손실, ("jpg", 90, None), ("webp", 80, (1280, 720))
+DEFAULT_VARIANTS = (("png", None, None),)
+
+FICLONE = 0x40049409  # Linux ioctl: 같은 파일시스템(btrfs/XFS 등)에서 데이터 블록 공유 복사
+
+
+def variant_name(stem: str, frame_format: str, quality=None, size=None) -> str:
+    """변형별 파일명. 원본 PNG 는 예전과 같은 이름 (예: 000123.png, 000123_1280x720_q80.webp)."""
+    parts = [stem]
+    if size:
+        parts.append(f"{size[0]}x{size[1]}")
+    if quality is not None:
+        parts.append(f"q{quality}")
+    return "_".join(parts) + frame_ext(frame_format)
+
+
+def unique_dest_path(dest_dir: Path, base_name: str) -> Path:
+    """
+    이름 충돌 시 *_1, *_2 ... 붙여서 고유 경로를 만들고, 빈 파일로 자리를 먼저 잡아 둔다.
+    - O_CREAT | O_EXCL 로 만들기 때문에 여러 스레드/프로세스가 동시에 내보내도 같은 이름을 받지 않는다.
+    - 돌려받은 경로는 호출자가 덮어쓴다 (실패하면 지워야 함).
+    """
+    stem, ext = os.path.splitext(base_name)
+    i = 0
+    while True:
+        cand = dest_dir / (base_name if i == 0 else f"{stem}_{i}{ext}")
+        try:
+            fd = os.open(cand, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            i += 1
+            continue
+        os.close(fd)
+        return cand
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """(Linux) 블록 공유 복사. 지원하지 않는 파일시스템/OS 면 False."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    try:
+        with open(src, "rb") as fs, open(dst, "r+b") as fd:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def link_or_copy(src: Path, dst: Path, hardlink: bool = True) -> str:
+    """
+    src → dst (dst 는 unique_dest_path 로 잡아 둔 자리). 쓴 방법을 돌려준다.
+    - 하드링크 → reflink → 복사 순으로 시도 (다른 파일시스템이면 링크는 EXDEV 로 실패).
+    - hardlink=False: 원본이 계속 남는 파일(영구 캐시 등)이면 끈다. 내보낸 파일을 제자리에서 고치면
+      원본도 같이 바뀌기 때문.
+    """
+    if hardlink:
+        tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            os.link(src, tmp)
+            os.replace(tmp, dst)  # 잡아 둔 빈 파일 자리를 링크로 교체
+            return "link"
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES):
+                raise
+    if _reflink(src, dst):
+        return "reflink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def export_frames(items, dest_dir: Path, variants=DEFAULT_VARIANTS, workers: int = 0,
+                  hardlink: bool = True) -> list[Path]:
+    """
+    (내보내기) 선택한 프레임마다 variants 의 포맷/품질/크기로 저장한다 (스레드 풀에서 병렬 인코딩).
+    - items: [(이름, 원본 해상도 무손실 PNG 파일 또는 None, BGR 프레임 또는 None)]
+      · 원본 PNG 변형 ("png", None, None) 은 파일이 있으면 인코딩 없이 링크/복사
+      · 나머지 변형은 프레임을 인코딩 (프레임이 없으면 파일에서 1번 읽음)
+    - workers: 인코딩 스레드 수 (0 이하: CPU 코어 수). cv2.imwrite 는 GIL 을 놓으므로 스레드로 충분.
+    반환값: 저장한 경로 리스트 (items × variants 순서)
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    variants = list(variants) or list(DEFAULT_VARIANTS)
+    lossless = ("png", None, None)
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+
+    def load(item):
+        name, path, frame = item
+        needs_frame = any(v != lossless or path is None for v in variants)
+        if frame is None and needs_frame:
+            frame = read_frame(path)
+            if frame is None:
+                raise RuntimeError(f"cannot read frame: {path}")
+        return name, path, frame
+
+    def save(item, variant):
+        name, path, frame = item
+        fmt, quality, size = variant
+        target = unique_dest_path(dest_dir, variant_name(name, fmt, quality, size))
+        try:
+            if variant == lossless and path is not None:
+                count(f"export_{link_or_copy(Path(path), target, hardlink)}")
+            elif not write_frame(target, frame, fmt, quality, proxy_size=size):
+                raise RuntimeError(f"failed to write image: {target}")
+        except BaseException:
+            target.unlink(missing_ok=True)  # 잡아 둔 빈 자리 정리
+            raise
+        return target
+
+    with ThreadPoolExecutor(max_workers=min(workers, max(1, len(items) * len(variants))),
+                            thread_name_prefix="export") as ex:
+        loaded = list(ex.map(load, items))
+        futures = [ex.submit(save, item, v) for item in loaded for v in variants]
+        saved = [fut.result() for fut in futures]
+    info(f"export: {len(saved)} files ({len(items)} frames x {len(variants)} variants) -> {dest_dir}")
+    return saved
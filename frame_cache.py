@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from video_to_frames import info, warn, frame_ext
+from instrument import span
+
+CACHE_PAD = 8  # 캐시 파일명은 영상 기준 절대 프레임 인덱스 (예: 00001234.png)
+
+
+def video_fingerprint(video_path: Path, sample_bytes: int = 1 << 20) -> str:
+    """
+    (영상 지문) 파일 크기 + mtime + 앞/뒤 sample_bytes 의 해시.
+    - 전체 해시는 큰 영상에서 느리므로 일부만 읽는다.
+    - 같은 파일을 덮어쓰면 mtime/크기가 바뀌어 다른 지문이 된다.
+    """
+    st = os.stat(video_path)
+    h = hashlib.sha1(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    with open(video_path, "rb") as fh:
+        h.update(fh.read(sample_bytes))
+        if st.st_size > sample_bytes:
+            fh.seek(max(sample_bytes, st.st_size - sample_bytes))
+            h.update(fh.read(sample_bytes))
+    return h.hexdigest()[:16]
+
+
+def cache_variant(frame_format: str = "png", quality=None, proxy_size=None) -> str:
+    """저장 옵션이 다르면 같은 프레임이라도 파일이 다르므로 캐시 폴더를 나눈다."""
+    q = "def" if quality is None else str(int(quality))
+    size = "full" if proxy_size is None else f"{proxy_size[0]}x{proxy_size[1]}"
+    return f"{frame_format}-q{q}-{size}"
+
+
+def _to_runs(indices) -> list[list[int]]:
+    """정렬된 인덱스들 → [[a, b], ...] 연속 구간 (양끝 포함)."""
+    runs = []
+    for f in sorted(indices):
+        if runs and f == runs[-1][1] + 1:
+            runs[-1][1] = f
+        else:
+            runs.append([f, f])
+    return runs
+
+
+class CacheEntry:
+    """
+    (캐시 항목) 영상 1개 × 저장 옵션 1개에 해당하는 프레임 폴더.
+    - manifest.json 에 이미 저장된 프레임 인덱스(연속 구간 목록)와 용량/최근 사용 시각을 기록한다.
+    """
+
+    def __init__(self, path: Path, video_path: Path, variant: str):
+        self.dir = path
+        self.ext = frame_ext(variant.split("-", 1)[0])
+        self._manifest = path / "manifest.json"
+        self._scores = path / "scores.npy"     # 품질 점수 [frame_idx, sharp, bright, contrast]
+        self._hashes = path / "hashes.npy"     # 지각 해시 [frame_idx, hash] (uint64)
+        self._lock = threading.Lock()
+        self.indices = set()
+        self.bytes = 0
+        self.video = str(video_path)
+        self.variant = variant
+        self._load()
+
+    def _load(self):
+        if not self._manifest.exists():
+            return
+        try:
+            data = json.loads(self._manifest.read_text(encoding="utf-8"))
+            for a, b in data.get("runs", []):
+                self.indices.update(range(a, b + 1))
+            self.bytes = int(data.get("bytes", 0))
+        except (OSError, ValueError) as e:
+            # 깨진 manifest 는 빈 캐시로 취급 (파일은 다시 채워짐)
+            warn(f"cache manifest unreadable, starting empty: {self._manifest} ({e})")
+            self.indices = set()
+            self.bytes = 0
+
+    def path(self, frame_idx: int) -> Path:
+        return self.dir / f"{frame_idx:0{CACHE_PAD}d}{self.ext}"
+
+    def has(self, frame_idx: int) -> bool:
+        return frame_idx in self.indices
+
+    def missing_runs(self, start_f: int, end_f: int, stride: int = 1) -> list[list[int]]:
+        """
+        start_f ~ end_f 중 아직 없는 프레임들의 연속 구간.
+        - stride > 1 이면 start_f, start_f + stride, ... 격자만 보고, 격자 위에서 연속인 구간을 돌려준다.
+        """
+        grid = range(start_f, end_f + 1, stride)
+        runs = _to_runs(i for i, f in enumerate(grid) if f not in self.indices)
+        return [[grid[a], grid[b]] for a, b in runs]
+
+    def add(self, frame_indices):
+        """새로 저장된 프레임들을 기록하고 manifest 를 갱신한다 (여러 스레드에서 호출 가능)."""
+        frame_indices = list(frame_indices)
+        with self._lock:
+            new = [f for f in frame_indices if f not in self.indices]
+            for f in new:
+                try:
+                    self.bytes += self.path(f).stat().st_size
+                except OSError:
+                    continue
+                self.indices.add(f)
+            self._save()
+
+    def load_scores(self) -> dict:
+        """저장해 둔 품질 점수 {frame_idx: (sharp, bright, contrast)} (없으면 빈 dict)."""
+        try:
+            arr = np.load(self._scores)
+        except (OSError, ValueError):
+            return {}
+        return {int(row[0]): tuple(float(v) for v in row[1:]) for row in arr}
+
+    def save_scores(self, metrics: dict, hashes: dict = None):
+        if metrics:
+            self._save_array(self._scores,
+                             np.array([(f, *m) for f, m in sorted(metrics.items())], dtype=np.float64))
+        if hashes:
+            self._save_array(self._hashes, np.array(sorted(hashes.items()), dtype=np.uint64))
+
+    def load_hashes(self) -> dict:
+        """저장해 둔 지각 해시 {frame_idx: hash} (없으면 빈 dict)."""
+        try:
+            arr = np.load(self._hashes)
+        except (OSError, ValueError):
+            return {}
+        return {int(f): int(h) for f, h in arr}
+
+    def _save_array(self, path: Path, arr: np.ndarray):
+        tmp = path.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp, "wb") as fh:
+                np.save(fh, arr)
+            os.replace(tmp, path)
+
+    def touch(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        data = {
+            "video": self.video,
+            "variant": self.variant,
+            "runs": _to_runs(self.indices),
+            "bytes": self.bytes,
+            "last_used": time.time(),
+        }
+        tmp = self._manifest.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self._manifest)  # 중간에 죽어도 manifest 가 반쯤 써지지 않도록
+
+
+class FrameCache:
+    """
+    (영구 프레임 캐시) 실행/시간 재설정을 넘어 추출한 프레임을 재사용한다.
+    - 구조: root/<영상 지문>/<저장 옵션>/<절대 프레임 인덱스>.<ext> + manifest.json
+    - max_gb 를 넘으면 가장 오래 안 쓴 항목(영상×옵션 폴더)부터 통째로 지운다.
+    """
+
+    def __init__(self, root: Path, max_gb: float = 20):
+        self.root = Path(root)
+        self.max_bytes = int(max_gb * 1024 ** 3)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def open(self, video_path: Path, variant: str) -> CacheEntry:
+        path = self.root / video_fingerprint(video_path) / variant
+        path.mkdir(parents=True, exist_ok=True)
+        entry = CacheEntry(path, video_path, variant)
+        entry.touch()  # 최근 사용 시각 갱신 (LRU)
+        info(f"frame cache: {path} ({len(entry.indices)} frames cached)")
+        return entry
+
+    def _entries(self):
+        """(manifest 경로, 용량, 최근 사용 시각) 목록."""
+        out = []
+        with span("glob"):
+            manifests = list(self.root.glob("*/*/manifest.json"))
+        for m in manifests:
+            try:
+                data = json.loads(m.read_text(encoding="utf-8"))
+                out.append((m.parent, int(data.get("bytes", 0)), float(data.get("last_used", 0))))
+            except (OSError, ValueError):
+                out.append((m.parent, 0, 0.0))
+        return out
+
+    def evict(self, keep: CacheEntry = None) -> int:
+        """
+        (LRU 정리) 전체 용량이 max_bytes 이하가 될 때까지 오래된 항목부터 삭제.
+        - keep: 지금 쓰는 항목은 지우지 않는다.
+        반환값: 지운 바이트 수
+        """
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(e[1] for e in entries)
+        freed = 0
+        for path, nbytes, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == keep.dir:
+                continue
+            with span("rmtree"):
+                shutil.rmtree(path, ignore_errors=True)
+            # 영상 폴더가 비면 같이 제거
+            try:
+                path.parent.rmdir()
+            except OSError:
+                pass
+            total -= nbytes
+            freed += nbytes
+            info(f"frame cache: evicted {path} ({nbytes / 1024 ** 2:.1f} MB)")
+        return freed
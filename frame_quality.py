@@ -0,0 +1,276 @@
+import math
+import random
+import threading
+
+import cv2
+import numpy as np
+
+SCORE_WIDTH = 160   # (설정) 점수 계산용 축소 폭 (높이는 비율 유지)
+BATCH_SIZE = 32     # (설정) 이만큼 모이면 한 번에 NumPy 로 계산
+HASH_SIZE = 8       # (설정) 지각 해시 격자 (8x8 = 64비트)
+DEDUP_DISTANCE = 6  # (설정) 해시 해밍 거리가 이 이하면 같은 장면으로 보고 후보에서 뺌 (0: 끔)
+
+# 바이트 값 → 켜진 비트 수 (해밍 거리 계산용 표)
+_POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def small_gray(frame, width: int = SCORE_WIDTH) -> np.ndarray:
+    """BGR 프레임 → 폭 width 로 줄인 그레이스케일 uint8 (INTER_AREA)."""
+    h, w = frame.shape[:2]
+    height = max(3, int(round(h * width / w)))
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def batch_metrics(grays: np.ndarray) -> np.ndarray:
+    """
+    (벡터화 점수) (N, H, W) uint8 그레이 묶음 → (N, 3) [sharpness, brightness, contrast].
+    - sharpness: 라플라시안 분산 (흐림/모션 블러일수록 작음)
+    - brightness: 평균 밝기 0~1 (노출)
+    - contrast: 밝기 표준편차 0~1
+    """
+    g = grays.astype(np.float32) / 255.0
+    lap = (4.0 * g[:, 1:-1, 1:-1]
+           - g[:, :-2, 1:-1] - g[:, 2:, 1:-1]
+           - g[:, 1:-1, :-2] - g[:, 1:-1, 2:])
+    sharp = lap.reshape(len(g), -1).var(axis=1)
+    flat = g.reshape(len(g), -1)
+    return np.stack([sharp, flat.mean(axis=1), flat.std(axis=1)], axis=1)
+
+
+def batch_hashes(grays: np.ndarray) -> np.ndarray:
+    """
+    (벡터화 지각 해시) (N, H, W) uint8 그레이 묶음 → (N,) uint64 평균 해시 (aHash).
+    - 축소본을 8x8 칸으로 나눠 칸 합을 구하고 (reshape 합 - 정수 연산, 축소 1번 더 하는 것보다 빠름),
+      전체 평균보다 밝은 칸이 1인 64비트
+    - 밝기/압축 차이에는 거의 안 바뀌고 구도가 바뀌어야 달라진다 → 해밍 거리가 작으면 거의 같은 장면
+    """
+    n, h, w = grays.shape
+    if h < HASH_SIZE or w < HASH_SIZE:
+        grays = np.stack([cv2.resize(g, (max(w, HASH_SIZE), max(h, HASH_SIZE)),
+                                     interpolation=cv2.INTER_NEAREST) for g in grays])
+        n, h, w = grays.shape
+    ch, cw = h // HASH_SIZE, w // HASH_SIZE
+    g = grays[:, :ch * HASH_SIZE, :cw * HASH_SIZE].astype(np.uint32)
+    cells = (g.reshape(n * HASH_SIZE, ch, cw * HASH_SIZE).sum(axis=1)     # 칸 높이 방향 합
+             .reshape(n, HASH_SIZE, HASH_SIZE, cw).sum(axis=3)          # 칸 폭 방향 합
+             .reshape(n, -1))
+    bits = cells * cells.shape[1] > cells.sum(axis=1, keepdims=True)  # 칸 > 칸들의 평균
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def hamming(a, b) -> np.ndarray:
+    """uint64 해시 a (M,) × b (N,) → (M, N) 해밍 거리 (XOR 후 켜진 비트 수)."""
+    x = np.bitwise_xor.outer(np.asarray(a, dtype=np.uint64), np.asarray(b, dtype=np.uint64))
+    return _POPCOUNT8[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1)
+
+
+class HashIndex:
+    """
+    (해밍 거리 인덱스) 이미 보여 준 프레임의 지각 해시 모음.
+    - near: 후보 해시들이 모아 둔 해시 중 하나와 distance 비트 이내인지 한 번에 판정
+    - 한 세션에 보여 주는 프레임은 수십 장이라 전부와 비교(NumPy XOR + 비트 수 표)해도 충분히 빠르다
+    """
+
+    def __init__(self, distance: int = DEDUP_DISTANCE, hashes=()):
+        self.distance = distance
+        self._buf = np.array(list(hashes), dtype=np.uint64)
+        self._n = len(self._buf)
+
+    def __len__(self):
+        return self._n
+
+    def add(self, h: int):
+        if self._n == len(self._buf):  # 2배씩 늘림 (페이지가 수천 장이어도 add 는 상수 시간)
+            self._buf = np.resize(self._buf, max(16, 2 * self._n))
+        self._buf[self._n] = h
+        self._n += 1
+
+    def near(self, hashes) -> np.ndarray:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not self._n or not len(hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        return hamming(hashes, self._buf[:self._n]).min(axis=1) <= self.distance
+
+
+def combined_scores(metrics: np.ndarray) -> np.ndarray:
+    """
+    (N, 3) 지표 → 0~1 종합 점수.
+    - 선명도는 후보 집합 안에서 상대값 (영상마다 기준이 달라서)
+    - 너무 어둡거나 밝은 프레임, 대비가 낮은 프레임은 감점
+    """
+    sharp = np.log1p(metrics[:, 0] * 1000.0)
+    sharp_n = sharp / sharp.max() if sharp.max() > 0 else np.zeros_like(sharp)
+    exposure = np.clip(1.0 - np.abs(metrics[:, 1] - 0.5) / 0.4, 0.0, 1.0)
+    contrast = np.clip(metrics[:, 2] / 0.2, 0.0, 1.0)
+    return sharp_n * (0.25 + 0.75 * exposure) * (0.25 + 0.75 * contrast)
+
+
+class FrameScorer:
+    """
+    (품질 점수) 추출 중에 디코딩된 프레임을 받아 축소본을 모아 두었다가
+    BATCH_SIZE 장씩 batch_metrics 로 계산한다. 파일을 다시 읽는 두 번째 패스가 없다.
+    - 같은 축소본 묶음으로 지각 해시(batch_hashes)도 계산한다 (중복 장면 억제용, 추가 디코딩/축소 없음)
+    - add: 추출 루프(디코딩/쓰기 스레드)에서 호출, 여러 스레드에서 호출해도 안전
+    - on_batch: 계산이 끝난 {frame_idx: (sharp, bright, contrast)}, {frame_idx: 해시} 를 받는 콜백
+      (병렬 추출 워커가 부모 프로세스로 결과를 보낼 때 사용)
+    """
+
+    def __init__(self, on_batch=None, batch_size: int = BATCH_SIZE, hashes: bool = True):
+        self.metrics = {}          # frame_idx -> (sharp, bright, contrast)
+        self.hashes = {}           # frame_idx -> 64비트 지각 해시 (int)
+        self._hash = hashes
+        self._on_batch = on_batch
+        self._batch_size = batch_size
+        self._pending = []         # [(frame_idx, small_gray)]
+        self._lock = threading.Lock()
+
+    def add(self, frame_idx: int, frame):
+        small = small_gray(frame)
+        with self._lock:
+            self._pending.append((frame_idx, small))
+            if len(self._pending) < self._batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self._compute(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._compute(batch)
+
+    def _compute(self, batch):
+        # 해상도가 다른 프레임이 섞이면 크기별로 나눠서 계산
+        by_shape = {}
+        for idx, small in batch:
+            by_shape.setdefault(small.shape, []).append((idx, small))
+        result, hashes = {}, {}
+        for items in by_shape.values():
+            grays = np.stack([s for _, s in items])
+            m = batch_metrics(grays)
+            for (idx, _), row in zip(items, m):
+                result[idx] = tuple(float(v) for v in row)
+            if self._hash:
+                for (idx, _), h in zip(items, batch_hashes(grays)):
+                    hashes[idx] = int(h)
+        self.merge(result, hashes)
+        if self._on_batch is not None:
+            self._on_batch(result, hashes)
+
+    def merge(self, metrics: dict, hashes: dict = None):
+        with self._lock:
+            self.metrics.update(metrics)
+            if hashes:
+                self.hashes.update(hashes)
+
+    def pick(self, candidates, k: int, top_frac: float = 0.3):
+        """
+        (후보 선택) 점수 상위 top_frac 안에서, 시간 구간을 k 등분해 구간마다 가장 좋은 프레임을 고른다.
+        - candidates: 프레임 인덱스들
+        - 점수가 있는 후보가 k 개보다 적으면 None (호출 측에서 랜덤으로 대체)
+        반환값: 시간 순으로 정렬된 프레임 인덱스 k 개
+        """
+        with self._lock:
+            scored = [c for c in candidates if c in self.metrics]
+            if len(scored) < k or k <= 0:
+                return None
+            metrics = np.array([self.metrics[c] for c in scored], dtype=np.float64)
+        idx = np.array(scored)
+        scores = combined_scores(metrics)
+
+        # (1) 상위 top_frac 만 남기기 (최소 k 개)
+        keep = max(k, int(math.ceil(len(idx) * top_frac)))
+        top = np.argsort(-scores)[:keep]
+        idx, scores = idx[top], scores[top]
+
+        # (2) 시간 축을 k 칸으로 나눠 칸마다 최고점 1장
+        lo, hi = min(candidates), max(candidates) + 1
+        edges = np.linspace(lo, hi, k + 1)
+        bins = np.clip(np.searchsorted(edges, idx, side="right") - 1, 0, k - 1)
+        chosen = []
+        for b in range(k):
+            in_bin = np.nonzero(bins == b)[0]
+            if len(in_bin):
+                chosen.append(in_bin[np.argmax(scores[in_bin])])
+
+        # (3) 빈 칸이 있으면 남은 것 중 점수 순으로 채우기
+        if len(chosen) < k:
+            taken = set(chosen)
+            for i in np.argsort(-scores):
+                if i not in taken:
+                    chosen.append(i)
+                    taken.add(i)
+                    if len(chosen) == k:
+                        break
+        return sorted(int(idx[i]) for i in chosen)
+
+    def ranked(self, candidates) -> list:
+        """점수 높은 순 (점수 없는 후보는 뒤에)."""
+        with self._lock:
+            scored = [c for c in candidates if c in self.metrics]
+            metrics = np.array([self.metrics[c] for c in scored], dtype=np.float64).reshape(-1, 3)
+        order = [scored[i] for i in np.argsort(-combined_scores(metrics))] if scored else []
+        taken = set(scored)
+        return order + [c for c in candidates if c not in taken]
+
+    def pick_distinct(self, candidates, k: int, avoid=(), distance: int = DEDUP_DISTANCE,
+                      smart: bool = True) -> list:
+        """
+        (중복 억제 선택) pick (smart=False 거나 점수가 모자라면 랜덤) 결과 중에서,
+        avoid(이미 보여 준 프레임)나 앞에서 고른 프레임과 지각 해시가 distance 비트 이내인 것은
+        다음 후보(점수 순 / 랜덤 순)로 바꾼다.
+        - 해시가 없는 프레임은 거르지 않는다 (예전 캐시 등)
+        - 거르고 나서 k 개가 안 되면 남은 후보로 채운다 (해시가 똑같은 것은 마지막에) - 정지 화면에서도 페이지 크기 유지
+        반환값: 시간 순 프레임 인덱스 (후보가 k 개 이상이면 k 개)
+        """
+        candidates = list(candidates)
+        picked = self.pick(candidates, k) if smart else None
+        if picked is None:
+            picked = sorted(random.sample(candidates, k))
+        if distance <= 0:
+            return picked
+
+        taken = set(picked)
+        rest = [c for c in candidates if c not in taken]
+        rest = self.ranked(rest) if smart else random.sample(rest, len(rest))
+        with self._lock:
+            index = HashIndex(distance, [self.hashes[f] for f in avoid if f in self.hashes])
+            order = [(f, self.hashes.get(f)) for f in picked + rest]
+        # 이미 보여 준 것과 가까운 후보는 한 번에 제거 (벡터화), 남은 것끼리는 순서대로 1장씩
+        hashed = [i for i, (_, h) in enumerate(order) if h is not None]
+        far = np.ones(len(order), dtype=bool)
+        far[hashed] = ~index.near([order[i][1] for i in hashed])
+        chosen = []
+        for (f, h), ok in zip(order, far):
+            if not ok:
+                continue
+            if h is not None:
+                if index.near([h])[0]:
+                    continue  # 이번에 먼저 고른 프레임과 같은 장면
+                index.add(h)
+            chosen.append(f)
+            if len(chosen) == k:
+                break
+        if len(chosen) < k:
+            # (채우기) 모자라면 남은 후보를 같은 순서(점수 순)로 채워 페이지 크기를 k 로 유지.
+            # 해시가 완전히 같은 것은 뒤로 미루고, 그래도 모자라면 (정지 화면) 그것까지 쓴다
+            with self._lock:
+                seen = {self.hashes[f] for f in avoid if f in self.hashes}
+            taken = set(chosen)
+            seen.update(h for f, h in order if f in taken and h is not None)
+            taken.update(avoid)  # 이미 보여 준 프레임 자체는 다시 넣지 않음
+            dupes = []
+            for f, h in order:
+                if len(chosen) == k:
+                    break
+                if f in taken:
+                    continue
+                if h is not None and h in seen:
+                    dupes.append(f)
+                    continue
+                if h is not None:
+                    seen.add(h)
+                chosen.append(f)
+            chosen += dupes[:k - len(chosen)]
+        return sorted(chosen)
@@ -1,25 +1,67 @@
+import math
 import threading
+import time
 import tkinter.font as tkfont  # frame GUI
 import random
 from pathlib import Path
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from PIL import Image, ImageTk
-import shutil
-import os
 
-from video_to_frames import (
-    info, warn, done,
-    get_video_meta, extract_frames_range
-)
+# (빠른 시작) 여기서는 가벼운 모듈만 import 한다.
+#  cv2 / numpy / PIL 을 쓰는 모듈(video_to_frames, thumb_cache, frame_cache, frame_quality, seek_index)은
+#  창을 띄운 뒤 _probe_video 가 백그라운드에서 먼저 불러 두고, 각 메서드는 그 안에서 import 해서 쓴다.
+from console import info, warn, done
+from workspace import Workspace, DiskQuotaExceeded
+import instrument
+from instrument import span
 
 
 class FrameSelectorApp(tk.Tk):
     def __init__(self, video_path: Path, output_base: Path,
                  zero_pad: int = 6, start_index: int = 0,
-                 thumb_size=(600, 400)):  # 썸네일 크기
+                 thumb_size=(600, 400),  # 썸네일 크기
+                 sparse: bool = False,  # True면 화면에 보일 프레임만 추출
+                 workers: int = 1,  # 전체 추출 시 병렬 프로세스 수 (0 이하: CPU 코어 수)
+                 writers: int = 0,  # 1 이상이면 디코딩/저장 파이프라인의 쓰기 스레드 수
+                 frame_format: str = "png",  # 임시 프레임 포맷: png / jpg / webp / npy / memory
+                 frame_quality=None,  # png: 압축 레벨 0~9, jpg/webp: 품질 0~100
+                 thumb_cache_mb: float = 256,  # 썸네일 LRU 캐시 한도 (MB)
+                 proxy: bool = False,  # True면 썸네일 크기 프록시만 저장 (원본은 최종 선택분만 다시 추출)
+                 cache_dir=None,  # 지정하면 추출 프레임을 실행/구간을 넘어 재사용하는 영구 캐시 폴더
+                 cache_max_gb: float = 20,  # 영구 캐시 용량 한도 (GB, 넘으면 오래된 영상부터 삭제)
+                 stream_min_frames: int = 48,  # 추출 중이라도 이만큼 모이면 첫 스테이지 표시
+                 smart_pick: bool = True,  # True면 랜덤 대신 품질 점수(선명도/노출/대비) 상위에서 고름
+                 dedup_distance: int = 6,  # 지각 해시 해밍 거리가 이 이하인 (거의 같은) 장면은 다시 보이지 않음 (0: 끔)
+                 seek_index: bool = True,  # True면 키프레임/PTS 인덱스를 만들어(1회) 탐색/시간 변환에 사용
+                 stats: bool = False,  # True면 단계별 시간 계측 (상단바 실시간 표시 + 종료 시 JSON 리포트)
+                 tmpfs: bool = False,  # True면 임시 프레임을 메모리 파일시스템(/dev/shm)에 저장
+                 workspace_quota_gb=None,  # 임시 프레임 용량 한도 (GB, None: 제한 없음)
+                 min_free_gb: float = 1.0,  # 디스크 여유 공간이 이보다 적어지면 추출 중단 (GB)
+                 max_frames=None,  # (예산) 구간당 최대 추출 장수. 넘으면 일정 간격으로 건너뛰며 추출
+                 max_mb=None,  # (예산) 구간당 최대 추출 용량 (MB, 첫 프레임 크기로 장수 환산)
+                 memory_mb: float = 2048,  # frame_format="memory" 일 때 메모리 프레임 한도 (MB)
+                 export_variants=None,  # 내보낼 (포맷, 품질, 최대 크기) 목록 (None: 원본 PNG 1개)
+                 queue=None,  # 큐 모드: clip_queue.load_queue 결과. 주면 video_path 대신 차례로 처리
+                 timeline_frames: int = 600,  # 시간 폼 타임라인 프록시 장수 (0: 끔)
+                 page_size: int = 4,  # 한 페이지(스테이지)에 보일 썸네일 수
+                 grid_cols: int = 2,  # 썸네일 그리드 열 수
+                 grid_rows: int = 2,  # 스크롤 없이 한 번에 보이는 행 수 (넘으면 세로 스크롤)
+                 max_stages: int = 3):  # 총 페이지(스테이지) 수
+        t_start = time.perf_counter()
         super().__init__()
-        self.title("Frame Range")
+        # (큐 모드) 클립을 차례로 처리 - 지금 클립을 고르는 동안 다음 클립을 백그라운드에서 미리 추출
+        #  (한 번에 1클립만 앞서 준비, 1스레드 / 병렬 프로세스 없음, 지금 클립 추출 중에는 멈춤)
+        self.queue = list(queue or [])
+        self._queue_pos = 0
+        if self.queue:
+            video_path = Path(self.queue[0]["video"])
+        self._next_clip = None            # 미리 준비가 끝난 다음 클립 (PreparedClip)
+        self._prefetch_pos = None         # 준비 중이거나 준비된 클립의 순번
+        self._waiting_clip = False        # 다음 클립 준비가 끝나면 바로 넘어갈지
+        self._export_dir = None           # (큐 모드) 저장 폴더는 처음 1번만 묻는다
+        self._fg_idle = threading.Event()  # 지금 클립 추출이 없을 때만 set (미리 준비가 이걸 기다림)
+        self._fg_idle.set()
+        self._update_title(video_path)
         self.geometry("1280x900")  # (설정) 창 크기. UI 전체 스케일에 영향
 
         # (설정) 전역 폰트 - 버튼/라벨/입력창 기본 크기
@@ -33,34 +75,129 @@ class FrameSelectorApp(tk.Tk):
         self.zero_pad = zero_pad          # 저장 파일명 0패딩 자릿수
         self.start_index = start_index    # 저장 시작 인덱스
         self.thumb_size = thumb_size      # (설정) 중앙 썸네일 표시 크기
+        self.sparse = sparse              # (설정) 희소 추출: 페이지마다 보일 프레임만 디코딩/저장
+        self.workers = workers            # (설정) 병렬 추출 프로세스 수
+        self.writers = writers            # (설정) PNG 쓰기 스레드 수 (0: 디코딩과 같은 스레드에서 저장)
+        self.frame_format = frame_format  # (설정) 임시 프레임 포맷 (최종 저장은 export_variants)
+        self.frame_quality = frame_quality
+        self.frame_ext = None             # 확장자 (_probe_video 에서 확인, 잘못된 포맷이면 오류 표시)
+        self.proxy = proxy                # (설정) 추출 시 thumb_size 로 바로 축소해 저장
+        # (설정) 내보내기 변형 - 선택한 프레임마다 (포맷, 품질, 최대 크기) 별로 1개씩 병렬 인코딩
+        self.export_variants = list(export_variants or [("png", None, None)])
+
+        # (설정) 메모리 프레임 - frame_format="memory" 면 디코딩한 프레임을 파일 대신 FrameStore 에 보관
+        #  (썸네일 크기로 줄여 RGBA 로 1번 변환, 표시는 복사 없이 / 디스크는 최종 내보내기 때만 씀)
+        self.memory_mb = memory_mb
+        self.store = None                 # _probe_video 에서 생성
+
+        # (설정) 영구 프레임 캐시 - 켜져 있으면 프레임은 output_dir 대신 캐시 폴더에 절대 인덱스로 저장
+        self.cache_dir = cache_dir
+        self.cache_max_gb = cache_max_gb
+        self.frame_cache = None           # _probe_video 에서 생성
+        self._cache_entry = None
+
+        # (설정) 점진 표시 - 추출이 끝나기 전이라도 후보가 이만큼 모이면 화면 전환
+        self.stream_min_frames = stream_min_frames
+
+        # (설정) 추출 예산 - 긴 구간은 stride 프레임마다 1장만 추출 (희소 모드는 원래 보일 것만 추출하므로 무시)
+        self.max_frames = max_frames
+        self.max_mb = max_mb
+        self.stride = 1
+
+        # (설정) 품질 점수 기반 후보 선택 - 점수는 추출하면서 같이 계산 (희소 모드는 랜덤 유지)
+        self.smart_pick = smart_pick
+        self.scorer = None
+        # (설정) 중복 장면 억제 - 추출하면서 프레임마다 지각 해시를 같이 계산해 두고,
+        #  이미 보인 프레임과 거의 같은 후보는 다음 페이지에서 뺀다 (희소 모드는 후보를 미리 디코딩하지 않으므로 제외)
+        self.dedup_distance = dedup_distance
+
+        # (계측) 켜면 열기/탐색/디코딩/저장/썸네일/렌더/내보내기/삭제 시간을 모은다 (끄면 비용 거의 0)
+        self.stats = stats
+        instrument.enable(stats)
+        self.stats_label = None       # 상단바 가운데 실시간 계측 요약
+
+        # (성능) 썸네일 캐시 - 클릭마다 원본 이미지를 다시 디코딩하지 않도록 중앙 그리드/우측 패널이 공유
+        #  썸네일 디코딩/축소는 백그라운드(thumb_loader)에서, 결과만 after() 로 UI 스레드에 전달
+        #  (둘 다 PIL 이 필요하므로 _probe_video 에서 생성)
+        self.thumb_cache_mb = thumb_cache_mb
+        self.thumb_cache = None
+        self.thumb_loader = None
 
         self.video_stem = self.video_path.stem               # 예: "zzalkak_video"
-        self.output_dir = self.output_base / self.video_stem # 실제 저장 폴더; 예: C:\...\zzalkak\frames\zzalkak_video
-        self.output_dir.mkdir(parents=True, exist_ok=True)   # 폴더 실제 생성
-
-        # 메타
-        self.total_frames, self.fps = get_video_meta(self.video_path)
-        self.duration_sec = (self.total_frames / self.fps) if (self.fps > 0 and self.total_frames > 0) else 0.0
+        # (작업 공간) 실행마다 별도 세션 폴더: frames/<영상이름>/session-<시각>-<pid>-<임의>/run-<n>
+        #  - 예전에 비정상 종료한 실행이 남긴 세션 폴더는 백그라운드에서 정리
+        self._workspace_opts = {"tmpfs": tmpfs, "quota_gb": workspace_quota_gb, "min_free_gb": min_free_gb}
+        self.workspace = Workspace(self.output_base, self.video_stem, **self._workspace_opts)
+        self.output_dir = self.workspace.new_run()           # 실제 저장 폴더 (시간을 다시 설정하면 새 run)
+        self._run_used = False                               # 이 run 폴더에 이미 추출했는지
+
+        # (성능) 탐색 인덱스 - 영상마다 1회 패킷 스캔, 이후엔 사이드카 파일만 읽음
+        #  (캐시 폴더가 있으면 그 안에, 없으면 output_base/.index 에 저장)
+        self.use_seek_index = seek_index
+        self.seek_index = None
+
+        # (성능) 영상 핸들 공유 - 메타 읽기/구간 추출/원본 재추출이 열린 캡처를 같이 쓴다
+        #  (시간을 다시 설정해도 영상을 다시 열지 않음, 동시에 읽으면 핸들을 몇 개 더 열어 돌려 씀)
+        self.source = None
+
+        # (성능) 타임라인 프록시 - 영상마다 1번 step 프레임마다 아주 작게 모아 memmap 사이드카로 저장
+        #  시간 폼의 필름스트립에서 드래그로 구간을 고른다 (만드는 중에도 채워진 만큼 표시)
+        self.timeline_frames = timeline_frames
+        self.timeline = None              # timeline.TimelineProxy
+        self._timeline_gen = 0            # 영상이 바뀌면 증가 (늦게 온 진행 결과 무시용)
+        self.timeline_width = 960         # (설정) 필름스트립 폭 (px)
+        self.timeline_height = 54         # (설정) 필름스트립 높이 (px, 미리보기는 프록시 2배)
+        self.timeline_canvas = None
+        self.timeline_preview = None
+        self._scrub_from = None           # 드래그 시작 시각 (초)
+
+        # 메타 (_probe_video 가 채우기 전까지는 모름 → 확인 버튼 잠금)
+        self.total_frames, self.fps = 0, 0.0
+        self.duration_sec = 0.0
+        self.video_ready = False
+        self.startup_ms = {}          # (측정) 창 표시 / 영상 준비까지 걸린 시간
 
         # 상태
         self.all_frame_files = []
         self.shown_stages = []        # 각 stage별 파일 리스트
         self.selected_files = []      # 사용자가 고른 파일 경로 (최대 2)
-        self.index_map = {}           # (중요) 파일경로 -> 전역 번호(1~12) 매핑
-
-        # (설정) 스테이지(페이지) 관련
+        self.index_map = {}           # (중요) 파일경로 -> 전역 번호(1~) 매핑
+        self.range_start_f = 0        # 현재 구간의 시작 프레임 (파일명 0번 = start_index)
+        self.range_end_f = 0          # 현재 구간의 끝 프레임 (주변 자세히 보기 범위 제한용)
+        self._materialized = set()    # (희소 모드) 이번 구간에서 실제로 저장된 파일 경로
+        self._pending_stage = None    # 미리 뽑아 둔 다음 스테이지 파일들 (희소 모드면 추출까지 끝난 것)
+        self._prefetching = False     # (희소 모드) 다음 스테이지 추출이 진행 중인지
+        self._advance_when_ready = False  # (희소 모드) 추출이 끝나면 바로 다음 페이지로 넘어갈지
+        self._session = 0             # 시간 구간이 바뀔 때마다 증가 (늦게 도착한 백그라운드 결과 무시용)
+        self._render_gen = 0          # 썸네일 그리드를 다시 그릴 때마다 증가 (늦게 온 썸네일 무시용)
+        self._extracting = False      # 전체 추출이 아직 진행 중인지 (진행 중엔 시간 다시 설정 불가)
+        self._shown_first = False     # 이번 구간에서 첫 스테이지를 이미 띄웠는지
+        self._t_confirm = None        # 확인 버튼 시각 (첫 썸네일까지 걸린 시간 측정용)
+        self.last_ttft = None         # 마지막으로 측정한 time-to-first-thumbnail (초)
+        self.status_label = None      # 상단바 왼쪽 추출 진행 표시
+
+        # (설정) 스테이지(페이지) 관련 - 번호는 1 ~ 페이지 크기 합 (기본 4장 × 3페이지 = 1~12)
         self.stage = 0
         self.stage_idx = -1
-        self.max_stages = 3           # (설정) 총 스테이지 수. 변경 시 번호(1~12) 범위도 함께 바뀜
+        self.max_stages = max_stages  # (설정) 총 스테이지 수
+        self.page_size = page_size    # (설정) 페이지당 썸네일 수
+        # (설정) 썸네일 그리드 - 보이는 행의 셀만 위젯으로 만들고 스크롤하면 다시 씀 (thumb_grid.ThumbGrid)
+        self.grid_cols = grid_cols
+        self.grid_rows = grid_rows
 
         # UI 루트 요소 참조
         self.thumb_panel = None
+        self.thumb_grid = None
+        self.guide_label = None       # 그리드 아래 안내 문구 (Stage n/N ...)
+        self.guide_tail = None        # 마지막 스테이지 안내
         self.retry_btn = None
         self.prev_btn = None
         self.loading_label = None
         self.time_form = None
         self.time_form_inner = None
         self.retime_btn = None
+        self.refine_btn = None        # (예산 모드) 선택한 프레임 주변을 촘촘하게 다시 추출
+        self.length_label = None      # 시간 폼 아래 영상 길이 (메타를 읽기 전엔 "확인 중")
 
         # 상단바 컨테이너 (시간 다시 설정 버튼)
         self.top_bar = None
@@ -71,28 +208,390 @@ class FrameSelectorApp(tk.Tk):
 
         # 우측 선택 사이드패널
         self.selected_panel = None
-        self._sel_tkimgs = []
+        self._sel_entries = []        # 우측 패널 칸들 (retained: 선택이 바뀐 칸만 교체)
 
-        # (초기 화면) 시간 입력 폼부터
+        # (초기 화면) 시간 입력 폼부터 - 메타를 읽기 전이라 확인 버튼은 잠가 둔다
         self._build_time_form()
+        if self.stats:
+            self.after(1000, self._tick_stats)
+
+        # (빠른 시작) 메인 루프가 돌기 시작하면(창이 뜨면) 백그라운드 프로브 시작
+        #  (Tk 는 메인 루프 전에 다른 스레드에서 after() 를 부르면 오류가 나므로 여기서 바로 시작하지 않음)
+        self.after(0, lambda: self._start_probe(t_start))
+
+    # 빠른 시작
+    def _start_probe(self, t_start: float):
+        self.startup_ms["window"] = round((time.perf_counter() - t_start) * 1000, 1)
+        threading.Thread(target=self._probe_video, args=(t_start,), daemon=True).start()
+
+    def _probe_video(self, t_start: float):
+        """
+        (워커 스레드) 무거운 모듈 import → 이전 세션 정리 → 탐색 인덱스 → 메타 읽기.
+        - 끝나면 메인 스레드에서 _on_video_ready 가 영상 길이를 채우고 확인 버튼을 켠다.
+        - 그동안 창은 이미 떠 있고 시간도 미리 입력할 수 있다.
+        """
+        try:
+            t0 = time.perf_counter()
+            from video_to_frames import frame_ext
+            from thumb_cache import ThumbCache, ThumbLoader
+            from frame_cache import FrameCache
+            # 첫 추출/썸네일 때 import 비용이 들지 않도록 나머지도 미리
+            import seek_index
+            import frame_quality
+            import PIL.ImageTk
+            self.startup_ms["imports"] = round((time.perf_counter() - t0) * 1000, 1)
+
+            self.frame_ext = frame_ext(self.frame_format)  # 잘못된 포맷이면 ValueError
+            if self.frame_format == "memory":
+                from frame_store import FrameStore
+                self.store = FrameStore(self.thumb_size, self.memory_mb)
+            self.thumb_cache = ThumbCache(self._open_frame_image, max_mb=self.thumb_cache_mb,
+                                          stamp=self.store.version if self.store else None)
+            self.thumb_loader = ThumbLoader(self.thumb_cache)
+            if self.cache_dir and self.store is not None:
+                warn("frame cache is not used with in-memory frames")
+            elif self.cache_dir:
+                self.frame_cache = FrameCache(Path(self.cache_dir), self.cache_max_gb)
+            self.workspace.sweep_stale()
+            self.seek_index, self.source, total, fps = self._open_video(self.video_path)
+        except Exception as e:
+            msg = str(e)
+            self.after(0, lambda: self._on_video_failed(msg))
+            return
+        self.startup_ms["ready"] = round((time.perf_counter() - t_start) * 1000, 1)
+        self.after(0, lambda: self._on_video_ready(total, fps))
+
+    def _open_video(self, video_path: Path):
+        """(워커 스레드) 탐색 인덱스(있으면) + 공유 캡처 + 메타. (seek_index, source, total, fps) 반환."""
+        from video_to_frames import VideoSource, get_video_meta
+        from seek_index import load_or_build
+        index = None
+        if self.use_seek_index and video_path.exists():
+            try:
+                index = load_or_build(video_path, self._index_dir())
+            except Exception as e:
+                warn(f"seek index unavailable, using container metadata: {e}")
+        source = VideoSource(video_path, index)
+        try:
+            total, fps = get_video_meta(source, index)
+        except Exception:
+            source.close()
+            raise
+        return index, source, total, fps
+
+    def _index_dir(self) -> Path:
+        """탐색 인덱스 / 타임라인 프록시 사이드카 폴더 (캐시 폴더가 있으면 그 안)."""
+        return (self.frame_cache.root / "_index") if self.frame_cache else (self.output_base / ".index")
+
+    def _on_video_ready(self, total: int, fps: float, prepared=None):
+        self.total_frames, self.fps = total, fps
+        if self.seek_index is not None:
+            self.duration_sec = self.seek_index.duration_sec
+        else:
+            self.duration_sec = (self.total_frames / self.fps) if (self.fps > 0 and self.total_frames > 0) else 0.0
+        self.video_ready = True
+        if prepared is None:  # (큐 모드) 다음 클립으로 넘어온 경우는 시작 시간 기록 없음
+            info(f"startup: window {self.startup_ms['window']} ms, imports {self.startup_ms['imports']} ms, "
+                 f"video ready {self.startup_ms['ready']} ms")
+
+        # (UI) 끝 시간 기본값 = 영상 길이 (사용자가 이미 고쳐 놓았으면 그대로 둠)
+        total_m = int(self.duration_sec // 60)
+        total_s = int(round(self.duration_sec - total_m * 60))
+        if not self.end_min.get().strip() and not self.end_sec.get().strip():
+            self.end_min.insert(0, str(total_m))
+            self.end_sec.insert(0, str(total_s))
+        self.length_label.config(text=f"Video length: {total_m:02d}:{total_s:02d} (mm:ss)")
+        self.confirm_btn.config(state=tk.NORMAL)
+        if self.timeline_frames:
+            self._start_timeline()
+        if self.queue:
+            self._start_clip(prepared)
+
+    def _on_video_failed(self, msg: str):
+        self.length_label.config(text="Video length: unknown")
+        messagebox.showerror("Error", f"Cannot open video:\n{self.video_path}\n{msg}")
+        if self.queue:
+            # (큐 모드) 열 수 없는 영상은 건너뜀 - 이 클립용으로 만든 세션 폴더는 여기서 지운다
+            # (pid 가 살아 있어 sweep_stale 로는 지워지지 않음). 남은 클립이 없으면 앱 종료
+            self.workspace.close()
+            if not self._advance_queue():
+                self._close_app()
+
+    def _tick_stats(self):
+        """(계측) 1초마다 상단바 계측 요약 갱신."""
+        if self.stats_label is not None:
+            self.stats_label.config(text=instrument.stats_line())
+        self.after(1000, self._tick_stats)
+
+    def _write_stats_report(self):
+        """(계측) output_base/<영상이름>.stats.json 에 이번 세션 리포트 저장."""
+        path = self.output_base / f"{self.video_stem}.stats.json"
+        try:
+            instrument.write_report(path, extra={
+                "video": str(self.video_path),
+                "frames": len(self.all_frame_files),
+                "ttft_s": self.last_ttft,
+                "startup_ms": self.startup_ms,
+                "thumb_cache": self.thumb_cache.stats(),
+            })
+            info(f"stats report: {path}")
+        except OSError as e:
+            warn(f"cannot write stats report: {e}")
+
+    # 큐 모드
+    def _update_title(self, video_path: Path):
+        if self.queue:
+            self.title(f"Frame Range — {self._queue_pos + 1}/{len(self.queue)} {video_path.name}")
+        else:
+            self.title("Frame Range")
+
+    @staticmethod
+    def _clip_range(clip: dict, duration_sec: float):
+        """큐 항목의 구간 (초). end 가 없거나 영상보다 길면 영상 끝까지."""
+        end = duration_sec if clip["end"] is None else min(clip["end"], duration_sec)
+        return max(0.0, clip["start"]), end
+
+    def _start_clip(self, prepared=None):
+        """(메인 스레드) 지금 클립의 구간을 시간 폼에 채우고 바로 시작 (미리 추출해 뒀으면 바로 표시)."""
+        start_s, end_s = self._clip_range(self.queue[self._queue_pos], self.duration_sec)
+        self._set_time_entries(start_s, end_s)
+        if start_s >= end_s:
+            # (오류 처리) 매니페스트 구간이 영상 밖이면 시간 폼에서 직접 입력
+            messagebox.showwarning("Invalid", f"Clip range is outside the video:\n{self.video_path}\n"
+                                              f"Please enter the time again.")
+            return
+        if prepared is not None and prepared.frames is not None:
+            self._adopt_clip_frames(prepared)
+        else:
+            self._begin_extraction(start_s, end_s)
+
+    def _maybe_prefetch_clip(self):
+        """지금 클립 추출이 끝나면 다음 클립 준비를 시작 (이미 준비 중/준비됨이면 무시)."""
+        pos = self._queue_pos + 1
+        if pos >= len(self.queue) or self._prefetch_pos is not None or self._next_clip is not None:
+            return
+        # 희소/캐시 모드는 보일 프레임만 / 캐시에 없는 것만 추출하므로 열기(인덱스/메타)까지만 미리
+        self._prefetch_clip(pos, extract=not self.sparse and self.frame_cache is None)
+
+    def _prefetch_clip(self, pos: int, extract: bool = True):
+        self._prefetch_pos = pos
+
+        def work():
+            try:
+                prepared = self._prepare_clip(pos, extract)
+            except Exception as e:
+                msg = str(e)
+                self.after(0, lambda: self._on_clip_failed(pos, msg))
+                return
+            self.after(0, lambda: self._on_clip_prepared(prepared))
+
+        threading.Thread(target=work, name="clip-prefetch", daemon=True).start()
+
+    def _prepare_clip(self, pos: int, extract: bool):
+        """
+        (워커 스레드) 큐의 pos 번째 클립을 열고(인덱스/메타/작업 공간), extract 면
+        구간 추출 + 점수 계산 + 첫 페이지 선택 + 썸네일 디코딩까지 해 둔다.
+        - 지금 클립과 자원을 나누지 않도록 병렬 프로세스 없이 1스레드(쓰기 스레드 최대 1개)로 추출하고,
+          지금 클립을 추출하는 동안에는 진행 콜백에서 멈춰 기다린다.
+        """
+        from clip_queue import PreparedClip
+        from video_to_frames import sec_to_frame_range, extract_frames_span
+        clip = self.queue[pos]
+        video = Path(clip["video"])
+        index, source, total, fps = self._open_video(video)
+        workspace = Workspace(self.output_base, video.stem, **self._workspace_opts)
+        prepared = PreparedClip(pos, clip, source, index, total, fps, workspace, workspace.new_run())
+        if not extract:
+            return prepared
+
+        try:
+            if index is not None:
+                duration = index.duration_sec
+            else:
+                duration = (total / fps) if (fps > 0 and total > 0) else 0.0
+            start_s, end_s = self._clip_range(clip, duration)
+            if start_s >= end_s:
+                return prepared  # _start_clip 이 경고
+            start_f, end_f = sec_to_frame_range(start_s, end_s, fps, index)
+            stride = self._budget_stride(start_f, end_f, source, index)
+            scorer = self._new_scorer()
+            frames = []
+
+            def on_progress(indices):
+                frames.extend(indices)
+                self._fg_idle.wait()  # 지금 클립 추출 중이면 멈춤
+
+            info(f"queue: preparing clip {pos + 1}/{len(self.queue)} in background: {video.name}")
+            try:
+                extract_frames_span(
+                    video_path=source,
+                    output_dir=prepared.output_dir,
+                    start_f=start_f,
+                    end_f=end_f,
+                    zero_pad=self.zero_pad,
+                    start_index=self.start_index,
+                    workers=1,
+                    writers=min(self.writers, 1),
+                    frame_format=self.frame_format,
+                    quality=self.frame_quality,
+                    proxy_size=self._proxy_size(),
+                    on_progress=on_progress,
+                    scorer=scorer,
+                    index=index,
+                    quota=workspace.quota,
+                    stride=stride,
+                    store=self.store
+                )
+            except DiskQuotaExceeded as e:
+                warn(f"queue: {e}")  # 그때까지 추출한 프레임으로 진행
+        except Exception:
+            source.close()
+            workspace.close()
+            raise
+
+        prepared.start_f, prepared.end_f, prepared.stride = start_f, end_f, stride
+        prepared.frames = sorted(frames)
+        prepared.scorer = scorer
+        # 첫 페이지 = 앱이 고를 것과 같은 방법 (점수 상위 시간대별 / 없으면 랜덤, 같은 장면 제외), 썸네일까지 미리
+        k = min(self.page_size, len(frames))
+        if scorer is not None and k:
+            picked = scorer.pick_distinct(prepared.frames, k, distance=self.dedup_distance, smart=self.smart_pick)
+        else:
+            picked = random.sample(prepared.frames, k)
+        # 파일명은 _frame_path 와 같은 규칙 (구간 시작 기준 오프셋)
+        out = prepared.output_dir
+        prepared.first_stage = [str(out / f"{self.start_index + f - start_f:0{self.zero_pad}d}{self.frame_ext}")
+                                for f in picked]
+        self.thumb_loader.prefetch(prepared.first_stage[:self._first_screen()], self.thumb_size)
+        return prepared
+
+    def _on_clip_prepared(self, prepared):
+        if self._waiting_clip and prepared.pos == self._queue_pos:
+            self._waiting_clip = False
+            self._prefetch_pos = None
+            self._load_clip(prepared)
+        else:
+            self._next_clip = prepared
+
+    def _on_clip_failed(self, pos: int, msg: str):
+        self._prefetch_pos = None
+        video = self.queue[pos]["video"]
+        warn(f"queue: cannot prepare {video}: {msg}")
+        if self._waiting_clip and pos == self._queue_pos:
+            self._waiting_clip = False
+            messagebox.showerror("Error", f"Cannot open video:\n{video}\n{msg}")
+            if not self._advance_queue():
+                self._close_app()
+        # 기다리는 중이 아니면 그 클립 차례에 다시 열어 본다
+
+    def _advance_queue(self) -> bool:
+        """(큐 모드) 다음 클립으로 넘어간다. 남은 클립이 없으면 False."""
+        if self._queue_pos + 1 >= len(self.queue):
+            return False
+        self._queue_pos += 1
+        self._reset_to_time_form()
+        self._set_extracting(False)  # 끝낸 클립에서 남은 추출 결과는 버림 (세션 번호로 무시)
+        self.video_ready = False
+        self.confirm_btn.config(state=tk.DISABLED)
+        self.length_label.config(text="Video length: 확인 중..")
+        for w in (self.start_min, self.start_sec, self.end_min, self.end_sec):
+            w.delete(0, tk.END)
+        self._update_title(Path(self.queue[self._queue_pos]["video"]))
+
+        prepared, self._next_clip = self._next_clip, None
+        if prepared is not None:
+            self._prefetch_pos = None
+            self._load_clip(prepared)
+            return True
+        self._waiting_clip = True
+        if self._prefetch_pos != self._queue_pos:
+            # 미리 준비를 시작하기 전에 넘어옴 → 열기만 하고 추출은 평소처럼 (점진 표시)
+            self._prefetch_clip(self._queue_pos, extract=False)
+        return True
+
+    def _load_clip(self, prepared):
+        """(메인 스레드) 준비된 클립으로 전환 - 캡처/인덱스/작업 공간을 바꾸고 구간을 시작한다."""
+        if self.source is not None:
+            self.source.close()
+        video = Path(prepared.clip["video"])
+        self.video_path, self.video_stem = video, video.stem
+        self.source, self.seek_index = prepared.source, prepared.seek_index
+        self.workspace, self.output_dir = prepared.workspace, prepared.output_dir
+        self._run_used = prepared.frames is not None
+        self._cache_entry = None
+        self.all_frame_files = []
+        self.stride = 1
+        self._on_video_ready(prepared.total, prepared.fps, prepared)
+
+    def _adopt_clip_frames(self, prepared):
+        """(메인 스레드) 미리 추출해 둔 프레임으로 첫 페이지를 바로 표시 (추출 대기 없음)."""
+        self.confirm_btn.config(state=tk.DISABLED)
+        for w in (self.start_min, self.start_sec, self.end_min, self.end_sec):
+            w.config(state=tk.DISABLED)
+        self._session += 1
+        self.range_start_f, self.range_end_f = prepared.start_f, prepared.end_f
+        self.stride = prepared.stride
+        self.scorer = prepared.scorer
+        self.all_frame_files = [self._frame_path(f) for f in prepared.frames]
+        self._set_extracting(False)
+        self._shown_first = True
+        self._t_confirm = time.perf_counter()
+        self._pending_stage = prepared.first_stage  # _next_stage 가 그대로 사용 (썸네일은 캐시에 있음)
+        info(f"queue: {len(self.all_frame_files)} pre-extracted frames for {self.video_path.name}")
+        self._after_loading()
+        self._maybe_prefetch_clip()
 
     # 스테이지별 번호 부여 유틸
     def _assign_numbers_for_stage(self, stage_index: int, file_list: list[str]):
         """
         stage_index: 0,1,2 ...
-        file_list: 해당 스테이지에서 표시될 4개(또는 그 이하) 파일 경로 리스트.
-        전역 번호는 스테이지 순서 * 4 + (해당 스테이지 내 위치 0..3) + 1
-        예) stage_index=0 -> 1~4, stage_index=1 -> 5~8 ...
+        file_list: 해당 스테이지에서 표시될 page_size 개(또는 그 이하) 파일 경로 리스트.
+        전역 번호는 앞 스테이지들의 실제 장수 합 + (해당 스테이지 내 위치) + 1
+        예) 4장씩이면 stage_index=0 -> 1~4, stage_index=1 -> 5~8 ... (앞 페이지가 3장이면 4~)
         """
-        base = stage_index * 4
+        base = sum(len(files) for files in self.shown_stages[:stage_index])
         for i, fp in enumerate(file_list):
             if fp not in self.index_map:
                 self.index_map[fp] = base + i + 1
 
+    # 프레임 인덱스 <-> 파일 경로
+    def _frame_path(self, frame_idx: int) -> str:
+        """구간 시작 기준 오프셋으로 파일명을 만든다 (extract_frames_range 와 같은 규칙)."""
+        if self._cache_entry is not None:
+            return str(self._cache_entry.path(frame_idx))
+        return str(self.output_dir / f"{self.start_index + frame_idx - self.range_start_f:0{self.zero_pad}d}{self.frame_ext}")
+
+    def _frame_index(self, fp: str) -> int:
+        if self._cache_entry is not None:
+            return int(Path(fp).stem)  # 캐시 파일명은 절대 프레임 인덱스
+        return int(Path(fp).stem) - self.start_index + self.range_start_f
+
+    def _open_cache_entry(self):
+        """(캐시 모드) 이 영상 × 저장 옵션의 캐시 항목을 연다 (앱당 1번)."""
+        from frame_cache import cache_variant
+        if self._cache_entry is None:
+            variant = cache_variant(self.frame_format, self.frame_quality, self._proxy_size())
+            self._cache_entry = self.frame_cache.open(self.video_path, variant)
+        return self._cache_entry
+
+    def _proxy_size(self):
+        return tuple(self.thumb_size) if self.proxy else None
+
+    def _open_frame_image(self, fp: str):
+        """임시 프레임 파일을 RGB PIL 이미지로 연다 (.npy 는 BGR 배열, 메모리 프레임은 복사 없이 RGBA)."""
+        if self.store is not None:
+            return self.store.image(fp)
+        from PIL import Image
+        if self.frame_format == "npy":
+            import numpy as np
+            return Image.fromarray(np.load(fp)[:, :, ::-1])
+        return Image.open(fp).convert("RGB")
+
     # 우측 선택 패널
     def _build_selected_panel(self):
         if self.selected_panel:
             self.selected_panel.destroy()
+        self._sel_entries = []
         self.selected_panel = tk.Frame(self, bd=1, relief=tk.GROOVE)
         self.selected_panel.pack(side=tk.RIGHT, fill=tk.Y, padx=12, pady=12)
 
@@ -128,20 +627,26 @@ class FrameSelectorApp(tk.Tk):
         )
         self.confirm_btn_sel.pack(side=tk.LEFT, padx=(6, 0), fill=tk.X, expand=True)
 
-    def _refresh_selected_panel(self):
+    def _refresh_selected_panel(self, rebuild: bool = False):
+        """
+        우측 선택 패널을 지금 선택에 맞춘다.
+        - (성능) 칸 위젯은 유지하고 달라진 칸만 이미지/번호를 교체, 모자라면 추가하고 남으면 뒤에서 제거
+          (클릭마다 전부 지우고 다시 만들지 않음)
+        - rebuild: 칸을 모두 지우고 다시 만든다 (벤치마크의 비교용)
+        """
+        from PIL import ImageTk
         if not self.selected_panel:
             return
 
-        # (UI 갱신) 기존 썸네일 클리어
-        for child in self.selected_list.winfo_children():
-            child.destroy()
-        self._sel_tkimgs = []
+        if rebuild:
+            for entry in self._sel_entries:
+                entry["box"].destroy()
+            self._sel_entries = []
 
         count = len(self.selected_files)
-        if count == 0:
-            self.selected_hint.config(text="아직 선택 없음")
-        else:
-            self.selected_hint.config(text=f"{count}/2 선택됨")
+        hint = "아직 선택 없음" if count == 0 else f"{count}/2 선택됨"
+        if self.selected_hint.cget("text") != hint:
+            self.selected_hint.config(text=hint)
 
         # (설정) 선택된 이미지 박스 미리보기 배율
         #  - 중앙 썸네일(self.thumb_size) 대비 상대 크기
@@ -150,36 +655,53 @@ class FrameSelectorApp(tk.Tk):
         sel_h = int(self.thumb_size[1] * scale)
         sel_size = (sel_w, sel_h)
 
-        for _, fp in enumerate(self.selected_files[:2], start=1):
+        wanted = self.selected_files[:2]
+        while len(self._sel_entries) > len(wanted):
+            self._sel_entries.pop()["box"].destroy()
+
+        for i, fp in enumerate(wanted):
+            if i < len(self._sel_entries) and self._sel_entries[i]["fp"] == fp:
+                continue  # 그대로인 칸은 건드리지 않음
             try:
-                img = Image.open(fp).convert("RGB")
-                img.thumbnail(sel_size)
+                img = self.thumb_cache.get(fp, sel_size, derive_from=self.thumb_size)
                 tkimg = ImageTk.PhotoImage(img)
-                self._sel_tkimgs.append(tkimg)
-
+            except Exception as e:
+                warn(f"cannot open selected thumbnail: {fp} ({e})")
+                tkimg = None
+            # (중요) 파일명 대신 전역 번호만 아래에 표시 (예: "7")
+            num = str(self.index_map.get(fp, "?"))
+
+            if i < len(self._sel_entries):
+                entry = self._sel_entries[i]
+                entry["lbl"].config(image=tkimg or "")
+                entry["cap"].config(text=num)
+            else:
                 box = tk.Frame(self.selected_list)
                 box.pack(pady=6)
 
                 # 선택 썸네일(항상 파란 테두리)
                 lbl = tk.Label(
-                    box, image=tkimg,
+                    box, image=tkimg or "",
                     bd=2, relief=tk.SOLID,
                     highlightthickness=2,
                     highlightbackground="#00AEEF",
                     highlightcolor="#00AEEF"
                 )
                 lbl.pack()
-
-                # (중요) 파일명 대신 전역 번호만 아래에 표시 (예: "7")
-                num = self.index_map.get(fp, "?")
-                cap = tk.Label(box, text=str(num), font=self.ui_font)
+                cap = tk.Label(box, text=num, font=self.ui_font)
                 cap.pack(pady=(4, 0))
-            except Exception as e:
-                warn(f"cannot open selected thumbnail: {fp} ({e})")
+                entry = {"box": box, "lbl": lbl, "cap": cap}
+                self._sel_entries.append(entry)
+            entry["fp"], entry["tkimg"] = fp, tkimg
 
         # (버튼 상태) 삭제/확인 활성화 조건
         self.delete_btn.config(state=(tk.NORMAL if len(self.selected_files) >= 1 else tk.DISABLED))
-        self.confirm_btn_sel.config(state=(tk.NORMAL if len(self.selected_files) == 2 else tk.DISABLED))
+        self._update_confirm_state()
+
+    def _update_confirm_state(self):
+        # (중요) 추출 중엔 확인 불가 - 확인하면 추출 스레드가 쓰고 있는 세션 폴더를 지우게 된다
+        ready = len(self.selected_files) == 2 and not self._extracting
+        self.confirm_btn_sel.config(state=(tk.NORMAL if ready else tk.DISABLED))
 
     # 시간 폼
     def _build_time_form(self):
@@ -205,24 +727,177 @@ class FrameSelectorApp(tk.Tk):
         )
         self.end_min = tk.Entry(self.time_form_inner, width=6, font=self.ui_font)
         self.end_sec = tk.Entry(self.time_form_inner, width=6, font=self.ui_font)
-        total_m = int(self.duration_sec // 60)
-        total_s = int(round(self.duration_sec - total_m * 60))
-        self.end_min.insert(0, str(total_m))
-        self.end_sec.insert(0, str(total_s))
+        # 끝 시간 기본값(영상 길이)은 메타를 읽은 뒤 _on_video_ready 에서 채운다
         self.end_min.grid(row=1, column=1, padx=4, pady=4, sticky="w")
         self.end_sec.grid(row=1, column=2, padx=4, pady=4, sticky="w")
 
         self.confirm_btn = tk.Button(
             self.time_form_inner, text="확인", command=self.on_confirm_time,
-            font=self.ui_font_huge, padx=12, pady=6
+            font=self.ui_font_huge, padx=12, pady=6,
+            state=(tk.NORMAL if self.video_ready else tk.DISABLED)
         )
         self.confirm_btn.grid(row=2, column=0, columnspan=3, pady=(14, 6))
 
-        tk.Label(
+        self.length_label = tk.Label(
             self.time_form_inner,
-            text=f"Video length: {total_m:02d}:{total_s:02d} (mm:ss)",
+            text="Video length: 확인 중..",
             font=self.ui_font
-        ).grid(row=3, column=0, columnspan=3, pady=8)
+        )
+        self.length_label.grid(row=3, column=0, columnspan=3, pady=8)
+
+        if self.timeline_frames:
+            self._build_timeline()
+
+    def _set_time_entries(self, start_s: float, end_s: float):
+        """시작/끝 (초) → mm:ss 입력칸 (초 단위 버림)."""
+        for entry, value in ((self.start_min, start_s // 60), (self.start_sec, start_s % 60),
+                             (self.end_min, end_s // 60), (self.end_sec, end_s % 60)):
+            entry.delete(0, tk.END)
+            entry.insert(0, str(int(value)))
+
+    # 타임라인 (시간 폼)
+    def _build_timeline(self):
+        """(시간 폼) 필름스트립 + 미리보기. 마우스를 올리면 그 시각 프레임, 드래그하면 구간 → 입력칸."""
+        self.timeline_preview = tk.Label(self.time_form_inner, text="", font=self.ui_font, compound=tk.TOP)
+        self.timeline_preview.grid(row=4, column=0, columnspan=3, pady=(8, 4))
+        self.timeline_canvas = tk.Canvas(
+            self.time_form_inner,
+            width=self.timeline_width,
+            height=self.timeline_height + 8,  # 아래 8px: 고른 구간 막대
+            bg="#DDDDDD",
+            highlightthickness=0,
+            cursor="sb_h_double_arrow"
+        )
+        self.timeline_canvas.grid(row=5, column=0, columnspan=3, pady=(0, 8))
+        self.timeline_canvas.bind("<Motion>", lambda e: self._on_timeline_hover(e.x))
+        self.timeline_canvas.bind("<Button-1>", self._on_timeline_press)
+        self.timeline_canvas.bind("<B1-Motion>", self._on_timeline_drag)
+        self.timeline_canvas.bind("<ButtonRelease-1>", self._on_timeline_release)
+        # 직접 입력한 시간도 필름스트립에 표시
+        for w in (self.start_min, self.start_sec, self.end_min, self.end_sec):
+            w.bind("<KeyRelease>", lambda e: self._draw_timeline_marks())
+
+    def _start_timeline(self):
+        """(메인 스레드) 지금 영상의 타임라인 프록시를 백그라운드에서 열거나 만든다."""
+        self._timeline_gen += 1
+        gen = self._timeline_gen
+        self.timeline = None
+        if self.timeline_canvas is not None:
+            self.timeline_canvas.delete("all")
+        source, index, index_dir = self.source, self.seek_index, self._index_dir()
+
+        def work():
+            from timeline import load_or_build
+            try:
+                proxy = load_or_build(
+                    source, index_dir, self.timeline_frames, index=index,
+                    on_progress=lambda p: self.after(0, lambda: self._on_timeline(p, gen)),
+                    # 구간 추출 중에는 멈추고, 영상이 바뀌면 중단
+                    keep_going=lambda: self._fg_idle.wait() and gen == self._timeline_gen
+                )
+            except Exception as e:
+                warn(f"timeline proxy unavailable: {e}")
+                return
+            if proxy is not None:
+                self.after(0, lambda: self._on_timeline(proxy, gen))
+
+        threading.Thread(target=work, name="timeline", daemon=True).start()
+
+    def _on_timeline(self, proxy, gen: int):
+        if gen != self._timeline_gen:
+            return
+        self.timeline = proxy
+        self._draw_timeline()
+
+    def _x_to_sec(self, x: float) -> float:
+        return min(max(x, 0), self.timeline_width) / self.timeline_width * self.duration_sec
+
+    def _sec_to_x(self, sec: float) -> float:
+        return sec / self.duration_sec * self.timeline_width if self.duration_sec > 0 else 0
+
+    def _proxy_at(self, sec: float) -> int:
+        f = self.seek_index.time_to_frame(sec) if self.seek_index is not None else int(sec * self.fps)
+        return self.timeline.nearest(f)
+
+    def _draw_timeline(self):
+        """채워진 프록시로 필름스트립 한 장을 만들어 캔버스에 그린다 (아직 없는 칸은 회색)."""
+        from PIL import Image, ImageTk
+        proxy = self.timeline
+        if proxy is None or self.timeline_canvas is None or self.duration_sec <= 0:
+            return
+        with span("timeline_draw"):
+            h, w = proxy.frames.shape[1:3]
+            tile_h = self.timeline_height
+            tile_w = max(1, round(w * tile_h / h))
+            n = max(1, self.timeline_width // tile_w)
+            strip = Image.new("RGB", (self.timeline_width, tile_h), "#DDDDDD")
+            for j in range(n):
+                i = self._proxy_at((j + 0.5) * self.duration_sec / n)
+                if proxy.has(i):
+                    tile = Image.fromarray(proxy.image(i)).resize((tile_w, tile_h), Image.BILINEAR)
+                    strip.paste(tile, (j * self.timeline_width // n, 0))
+            self._timeline_img = ImageTk.PhotoImage(strip)
+            self.timeline_canvas.delete("strip")
+            self.timeline_canvas.create_image(0, 0, anchor="nw", image=self._timeline_img, tags="strip")
+            self.timeline_canvas.tag_lower("strip")
+        self._draw_timeline_marks()
+
+    def _draw_timeline_marks(self, start_s=None, end_s=None):
+        """고른 구간 표시 (인자가 없으면 입력칸의 시간)."""
+        if self.timeline_canvas is None or self.duration_sec <= 0:
+            return
+        if start_s is None:
+            start_s = self._parse_mmss(self.start_min, self.start_sec)
+            end_s = self._parse_mmss(self.end_min, self.end_sec)
+        c = self.timeline_canvas
+        c.delete("mark")
+        if start_s is None or end_s is None or end_s <= start_s:
+            return
+        x0, x1 = self._sec_to_x(start_s), self._sec_to_x(end_s)
+        c.create_rectangle(x0, 1, x1, self.timeline_height - 1, outline="#00AEEF", width=2, tags="mark")
+        c.create_rectangle(x0, self.timeline_height + 2, x1, self.timeline_height + 8,
+                           fill="#00AEEF", outline="", tags="mark")
+
+    def _on_timeline_hover(self, x: float):
+        """커서 위치의 프록시 프레임을 미리보기 (2배)."""
+        from PIL import Image, ImageTk
+        if self.timeline is None or self.duration_sec <= 0:
+            return
+        c = self.timeline_canvas
+        c.delete("cursor")
+        c.create_line(x, 0, x, self.timeline_height + 8, fill="#A00", tags="cursor")
+        sec = self._x_to_sec(x)
+        i = self._proxy_at(sec)
+        if not self.timeline.has(i):
+            return
+        img = Image.fromarray(self.timeline.image(i))
+        img = img.resize((img.width * 2, img.height * 2), Image.BILINEAR)
+        self._timeline_preview_img = ImageTk.PhotoImage(img)
+        self.timeline_preview.config(image=self._timeline_preview_img,
+                                     text=f"{int(sec // 60):02d}:{sec % 60:04.1f}")
+
+    def _on_timeline_press(self, event):
+        if self.timeline is not None:
+            self._scrub_from = self._x_to_sec(event.x)
+
+    def _on_timeline_drag(self, event):
+        self._on_timeline_hover(event.x)
+        if self._scrub_from is not None:
+            a, b = sorted((self._scrub_from, self._x_to_sec(event.x)))
+            self._draw_timeline_marks(a, b)
+
+    def _on_timeline_release(self, event):
+        """드래그가 끝나면 구간을 초 단위로 (시작 버림 / 끝 올림) 입력칸에 넣는다. 클릭만 하면 미리보기만."""
+        if self._scrub_from is None:
+            return
+        a, b = sorted((self._scrub_from, self._x_to_sec(event.x)))
+        self._scrub_from = None
+        start_s, end_s = int(a), min(int(math.ceil(b)), int(self.duration_sec))
+        if end_s <= start_s or str(self.start_min.cget("state")) == tk.DISABLED:
+            self._draw_timeline_marks()
+            return
+        self._set_time_entries(start_s, end_s)
+        self._draw_timeline_marks()
 
     def _parse_mmss(self, m_entry: tk.Entry, s_entry: tk.Entry):
         try:
@@ -235,6 +910,8 @@ class FrameSelectorApp(tk.Tk):
             return None
 
     def on_confirm_time(self):
+        if not self.video_ready:
+            return
         start_s = self._parse_mmss(self.start_min, self.start_sec)
         end_s   = self._parse_mmss(self.end_min, self.end_sec)
 
@@ -250,7 +927,10 @@ class FrameSelectorApp(tk.Tk):
         if start_s > self.duration_sec or end_s > self.duration_sec:
             messagebox.showwarning("Invalid", "Please enter the time again.")
             return
+        self._begin_extraction(start_s, end_s)
 
+    def _begin_extraction(self, start_s: float, end_s: float):
+        """(메인 스레드) 검증이 끝난 구간을 추출 시작 (확인 버튼 / 큐 모드 자동 시작)."""
         # (동작) 시간 확정 후 입력 비활성화
         self.confirm_btn.config(state=tk.DISABLED)
         for w in (self.start_min, self.start_sec, self.end_min, self.end_sec):
@@ -261,34 +941,431 @@ class FrameSelectorApp(tk.Tk):
         self.loading_label = tk.Label(self, text="Loading..", font=self.ui_font_huge)
         self.loading_label.place(relx=0.5, rely=0.75, anchor="center")
 
+        # (작업 공간) 다시 설정한 구간은 새 run 폴더에 추출, 이전 run 은 백그라운드 삭제
+        if self._run_used:
+            if self.store is not None:
+                self.store.drop(self.output_dir)
+            self.output_dir = self.workspace.new_run()
+        self._run_used = True
+
+        # (측정) 확인 → 첫 썸네일 표시까지 시간
+        self._t_confirm = time.perf_counter()
+        self._set_extracting(True)
+        self._shown_first = False
+        self._session += 1
+
         # (성능) 프레임 추출은 스레드로 처리하여 GUI 멈춤 방지
         t = threading.Thread(target=self._extract_and_then_show, args=(start_s, end_s), daemon=True)
         t.start()
 
     # 프레임 추출 & 썸네일
     def _extract_and_then_show(self, start_s: float, end_s: float):
+        from video_to_frames import sec_to_frame_range, extract_frames_range
         if not self.video_path.exists():
             self.after(0, lambda: messagebox.showerror("Error", f"Video not found:\n{self.video_path}"))
             return
 
         info(f"output directory: {self.output_dir.resolve()}")
+        if self.sparse:
+            self._prepare_sparse(start_s, end_s)
+            return
+
+        # (점진 표시) 저장이 끝난 프레임 인덱스를 받을 때마다 메인 스레드로 넘김
+        session = self._session
+        self.all_frame_files = []
+        self.scorer = self._new_scorer()
+
+        def on_progress(indices):
+            self.after(0, lambda: self._on_frames_available(indices, session))
+
+        try:
+            start_f, end_f = sec_to_frame_range(start_s, end_s, self.fps, self.seek_index)
+            self.range_start_f, self.range_end_f = start_f, end_f
+            self.stride = self._budget_stride(start_f, end_f)
+        except Exception as e:
+            msg = str(e)
+            self.after(0, lambda m=msg: self._on_extraction_failed(m, session))
+            return
+
+        if self.frame_cache is not None:
+            try:
+                self._extract_cached(start_f, end_f, self.stride, on_progress)
+            except Exception as e:
+                msg = str(e)
+                self.after(0, lambda m=msg: self._on_extraction_failed(m, session))
+                return
+            self.after(0, lambda: self._on_extraction_done(session))
+            return
+
         try:
             extract_frames_range(
-                video_path=self.video_path,
+                video_path=self.source,
                 output_dir=self.output_dir,   # 위에서 만든 "frames/동영상이름" 경로
                 start_sec=start_s,
                 end_sec=end_s,
                 zero_pad=self.zero_pad,
-                start_index=self.start_index
+                start_index=self.start_index,
+                workers=self.workers,
+                writers=self.writers,
+                frame_format=self.frame_format,
+                quality=self.frame_quality,
+                proxy_size=self._proxy_size(),
+                on_progress=on_progress,
+                scorer=self.scorer,
+                index=self.seek_index,
+                quota=self.workspace.quota,
+                stride=self.stride,
+                store=self.store
             )
+        except DiskQuotaExceeded as e:
+            # (용량 한도) 그때까지 추출된 프레임으로 계속 진행
+            msg = str(e)
+            warn(msg)
+            self.after(0, lambda m=msg: messagebox.showwarning("용량 한도", f"추출을 중간에 멈췄습니다.\n{m}"))
         except Exception as e:
             msg = str(e)
-            self.after(0, lambda m=msg: messagebox.showerror("Error", m))
+            self.after(0, lambda m=msg: self._on_extraction_failed(m, session))
             return
 
+        self.after(0, lambda: self._on_extraction_done(session))
+
+    # 점진 표시 (메인 스레드)
+    def _on_frames_available(self, indices: list[int], session: int):
+        """추출 진행 이벤트: 후보 목록에 추가하고, 충분히 모였으면 첫 스테이지를 띄운다."""
+        if session != self._session:
+            return  # 이전 구간의 늦은 이벤트
+        self.all_frame_files.extend(self._frame_path(f) for f in indices)
+        if not self._shown_first and len(self.all_frame_files) >= self.stream_min_frames:
+            self._shown_first = True
+            self._after_loading()
+        self._update_status()
+
+    def _on_extraction_done(self, session: int):
+        if session != self._session:
+            return
+        self._set_extracting(False)
         # (중요) 추출된 프레임을 정렬하여 표시 대상 리스트 구성
-        self.all_frame_files = [str(p) for p in sorted(self.output_dir.glob("*.png"))]
-        self.after(0, self._after_loading)
+        self.all_frame_files.sort()
+        info(f"extraction finished: {len(self.all_frame_files)} frames available")
+        if not self._shown_first:
+            self._shown_first = True
+            self._after_loading()
+        else:
+            # 추출 중에는 미뤄 뒀던 다음 스테이지 준비
+            self._prefetch_next_stage()
+        self._update_status()
+        self._maybe_prefetch_clip()
+
+    def _on_extraction_failed(self, msg: str, session: int):
+        if session != self._session:
+            return
+        self._set_extracting(False)
+        messagebox.showerror("Error", msg)
+        self._update_status()
+
+    def _set_extracting(self, on: bool):
+        """지금 클립의 추출 상태. 추출 중에는 다음 클립 미리 준비가 멈춘다 (UI/디코딩 자원 우선)."""
+        self._extracting = on
+        if on:
+            self._fg_idle.clear()
+        else:
+            self._fg_idle.set()
+
+    def _update_status(self):
+        """상단바: 추출 진행 중이면 모인 프레임 수 표시 + 시간 다시 설정 / 선택 확인 잠금."""
+        if self.status_label is not None:
+            n = len(self.all_frame_files)
+            text = f"추출 중.. {n} frames" if self._extracting else f"{n} frames"
+            if self.stride > 1:
+                text += f" ({self.stride}프레임 간격)"
+            self.status_label.config(text=text)
+        if self.retime_btn is not None:
+            self.retime_btn.config(state=(tk.DISABLED if self._extracting else tk.NORMAL))
+        if self.refine_btn is not None:
+            self.refine_btn.config(state=(tk.DISABLED if self._extracting or self.stride <= 1 else tk.NORMAL))
+        if self.selected_panel is not None:
+            self._update_confirm_state()
+
+    # 추출 예산
+    def _budget_stride(self, start_f: int, end_f: int, source=None, index=None) -> int:
+        """(워커 스레드) 예산(max_frames / max_mb)에 맞는 추출 간격. 예산이 없으면 1. (source: 다른 클립)"""
+        from video_to_frames import choose_stride
+        if not (self.max_frames or self.max_mb):
+            return 1
+        if source is None:
+            source, index = self.source, self.seek_index
+        return choose_stride(
+            source, start_f, end_f,
+            max_frames=self.max_frames,
+            max_bytes=int(self.max_mb * 1024 ** 2) if self.max_mb else None,
+            frame_format=self.frame_format,
+            quality=self.frame_quality,
+            proxy_size=self.store.size if self.store is not None else self._proxy_size(),
+            index=index
+        )
+
+    def _on_refine(self):
+        """
+        (2차 추출) 마지막으로 선택한 프레임 앞뒤 stride 범위를 촘촘하게(예산 안에서) 다시 추출하고,
+        그 범위 안에서 스테이지를 처음부터 다시 고른다. 선택한 이미지는 유지.
+        """
+        if self._extracting or self.stride <= 1:
+            return
+        if not self.selected_files:
+            messagebox.showinfo("안내", "자세히 볼 이미지를 먼저 선택하세요.")
+            return
+        f = self._frame_index(self.selected_files[-1])
+        a = max(self.range_start_f, f - self.stride + 1)
+        b = min(self.range_end_f, f + self.stride - 1)
+        keep = list(self.selected_files)
+
+        self._session += 1          # 진행 중이던 미리 준비 결과는 버림
+        session = self._session
+        self._set_extracting(True)
+        self._pending_stage = None
+        self._update_status()
+
+        def work():
+            try:
+                stride = self._budget_stride(a, b)
+                files = self._extract_window(a, b, stride)
+            except Exception as e:
+                msg = str(e)
+                self.after(0, lambda m=msg: self._on_extraction_failed(m, session))
+                return
+            self.after(0, lambda: self._on_refined(files, stride, keep, session))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _extract_window(self, start_f: int, end_f: int, stride: int) -> list[str]:
+        """(워커 스레드) 현재 구간 안의 start_f ~ end_f 를 stride 간격으로 추출, 파일 경로 리스트 반환."""
+        from video_to_frames import extract_frames_span
+        if self.frame_cache is not None:
+            return self._extract_cached(start_f, end_f, stride)
+        n = extract_frames_span(
+            video_path=self.source,
+            output_dir=self.output_dir,
+            start_f=start_f,
+            end_f=end_f,
+            zero_pad=self.zero_pad,
+            start_index=self.start_index + start_f - self.range_start_f,  # 구간 기준 파일명 유지
+            workers=self.workers,
+            writers=self.writers,
+            frame_format=self.frame_format,
+            quality=self.frame_quality,
+            proxy_size=self._proxy_size(),
+            scorer=self.scorer,
+            index=self.seek_index,
+            quota=self.workspace.quota,
+            stride=stride,
+            store=self.store
+        )
+        return [self._frame_path(f) for f in range(start_f, end_f + 1, stride)][:n]
+
+    def _on_refined(self, files: list[str], stride: int, keep: list[str], session: int):
+        if session != self._session:
+            return
+        self._set_extracting(False)
+        self.stride = stride
+        self.all_frame_files = files
+        info(f"refine: {len(files)} frames around selection (every {stride})")
+        self.shown_stages = []
+        self.index_map = {fp: self.index_map[fp] for fp in keep if fp in self.index_map}  # 선택 번호는 유지
+        self.stage_idx = -1
+        self.stage = 0
+        self.selected_files = keep
+        self._next_stage()
+        self._restore_nav_state()
+        self._refresh_selected_panel()
+        self._update_status()
+
+    # 영구 캐시
+    def _extract_cached(self, start_f: int, end_f: int, stride: int = 1,
+                        on_progress=None) -> list[str]:
+        """
+        (캐시 모드) 구간(stride 간격) 중 캐시에 아직 없는 연속 구간만 추출해서 채우고,
+        구간 전체 프레임 경로 리스트를 돌려준다. (워커 스레드에서 호출됨)
+        - on_progress: 이미 캐시에 있던 프레임을 먼저 알리고, 새로 추출되는 프레임도 이어서 알린다.
+        """
+        from video_to_frames import extract_frames_span
+        from frame_cache import CACHE_PAD
+        entry = self._open_cache_entry()
+        if self.scorer is not None:
+            self.scorer.merge(entry.load_scores(), entry.load_hashes())  # 캐시된 프레임 점수/해시도 재사용
+
+        grid = range(start_f, end_f + 1, stride)
+        if on_progress is not None:
+            cached = [f for f in grid if entry.has(f)]
+            if cached:
+                on_progress(cached)
+
+        runs = entry.missing_runs(start_f, end_f, stride)
+        todo = sum((b - a) // stride + 1 for a, b in runs)
+        info(f"frame cache: {todo} of {len(grid)} frames to extract")
+        for a, b in runs:
+            n = extract_frames_span(
+                video_path=self.source,
+                output_dir=entry.dir,
+                start_f=a,
+                end_f=b,
+                zero_pad=CACHE_PAD,
+                start_index=a,            # 파일명 = 절대 프레임 인덱스
+                workers=self.workers,
+                writers=self.writers,
+                frame_format=self.frame_format,
+                quality=self.frame_quality,
+                proxy_size=self._proxy_size(),
+                on_progress=on_progress,
+                scorer=self.scorer,
+                index=self.seek_index,
+                stride=stride
+            )
+            entry.add(range(a, a + n * stride, stride))
+            if n < (b - a) // stride + 1:
+                break  # 영상이 여기서 끝남
+
+        if self.scorer is not None and runs:
+            entry.save_scores(self.scorer.metrics, self.scorer.hashes)
+
+        self.frame_cache.evict(keep=entry)
+        return [self._frame_path(f) for f in grid if entry.has(f)]
+
+    # 희소 추출
+    def _prepare_sparse(self, start_s: float, end_s: float):
+        """
+        (희소 모드) 구간 전체를 후보 경로로만 만들어 두고,
+        첫 스테이지에 보일 프레임만 골라 추출한 뒤 화면으로 넘어간다.
+        - 워커 스레드에서 호출됨.
+        """
+        from video_to_frames import sec_to_frame_range
+        try:
+            start_f, end_f = sec_to_frame_range(start_s, end_s, self.fps, self.seek_index)
+            self.range_start_f, self.range_end_f = start_f, end_f
+            self.stride = 1
+            self._materialized = set()
+            if self.frame_cache is not None:
+                # (캐시 모드) 이미 캐시에 있는 프레임은 추출된 것으로 취급
+                entry = self._open_cache_entry()
+                self._materialized = {self._frame_path(f) for f in range(start_f, end_f + 1)
+                                      if entry.has(f)}
+            self.all_frame_files = [self._frame_path(f) for f in range(start_f, end_f + 1)]
+            self._pending_stage = None
+            stage_files = self._pick_stage_files()
+            saved = self._extract_sparse(stage_files)
+            # (성능) 첫 스테이지 썸네일도 이 워커 스레드에서 미리 디코딩 (첫 화면에 보일 만큼)
+            self.thumb_loader.prefetch(saved[:self._first_screen()], self.thumb_size)
+        except Exception as e:
+            msg = str(e)
+            self.after(0, lambda m=msg: messagebox.showerror("Error", m))
+            return
+
+        def apply():
+            self._set_extracting(False)
+            self._shown_first = True
+            self._apply_sparse(stage_files, saved)
+            self._after_loading()
+            self._maybe_prefetch_clip()
+        self.after(0, apply)
+
+    def _extract_sparse(self, files: list[str]) -> list[str]:
+        """files 중 아직 저장되지 않은 것만 추출하고, 저장된 경로 리스트를 돌려준다."""
+        from video_to_frames import extract_frames_at
+        from frame_cache import CACHE_PAD
+        missing = [self._frame_index(fp) for fp in files if fp not in self._materialized]
+        entry = self._cache_entry
+        saved = extract_frames_at(
+            video_path=self.source,
+            output_dir=entry.dir if entry else self.output_dir,
+            frame_indices=missing,
+            base_frame=0 if entry else self.range_start_f,
+            zero_pad=CACHE_PAD if entry else self.zero_pad,
+            start_index=0 if entry else self.start_index,
+            frame_format=self.frame_format,
+            quality=self.frame_quality,
+            proxy_size=self._proxy_size(),
+            index=self.seek_index,
+            quota=None if entry else self.workspace.quota,
+            store=self.store
+        )
+        if entry is not None:
+            entry.add(saved)
+        return [self._frame_path(f) for f in saved]
+
+    def _apply_sparse(self, stage_files: list[str], saved: list[str]):
+        """
+        (메인 스레드) 추출 결과 반영.
+        - 영상 끝을 넘어 저장되지 못한 후보는 전체 목록에서 제외한다.
+        """
+        self._materialized.update(saved)
+        dropped = {fp for fp in stage_files if fp not in self._materialized}
+        if dropped:
+            self.all_frame_files = [p for p in self.all_frame_files if p not in dropped]
+        self._pending_stage = [fp for fp in stage_files if fp in self._materialized]
+
+    # 다음 스테이지 미리 준비
+    def _prefetch_next_stage(self):
+        """
+        지금 스테이지를 보는 동안 다음 스테이지 후보를 미리 골라 썸네일까지 디코딩해 둔다.
+        - 희소 모드는 추출도 백그라운드에서 먼저 해 둔다.
+        """
+        if self._pending_stage or self._prefetching:
+            return
+        if len(self.shown_stages) >= self.max_stages:
+            return
+        if not self.sparse and self._extracting:
+            return  # 추출 중엔 후보가 계속 늘어나므로 다음 스테이지는 Next Page 때 고른다
+        stage_files = self._pick_stage_files()
+        if not stage_files:
+            return
+
+        if not self.sparse:
+            self._pending_stage = stage_files
+            self.thumb_loader.prefetch(stage_files[:self._first_screen()], self.thumb_size)
+            return
+
+        self._prefetching = True
+        session = self._session
+
+        def work():
+            try:
+                saved = self._extract_sparse(stage_files)
+            except Exception as e:
+                msg = str(e)
+                self.after(0, lambda m=msg: self._on_prefetch_failed(m, session))
+                return
+            self.thumb_loader.prefetch(saved[:self._first_screen()], self.thumb_size)
+            self.after(0, lambda: self._on_prefetched(stage_files, saved, session))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _on_prefetched(self, stage_files: list[str], saved: list[str], session: int):
+        self._prefetching = False
+        if session != self._session:
+            return  # 그 사이 시간 다시 설정으로 구간이 바뀐 경우
+        self._apply_sparse(stage_files, saved)
+        if self._advance_when_ready:
+            self._advance_when_ready = False
+            if self._pending_stage:
+                self._next_stage()
+            else:
+                self._pending_stage = None
+                self._restore_nav_state()
+
+    def _on_prefetch_failed(self, msg: str, session: int):
+        self._prefetching = False
+        if session != self._session:
+            return
+        if self._advance_when_ready:
+            # (오류 처리) 사용자가 기다리는 중이면 알리고, 아니면 다음 클릭 때 다시 시도
+            self._advance_when_ready = False
+            messagebox.showerror("Error", msg)
+            self._restore_nav_state()
+        else:
+            warn(f"prefetch failed: {msg}")
+
+    def _restore_nav_state(self):
+        self.prev_btn.config(state=(tk.NORMAL if self.stage_idx >= 1 else tk.DISABLED))
+        self._update_next_btn_state()
 
     def _after_loading(self):
         if self.loading_label:
@@ -300,6 +1377,7 @@ class FrameSelectorApp(tk.Tk):
 
         # (레이아웃) 상단 버튼(썸네일 위, 오른쪽 정렬) 먼저 배치
         self._show_retime_button()
+        self._update_status()
 
         # (레이아웃) 썸네일 영역 구성 후 첫 스테이지 렌더
         self._build_thumb_panel()
@@ -339,6 +1417,22 @@ class FrameSelectorApp(tk.Tk):
         self.thumb_panel = tk.Frame(self.center_wrapper)
         self.thumb_panel.pack(padx=16, pady=12, anchor='n')  # (설정) 썸네일 주변 여백
 
+        # (성능) 가상 스크롤 그리드 - 보이는 행의 셀만 만들어 두고 스크롤하면 다시 배정
+        #  (페이지가 수천 장이어도 위젯/PhotoImage 수는 보이는 셀 수만큼)
+        from thumb_grid import ThumbGrid
+        self.thumb_grid = ThumbGrid(
+            self.thumb_panel, cols=self.grid_cols, view_rows=self.grid_rows,
+            thumb_size=self.thumb_size, bind_cell=self._bind_thumb_cell,
+            on_click=self._toggle_select, font=self.ui_font_big
+        )
+        self.thumb_grid.pack(side=tk.TOP)
+
+        # (안내 문구) 그리드 아래 - 스테이지마다 글자만 바꿈
+        self.guide_label = tk.Label(self.thumb_panel, font=self.ui_font_big)
+        self.guide_label.pack(side=tk.TOP, pady=(8, 0))
+        self.guide_tail = tk.Label(self.thumb_panel, fg="#666", font=self.ui_font)
+        self.guide_tail.pack(side=tk.TOP, pady=(4, 0))
+
         # (레이아웃) 페이지 네비게이션 버튼 컨트롤 바
         ctrl = tk.Frame(self.center_wrapper)
         ctrl.pack(pady=(0, 12), anchor='n')
@@ -375,6 +1469,14 @@ class FrameSelectorApp(tk.Tk):
             if len(self.shown_stages) >= self.max_stages:
                 self._update_next_btn_state()
                 return
+            if self.sparse and not self._pending_stage:
+                # (희소 모드) 미리 추출이 아직이면 끝날 때까지 페이지 이동 비활성화
+                #  → 끝나면 _on_prefetched 가 _next_stage 로 버튼 상태까지 갱신
+                self._advance_when_ready = True
+                self.retry_btn.config(state=tk.DISABLED)
+                self.prev_btn.config(state=tk.DISABLED)
+                self._prefetch_next_stage()
+                return
             self._next_stage()
 
         if self.stage_idx >= 1:
@@ -388,23 +1490,48 @@ class FrameSelectorApp(tk.Tk):
         else:
             self.retry_btn.config(state=tk.NORMAL)
 
-    def _next_stage(self):
-        if len(self.shown_stages) >= self.max_stages:
-            self._update_next_btn_state()
-            return
+    def _new_scorer(self):
+        """추출하면서 같이 계산할 품질 점수/지각 해시 (둘 다 안 쓰면 None)."""
+        if not (self.smart_pick or self.dedup_distance > 0):
+            return None
+        from frame_quality import FrameScorer
+        return FrameScorer(hashes=self.dedup_distance > 0)
 
+    def _pick_stage_files(self) -> list[str]:
         # (로직) 이미 보인 프레임 제외하고 랜덤 샘플링
-        shown_set = set(sum(self.shown_stages, []))
+        shown = sum(self.shown_stages, [])
+        shown_set = set(shown)
         candidates = [p for p in self.all_frame_files if p not in shown_set]
         if len(candidates) == 0 and len(self.all_frame_files) > 0:
             candidates = list(self.all_frame_files)
 
-        k = min(4, len(candidates))  # (설정) 한 페이지당 썸네일 수
+        k = min(self.page_size, len(candidates))
         if k == 0:
+            return []
+
+        # (로직) 점수가 있으면 상위 프레임 중에서 시간 구간별로 고르게 선택하고,
+        #  이미 보인 프레임(또는 같은 페이지에서 먼저 고른 것)과 지각 해시가 가까운 후보는 다음 후보로 바꾼다
+        if self.scorer is not None and not self.sparse:
+            by_idx = {self._frame_index(p): p for p in candidates}
+            picked = self.scorer.pick_distinct(list(by_idx), k,
+                                               avoid=[self._frame_index(p) for p in shown],
+                                               distance=self.dedup_distance, smart=self.smart_pick)
+            return [by_idx[f] for f in picked]
+        return random.sample(candidates, k)
+
+    def _next_stage(self):
+        if len(self.shown_stages) >= self.max_stages:
+            self._update_next_btn_state()
+            return
+
+        # (희소 모드) 미리 골라 추출해 둔 파일이 있으면 그대로 사용
+        stage_files = self._pending_stage or self._pick_stage_files()
+        self._pending_stage = None
+        if not stage_files:
             return
 
-        stage_files = random.sample(candidates, k)
         self.shown_stages.append(stage_files)
+        instrument.count("stages")
 
         self.stage_idx += 1
         self.stage = self.stage_idx + 1
@@ -418,81 +1545,22 @@ class FrameSelectorApp(tk.Tk):
             self.prev_btn.config(state=tk.NORMAL)
         self._update_next_btn_state()
 
-    def _render_thumbs(self, file_list):
-        # (UI 갱신) 이전 썸네일 제거
-        for child in self.thumb_panel.winfo_children():
-            child.destroy()
+        # (성능) 지금 페이지를 보는 동안 다음 페이지를 미리 준비
+        self._prefetch_next_stage()
 
-        self._thumb_imgs = []
+    def _render_thumbs(self, file_list, keep_scroll: bool = False, rebuild: bool = False):
+        """
+        (스테이지 전환) 이 스테이지의 파일들을 그리드에 보인다 (셀 위젯은 그리드가 다시 씀).
+        - 클릭으로 선택만 바뀔 때는 부르지 않는다 (_toggle_select 가 바뀐 셀만 고침)
+        - keep_scroll: 같은 페이지를 다시 그릴 때 스크롤 위치 유지
+        - rebuild: 셀 위젯까지 새로 만든다 (벤치마크의 예전 방식 비교용)
+        """
+        t_render = time.perf_counter()
+        self._render_gen += 1
 
         # 혹시 번호가 비어있다면 현재 스테이지 기준으로 보정
         self._assign_numbers_for_stage(self.stage_idx, file_list)
-
-        # 썸네일 클릭 토글: 선택 ↔ 해제
-        def toggle_select(filepath):
-            if filepath in self.selected_files:
-                self.selected_files.remove(filepath)
-            else:
-                if len(self.selected_files) >= 2:
-                    messagebox.showinfo("Limit", "최대 2장까지만 선택할 수 있어요.")
-                    return
-                self.selected_files.append(filepath)
-            # (UI) 테두리/라벨 반영 위해 재렌더 + 우측 패널 즉시 갱신
-            self._render_thumbs(file_list)
-            self._refresh_selected_panel()
-
-        cols = 2  # (설정) 썸네일 그리드 열 수
-        for i, fp in enumerate(file_list):
-            try:
-                img = Image.open(fp).convert("RGB")
-                img.thumbnail(self.thumb_size)  # (설정) 중앙 썸네일 크기 적용
-                tkimg = ImageTk.PhotoImage(img)
-                self._thumb_imgs.append(tkimg)
-
-                is_selected = fp in self.selected_files
-
-                # (UI) 선택 시 파란 테두리 강조
-                relief = tk.SOLID if is_selected else tk.FLAT
-                bd = 3 if is_selected else 1
-                hl_thick = 2 if is_selected else 1
-                hl_color = "#00AEEF" if is_selected else "#CCCCCC"
-
-                # (레이아웃) 셀 컨테이너: 번호 라벨(위) + 캔버스(아래)
-                cell = tk.Frame(self.thumb_panel)
-                cell.grid(row=i // cols, column=i % cols, padx=12, pady=12)
-
-                num = self.index_map.get(fp, "?")
-
-                # (UI) 번호 라벨 - 이미지 '바깥' 상단(왼쪽 정렬)
-                num_label = tk.Label(
-                    cell,
-                    text=str(num),
-                    font=self.ui_font_big,
-                    anchor='w'
-                )
-                num_label.pack(side=tk.TOP, anchor='w')
-
-                # (UI) 이미지 표시 캔버스 + 선택 테두리 스타일
-                canvas = tk.Canvas(
-                    cell,
-                    width=tkimg.width(),
-                    height=tkimg.height(),
-                    bd=bd,
-                    relief=relief,
-                    highlightthickness=hl_thick,
-                    highlightbackground=hl_color,
-                    highlightcolor=hl_color
-                )
-                canvas.pack(side=tk.TOP)
-
-                canvas.create_image(0, 0, anchor='nw', image=tkimg)
-
-                # (동작) 이미지/번호 라벨 클릭 -> 선택 토글
-                num_label.bind("<Button-1>", lambda e, F=fp: toggle_select(F))
-                canvas.bind("<Button-1>", lambda e, F=fp: toggle_select(F))
-
-            except Exception as e:
-                warn(f"cannot open/thumbnail: {fp} ({e})")
+        self.thumb_grid.show(file_list, keep_scroll=keep_scroll, rebuild=rebuild)
 
         # (안내 문구) 마지막 스테이지에서는 '필요시 Next Page.' 제외
         base_text = f"Stage {self.stage}/{self.max_stages} — 이미지를 클릭해 선택 (최대 2장)."
@@ -500,77 +1568,149 @@ class FrameSelectorApp(tk.Tk):
             guide_text = base_text + " 필요시 Next Page."
         else:
             guide_text = base_text
+        self.guide_label.config(text=guide_text)
+        self.guide_tail.config(text="(우측 '확인' 버튼으로 진행하세요.)" if self.stage == self.max_stages else "")
+        instrument.add_time("tk_render", time.perf_counter() - t_render)
+
+    # 썸네일 클릭 토글: 선택 ↔ 해제
+    def _toggle_select(self, filepath: str):
+        instrument.count("clicks")
+        if filepath not in self.selected_files and len(self.selected_files) >= 2:
+            messagebox.showinfo("Limit", "최대 2장까지만 선택할 수 있어요.")
+            return
+        with span("click"):
+            if filepath in self.selected_files:
+                self.selected_files.remove(filepath)
+            else:
+                self.selected_files.append(filepath)
+            # (성능) 그리드는 그 셀의 테두리만, 우측 패널은 달라진 칸만 고친다
+            #  (셀 위젯/이미지는 그대로 - 전부 다시 그리는 건 스테이지가 바뀔 때만)
+            self._restyle_thumb(filepath)
+            self._refresh_selected_panel()
 
-        guide = tk.Label(
-            self.thumb_panel,
-            text=guide_text,
-            font=self.ui_font_big
-        )
-        guide.grid(row=(len(file_list) + 1) // cols + 1, column=0, columnspan=cols, pady=(8, 0))
-
-        if self.stage == self.max_stages:
-            tail = tk.Label(
-                self.thumb_panel,
-                text="(우측 '확인' 버튼으로 진행하세요.)",
-                fg="#666",
-                font=self.ui_font
+    def _restyle_thumb(self, fp: str):
+        """fp 가 지금 화면에 있으면 그 셀의 선택 테두리만 갱신."""
+        cell = self.thumb_grid.cell_of(fp) if self.thumb_grid is not None else None
+        if cell is not None:
+            self._style_thumb(cell, fp in self.selected_files)
+
+    def _style_thumb(self, cell, selected: bool):
+        # (UI) 선택 시 파란 테두리 강조 - 상태가 바뀔 때만 config (Tk 위젯 설정 1번)
+        if cell.selected == selected:
+            return
+        cell.selected = selected
+        hl_color = "#00AEEF" if selected else "#CCCCCC"
+        cell.canvas.config(bd=3 if selected else 1, relief=tk.SOLID if selected else tk.FLAT,
+                           highlightthickness=2 if selected else 1,
+                           highlightbackground=hl_color, highlightcolor=hl_color)
+
+    def _bind_thumb_cell(self, cell, fp: str, index: int):
+        """(그리드 콜백) 셀에 fp 를 채운다 - 번호, 선택 테두리, 썸네일 (캐시에 없으면 백그라운드 디코딩)."""
+        try:
+            # (UI) 번호 라벨 - 이미지 '바깥' 상단(왼쪽 정렬)
+            cell.label.config(text=str(self.index_map.get(fp, "?")))
+            self._style_thumb(cell, fp in self.selected_files)
+
+            # (성능) 캐시에 있으면 바로 그리고, 없으면 백그라운드 디코딩 후 채움
+            img = self.thumb_cache.peek(fp, self.thumb_size)  # (설정) 중앙 썸네일 크기 적용
+            if img is not None:
+                self._draw_thumb(cell, img)
+                return
+            #  - 썸네일이 준비될 때까지는 회색 자리표시(placeholder)
+            cell.tkimg = None
+            cell.canvas.delete("all")
+            cell.canvas.config(width=self.thumb_size[0], height=self.thumb_size[1])
+            cell.canvas.create_text(self.thumb_size[0] // 2, self.thumb_size[1] // 2,
+                                    text="Loading..", fill="#666", font=self.ui_font)
+            gen = self._render_gen
+            self.thumb_loader.request(
+                fp, self.thumb_size,
+                lambda F, im, err, C=cell: self.after(0, lambda: self._on_thumb_loaded(gen, C, F, im, err))
             )
-            tail.grid(row=(len(file_list) + 1) // cols + 2, column=0, columnspan=cols, pady=(4, 0))
+        except Exception as e:
+            warn(f"cannot open/thumbnail: {fp} ({e})")
+
+    def _draw_thumb(self, cell, img):
+        from PIL import ImageTk
+        with span("tk_draw"):
+            tkimg = ImageTk.PhotoImage(img)
+            cell.tkimg = tkimg  # 셀이 다시 배정될 때 놓아 줌
+            cell.canvas.delete("all")
+            cell.canvas.config(width=tkimg.width(), height=tkimg.height())
+            cell.canvas.create_image(0, 0, anchor='nw', image=tkimg)
+
+        # (측정) 확인 버튼 → 첫 썸네일 표시까지 걸린 시간
+        if self._t_confirm is not None:
+            self.last_ttft = time.perf_counter() - self._t_confirm
+            self._t_confirm = None
+            info(f"time to first thumbnail: {self.last_ttft:.2f}s")
+
+    def _on_thumb_loaded(self, gen: int, cell, fp: str, img, err):
+        """(메인 스레드) 백그라운드 썸네일 도착 → 셀이 아직 같은 파일을 보이고 있으면 자리표시를 교체."""
+        if gen != self._render_gen or cell.item != fp or not cell.canvas.winfo_exists():
+            return  # 그 사이 다시 그려졌거나 스크롤로 다른 항목에 배정됐으면 무시 (이미지는 캐시에 남아 있음)
+        if err is not None:
+            warn(f"cannot open/thumbnail: {fp} ({err})")
+            cell.canvas.delete("all")
+            cell.canvas.create_text(self.thumb_size[0] // 2, self.thumb_size[1] // 2,
+                                    text="(error)", fill="#A00", font=self.ui_font)
+            return
+        self._draw_thumb(cell, img)
 
-    #  저장 유틸
-    def _unique_dest_path(self, dest_dir: Path, base_name: str) -> Path:
-        """이름 충돌 시 *_1, *_2 ... 붙여서 고유 경로 생성"""
-        dest_path = dest_dir / base_name
-        if not dest_path.exists():
-            return dest_path
-        stem, ext = os.path.splitext(base_name)
-        i = 1
-        while True:
-            cand = dest_dir / f"{stem}_{i}{ext}"
-            if not cand.exists():
-                return cand
-            i += 1
+    def _first_screen(self) -> int:
+        """스크롤 없이 처음 보이는 썸네일 수 (미리 디코딩할 만큼)."""
+        return max(1, self.grid_cols) * max(1, self.grid_rows)
 
+    #  저장 유틸
     def _copy_selected_to_dir(self, dest_dir: Path) -> list[Path]:
         """
-        선택 파일들을 dest_dir에 복사, 최종 목적지 경로 리스트 반환
-        - 실제로 유저가 선택한 최종 두 장만 지정한 폴더에 복사한다.
+        선택 파일들을 dest_dir에 내보내고, 최종 목적지 경로 리스트 반환
+        - 실제로 유저가 선택한 최종 두 장만 지정한 폴더에 저장한다.
+        - 임시 프레임이 원본 해상도 무손실 PNG 면 하드링크/reflink (안 되면 복사) 로 옮긴다
+          (세션 폴더는 어차피 곧 지우므로 데이터를 다시 쓸 필요가 없음).
+        - 아니면(손실/배열/메모리 포맷, 프록시) 원본 영상에서 프레임 인덱스로 다시 디코딩한다.
+        - export_variants 의 포맷/품질/크기별 파일을 병렬로 인코딩 (기본: 원본 PNG 1개).
         """
-        saved_paths = []
-        dest_dir.mkdir(parents=True, exist_ok=True)
-        for src in self.selected_files[:2]:
-            src_path = Path(src)
-            target = self._unique_dest_path(dest_dir, src_path.name)
-            shutil.copy2(str(src_path), str(target))
-            saved_paths.append(target)
-        return saved_paths
+        from export import export_frames
+        from video_to_frames import iter_frames_at
+        selected = self.selected_files[:2]
+        if self.frame_format == "png" and not self.proxy:
+            items = [(Path(src).stem, Path(src), None) for src in selected]
+        else:
+            by_index = {self._frame_index(src): src for src in selected}
+            items = [(Path(by_index[f]).stem, None, frame)
+                     for f, frame in iter_frames_at(self.source, by_index, index=self.seek_index)]
+        # 영구 캐시의 파일은 계속 쓰이므로 하드링크하지 않는다 (내보낸 파일을 고치면 캐시도 바뀜)
+        return export_frames(items, dest_dir, self.export_variants,
+                             hardlink=self.frame_cache is None)
 
     def _cleanup_frames_dir(self):
         """
-        (정리용) frames/<video_name> 임시 프레임 폴더 전체 삭제.
+        (정리용) 이번 실행의 세션 폴더(모든 run 포함) 삭제.
         - 선택/다운로드가 끝나면 더 이상 필요 없으므로 자동 정리해서
           디스크/메모리 사용량을 줄인다.
+        - 프레임이 수만 장이어도 창이 멈추지 않도록 백그라운드 스레드에서 지운다
+          (중간에 프로세스가 죽으면 다음 실행의 sweep_stale 이 마저 정리).
         """
+        if self.store is not None:
+            self.store.drop(self.workspace.dir)  # (큐 모드) 미리 준비한 다음 클립 프레임은 유지
         try:
-            if self.output_dir.exists():
-                shutil.rmtree(self.output_dir)
-                info(f"cleanup: deleted frames directory: {self.output_dir}")
-            else:
-                info(f"cleanup: frames directory not found (skip): {self.output_dir}")
+            self.workspace.close()
         except Exception as e:
             # 삭제에 실패해도 앱이 죽지 않도록 경고만 남김
-            warn(f"cleanup failed for {self.output_dir}: {e}")
+            warn(f"cleanup failed for {self.workspace.dir}: {e}")
 
     def _on_delete_selected(self):
         # (동작) 한 번 누르면 마지막(두 번째)만 제거, 다시 누르면 남은 한 장 제거
         if len(self.selected_files) == 0:
             return
-        self.selected_files.pop()
+        fp = self.selected_files.pop()
         self._refresh_selected_panel()
-        if 0 <= self.stage_idx < len(self.shown_stages):
-            self._render_thumbs(self.shown_stages[self.stage_idx])
+        self._restyle_thumb(fp)
 
     def _on_confirm_selected(self):
+        if self._extracting:
+            return  # 버튼은 잠겨 있음 (추출이 끝나면 풀림)
         if len(self.selected_files) != 2:
             messagebox.showinfo("안내", "이미지 2장을 선택해야 합니다.")
             return
@@ -583,20 +1723,30 @@ class FrameSelectorApp(tk.Tk):
         - 그 후 frames/<video_name> 임시 프레임 폴더와 내부 프레임들을 모두 삭제.
         """
         chosen = self.selected_files[:2]
+        info(f"thumbnail cache: {self.thumb_cache.stats()}")
         info("selected files:")
         for p in chosen:
             info(f" - {p}")
 
         try:
-            # (동작) 사용자에게 최종 저장할 폴더 선택 받기
-            dest = filedialog.askdirectory(title="저장할 폴더를 선택하세요")
+            # (동작) 사용자에게 최종 저장할 폴더 선택 받기 (큐 모드는 처음 1번만)
+            dest = self._export_dir or filedialog.askdirectory(title="저장할 폴더를 선택하세요")
             if dest:
                 try:
                     dest_dir = Path(dest)
-                    saved_paths = self._copy_selected_to_dir(dest_dir)
+                    if self.queue:
+                        # (큐 모드) 클립마다 하위 폴더 (batch.py 와 같은 이름)
+                        from clip_queue import clip_dir_name
+                        self._export_dir = dest
+                        dest_dir = dest_dir / clip_dir_name(self.video_path, self.range_start_f, self.range_end_f)
+                    with span("export"):
+                        saved_paths = self._copy_selected_to_dir(dest_dir)
                     done("selection complete and saved.")
                     lines = "\n".join(str(p) for p in saved_paths)
-                    messagebox.showinfo("저장 완료", f"다음 위치에 저장했습니다:\n{lines}")
+                    if not self.queue:  # 큐 모드는 창을 막지 않고 바로 다음 클립으로 (콘솔에만 기록)
+                        messagebox.showinfo("저장 완료", f"다음 위치에 저장했습니다:\n{lines}")
+                    else:
+                        info(f"saved:\n{lines}")
                 except Exception as e:
                     # (오류 처리) 선택된 프레임 복사 중 문제 발생
                     error_msg = f"저장 중 오류: {e}"
@@ -610,7 +1760,20 @@ class FrameSelectorApp(tk.Tk):
             # (중요) 선택/저장 절차가 끝나면 임시 프레임 폴더 자동 삭제
             self._cleanup_frames_dir()
 
-        # (UI 종료) 앱 창 닫기
+        if self.stats:
+            self._write_stats_report()
+
+        # (큐 모드) 남은 클립이 있으면 창을 닫지 않고 다음 클립으로
+        if self.queue and self._advance_queue():
+            return
+        self._close_app()
+
+    def _close_app(self):
+        # (UI 종료) 앱 창 닫기 (영상 열기 전에 실패하면 로더가 아직 없음)
+        if self.thumb_loader is not None:
+            self.thumb_loader.shutdown()
+        if self.source is not None:
+            self.source.close()
         self.destroy()
 
     # 상단 시간 다시 설정
@@ -622,6 +1785,12 @@ class FrameSelectorApp(tk.Tk):
             except Exception:
                 pass
             self.retime_btn = None
+        if self.refine_btn:
+            try:
+                self.refine_btn.destroy()
+            except Exception:
+                pass
+            self.refine_btn = None
         if self.top_bar:
             try:
                 self.top_bar.destroy()
@@ -633,6 +1802,14 @@ class FrameSelectorApp(tk.Tk):
         self.top_bar = tk.Frame(self)
         self.top_bar.pack(side=tk.TOP, fill=tk.X, pady=(8, 6))
 
+        # (UI) 왼쪽: 추출 진행 상태
+        self.status_label = tk.Label(self.top_bar, text="", fg="#666", font=self.ui_font)
+        self.status_label.pack(side=tk.LEFT, padx=(12, 0))
+        if self.stats:
+            self.stats_label = tk.Label(self.top_bar, text=instrument.stats_line(),
+                                        fg="#888", font=self.ui_font)
+            self.stats_label.pack(side=tk.LEFT, padx=(24, 0))
+
         self.retime_btn = tk.Button(
             self.top_bar, text="시간 다시 설정",
             command=self._reset_to_time_form,
@@ -640,10 +1817,24 @@ class FrameSelectorApp(tk.Tk):
         )
         self.retime_btn.pack(side=tk.RIGHT, padx=(0, 12))  # (설정) 오른쪽 정렬/여백
 
+        # (예산 모드) 간격을 두고 추출했을 때만: 선택한 프레임 주변 촘촘하게 다시 보기
+        if self.stride > 1:
+            self.refine_btn = tk.Button(
+                self.top_bar, text="선택 주변 자세히",
+                command=self._on_refine,
+                font=self.ui_font_big, padx=10, pady=6
+            )
+            self.refine_btn.pack(side=tk.RIGHT, padx=(0, 8))
+
     def _hide_retime_button(self):
+        self.status_label = None
+        self.stats_label = None
         if self.retime_btn:
             self.retime_btn.destroy()
             self.retime_btn = None
+        if self.refine_btn:
+            self.refine_btn.destroy()
+            self.refine_btn = None
         if self.top_bar:
             self.top_bar.destroy()
             self.top_bar = None
@@ -653,6 +1844,7 @@ class FrameSelectorApp(tk.Tk):
         if self.thumb_panel:
             self.thumb_panel.destroy()
             self.thumb_panel = None
+            self.thumb_grid = None
 
         if self.center_wrapper:
             self.center_wrapper.destroy()
@@ -677,6 +1869,9 @@ class FrameSelectorApp(tk.Tk):
         self.index_map = {}   # (중요) 번호 매핑 초기화
         self.stage_idx = -1
         self.stage = 0
+        self._pending_stage = None
+        self._advance_when_ready = False
+        self._session += 1    # 진행 중이던 백그라운드 미리 추출 결과는 버림
 
         self._hide_retime_button()
 
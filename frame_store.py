@@ -0,0 +1,84 @@
+import os
+import threading
+
+import cv2
+
+from video_to_frames import resize_to_fit
+from workspace import DiskQuotaExceeded
+
+
+class FrameStore:
+    """
+    (메모리 프레임) frame_format="memory" 일 때 디코딩한 프레임을 파일 대신 메모리에 보관한다.
+    - 키는 디스크 모드와 같은 파일 경로 (output_dir/000123.mem) → 번호/프레임 인덱스 계산은 그대로.
+    - 넣을 때 size 안으로 축소 + BGR → RGBA 변환을 한 번만 하고,
+      꺼낼 때는 Image.frombuffer 로 그 배열을 복사 없이 감싼 PIL 이미지를 준다 (인코딩/디코딩 없음).
+      (RGB 는 frombuffer 가 메모리를 공유하지 못하는 모드라 RGBA 로 보관)
+    - max_mb 를 넘으면 DiskQuotaExceeded (디스크 한도와 같게, 그때까지 넣은 프레임으로 진행).
+    - 여러 스레드에서 put / image 해도 안전하다.
+    """
+
+    def __init__(self, size=None, max_mb: float = 2048):
+        self.size = tuple(size) if size else None  # 보관 크기 (None 이면 원본 해상도)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._frames = {}        # 키(str) -> RGBA uint8 배열 (H, W, 4)
+        self._versions = {}      # 키(str) -> 넣은 순번 (ThumbCache 키의 mtime 대신)
+        self._bytes = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def put(self, key, frame):
+        """BGR 프레임 1장을 보관 (같은 키가 있으면 교체)."""
+        if self.size is not None:
+            frame = resize_to_fit(frame, self.size)
+        rgba = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)  # 변환 1번 = 유일한 복사
+        key = str(key)
+        with self._lock:
+            old = self._frames.get(key)
+            used = self._bytes + rgba.nbytes - (old.nbytes if old is not None else 0)
+            if used > self.max_bytes:
+                raise DiskQuotaExceeded(f"in-memory frame budget exceeded: "
+                                        f"{used / 1024 ** 2:.1f} MB > {self.max_bytes / 1024 ** 2:.1f} MB")
+            self._frames[key] = rgba
+            self._bytes = used
+            self._seq += 1
+            self._versions[key] = self._seq
+
+    def get(self, key):
+        """보관한 RGBA 배열 (없으면 KeyError)."""
+        with self._lock:
+            return self._frames[str(key)]
+
+    def image(self, key):
+        """보관한 프레임을 복사 없이 감싼 PIL 이미지 (읽기 전용으로 취급할 것)."""
+        from PIL import Image
+        rgba = self.get(key)
+        h, w = rgba.shape[:2]
+        return Image.frombuffer("RGBA", (w, h), rgba, "raw", "RGBA", 0, 1)
+
+    def version(self, key) -> int:
+        """ThumbCache 키용 순번 (같은 키에 다시 넣으면 바뀜, 없으면 -1)."""
+        with self._lock:
+            return self._versions.get(str(key), -1)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return str(key) in self._frames
+
+    def drop(self, folder):
+        """folder 아래 키의 프레임만 버린다 (이전 run / 끝난 클립, 미리 준비 중인 다음 클립은 유지)."""
+        prefix = os.path.join(str(folder), "")  # 끝에 구분자 → run-1 이 run-10 을 지우지 않음
+        with self._lock:
+            for key in [k for k in self._frames if k.startswith(prefix)]:
+                self._bytes -= self._frames.pop(key).nbytes
+                del self._versions[key]
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"frames": len(self._frames), "mb": round(self._bytes / (1024 * 1024), 2)}
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# (계측) 구간 이름 → [횟수, 누적 초, 최대 초] / 카운터 이름 → 값
+#  - 기본은 꺼져 있고, 꺼져 있으면 span() 은 아무것도 안 하는 공용 객체를 돌려준다
+#    (프레임 루프에서는 전역 플래그 확인 + with 문 비용만 남음)
+_enabled = False
+_lock = threading.Lock()
+_spans = {}
+_counters = {}
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        add_time(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoSpan()
+
+
+def span(name: str):
+    """with span("read"): ... → 걸린 시간을 name 에 누적 (꺼져 있으면 비용 거의 0)."""
+    return _Span(name) if _enabled else _NOOP
+
+
+def add_time(name: str, seconds: float, n: int = 1):
+    if not _enabled:
+        return
+    with _lock:
+        s = _spans.get(name)
+        if s is None:
+            _spans[name] = [n, seconds, seconds]
+        else:
+            s[0] += n
+            s[1] += seconds
+            if seconds > s[2]:
+                s[2] = seconds
+
+
+def count(name: str, n: int = 1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def raw() -> dict:
+    """다른 프로세스로 보내 merge 할 수 있는 원본 값 (병렬 추출 워커용)."""
+    with _lock:
+        return {"spans": {k: list(v) for k, v in _spans.items()}, "counters": dict(_counters)}
+
+
+def merge(data: dict):
+    """워커 프로세스의 raw() 결과를 이 프로세스 값에 더한다."""
+    with _lock:
+        for name, (n, total, peak) in data.get("spans", {}).items():
+            s = _spans.setdefault(name, [0, 0.0, 0.0])
+            s[0] += n
+            s[1] += total
+            s[2] = max(s[2], peak)
+        for name, n in data.get("counters", {}).items():
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def snapshot() -> dict:
+    """{"spans": {이름: {count, total_s, mean_ms, max_ms}}, "counters": {...}}"""
+    with _lock:
+        spans = {
+            name: {
+                "count": n,
+                "total_s": round(total, 4),
+                "mean_ms": round(total / n * 1000, 3) if n else 0.0,
+                "max_ms": round(peak * 1000, 3),
+            }
+            for name, (n, total, peak) in sorted(_spans.items())
+        }
+        return {"spans": spans, "counters": dict(sorted(_counters.items()))}
+
+
+def stats_line(names=("read", "write", "thumb_decode", "tk_render")) -> str:
+    """GUI 상단바용 한 줄 요약 (구간별 평균 ms)."""
+    with _lock:
+        parts = [f"{name} {_spans[name][1] / _spans[name][0] * 1000:.1f}ms"
+                 for name in names if _spans.get(name, [0])[0]]
+    return " · ".join(parts)
+
+
+def write_report(path: Path, extra: dict = None):
+    """세션 리포트 JSON 저장 (extra 는 최상위에 같이 기록)."""
+    data = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), **(extra or {}), **snapshot()}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
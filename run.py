@@ -1,20 +1,52 @@
 from pathlib import Path
-from video_to_frames import info
+from console import info
+from clip_queue import load_queue
 from frame_selector import FrameSelectorApp
 
 # 사용자 환경 설정
 VIDEO_PATH = Path(r"your\video\path") # 비디오 위치 (+ 비디오 이름)
+QUEUE = None # 여러 영상을 차례로 처리: 영상 폴더 / CSV·JSON 매니페스트(video,start,end) / 경로 리스트. None이면 VIDEO_PATH 1개
 OUTPUT_BASE = Path(r"expected\created\frames\folder\location") # 생성될 frames 폴더 위치
 ZERO_PAD = 6 # 저장 프레임의 자릿 수 (ex. 000000.png)
 THUMB_SIZE = (860, 440) # 프레임 크기 설정.
+PAGE_SIZE = 4 # 한 페이지(스테이지)에 보일 썸네일 수. GRID_COLS × GRID_ROWS보다 많으면 세로 스크롤 (보이는 셀만 그려서 수천 장도 가벼움)
+GRID_COLS = 2 # 썸네일 그리드 열 수
+GRID_ROWS = 2 # 스크롤 없이 한 번에 보이는 행 수
+MAX_STAGES = 3 # 총 페이지 수 (Next Page로 넘길 수 있는 횟수 + 1)
+SPARSE = False # True면 화면에 보일 프레임만 추출 (긴 구간에서 첫 화면이 빨라짐)
+WORKERS = 1 # 전체 추출 시 병렬 프로세스 수 (0: CPU 코어 수만큼)
+WRITERS = 4 # PNG 저장 스레드 수 (디코딩과 저장을 겹쳐서 처리, 0: 끄기)
+FRAME_FORMAT = "png" # 임시 프레임 포맷: "png" / "jpg" / "webp" / "npy" / "memory" (최종 저장은 EXPORT_VARIANTS)
+FRAME_QUALITY = None # png: 압축 레벨 0~9, jpg/webp: 품질 0~100, None: 기본값
+PROXY = False # True면 추출할 때 THUMB_SIZE로 줄인 프록시만 저장 (최종 2장만 원본 해상도로 다시 추출)
+THUMB_CACHE_MB = 256 # 썸네일 메모리 캐시 한도 (MB). 클릭할 때 이미지를 다시 읽지 않게 함
+CACHE_DIR = None # 영구 프레임 캐시 폴더 (예: OUTPUT_BASE / "_cache"). None이면 끔
+CACHE_MAX_GB = 20 # 영구 캐시 용량 한도 (GB). 넘으면 오래 안 쓴 영상부터 삭제
+STREAM_MIN_FRAMES = 48 # 추출 중이라도 프레임이 이만큼 모이면 첫 페이지를 먼저 표시
+SMART_PICK = True # True면 랜덤 대신 선명도/노출/대비 점수가 높은 프레임을 시간대별로 골라 표시
+DEDUP_DISTANCE = 6 # 지각 해시(64비트) 해밍 거리가 이 이하인 거의 같은 장면은 다른 페이지에 다시 보이지 않음. 0이면 끔
+SEEK_INDEX = True # True면 영상마다 키프레임/타임스탬프 인덱스를 한 번 만들어 두고 탐색·시간 변환에 사용
+TMPFS = False # True면 임시 프레임을 메모리 파일시스템(/dev/shm, Linux)에 저장. 없으면 OUTPUT_BASE 사용
+WORKSPACE_QUOTA_GB = None # 임시 프레임 용량 한도 (GB). 넘으면 그때까지 추출한 프레임으로 진행. None이면 제한 없음
+MIN_FREE_GB = 1.0 # 디스크 여유 공간이 이보다 적어지면 추출 중단 (GB)
+MAX_FRAMES = None # 구간당 최대 추출 장수 (예: 3000). 긴 구간은 일정 간격으로 건너뛰며 추출. None이면 전부 추출
+MAX_MB = None # 구간당 최대 추출 용량 (MB, 예: 2000). 첫 프레임 크기로 장수를 환산해 MAX_FRAMES와 함께 적용. None이면 제한 없음
+EXPORT_VARIANTS = [("png", None, None)] # 최종 저장 (포맷, 품질, 최대 크기) 목록. 예: [("png", None, None), ("jpg", 90, None), ("webp", 80, (1280, 720))]
+TIMELINE_FRAMES = 600 # 시간 입력 화면의 타임라인(필름스트립) 프록시 장수. 영상마다 1번 만들어 재사용, 0이면 끔
+MEMORY_MB = 2048 # FRAME_FORMAT = "memory"일 때 메모리에 보관할 프레임 한도 (MB). 넘으면 그때까지 추출한 프레임으로 진행
+STATS = False # True면 단계별 처리 시간을 계측해 상단바에 표시하고, 종료 시 OUTPUT_BASE/<영상이름>.stats.json 저장
 
 if __name__ == "__main__":
-    if not VIDEO_PATH.exists():
+    queue = load_queue(QUEUE) if QUEUE else None
+    if queue:
+        info(f"queue: {len(queue)} clips")
+    elif not VIDEO_PATH.exists():
         raise FileNotFoundError(f"[error] video not found: {VIDEO_PATH}")
 
     # (정보) 실행 시 콘솔에 경로 정보 출력
-    info(f"selected sequence dir: {VIDEO_PATH.stem}")
-    info(f"output directory: {(OUTPUT_BASE / VIDEO_PATH.stem).resolve()}")
+    video_path = Path(queue[0]["video"]) if queue else VIDEO_PATH
+    info(f"selected sequence dir: {video_path.stem}")
+    info(f"output directory: {(OUTPUT_BASE / video_path.stem).resolve()}")
 
     # (중요) GUI 앱 실행 진입점
     app = FrameSelectorApp(
@@ -22,6 +54,33 @@ if __name__ == "__main__":
         output_base=OUTPUT_BASE,
         zero_pad=ZERO_PAD,
         # start_index=START_INDEX,  # 필요 시 위에 START_INDEX 정의 후 주석 해제
-        thumb_size=THUMB_SIZE
+        thumb_size=THUMB_SIZE,
+        sparse=SPARSE,
+        workers=WORKERS,
+        writers=WRITERS,
+        frame_format=FRAME_FORMAT,
+        frame_quality=FRAME_QUALITY,
+        thumb_cache_mb=THUMB_CACHE_MB,
+        proxy=PROXY,
+        cache_dir=CACHE_DIR,
+        cache_max_gb=CACHE_MAX_GB,
+        stream_min_frames=STREAM_MIN_FRAMES,
+        smart_pick=SMART_PICK,
+        dedup_distance=DEDUP_DISTANCE,
+        seek_index=SEEK_INDEX,
+        stats=STATS,
+        tmpfs=TMPFS,
+        workspace_quota_gb=WORKSPACE_QUOTA_GB,
+        min_free_gb=MIN_FREE_GB,
+        max_frames=MAX_FRAMES,
+        max_mb=MAX_MB,
+        memory_mb=MEMORY_MB,
+        export_variants=EXPORT_VARIANTS,
+        queue=queue,
+        timeline_frames=TIMELINE_FRAMES,
+        page_size=PAGE_SIZE,
+        grid_cols=GRID_COLS,
+        grid_rows=GRID_ROWS,
+        max_stages=MAX_STAGES
     )
     app.mainloop()
@@ -0,0 +1,143 @@
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from video_to_frames import info, warn
+from frame_cache import video_fingerprint
+
+
+class SeekIndex:
+    """
+    (탐색 인덱스) 영상 1개의 프레임 인덱스 → PTS(ms) / 키프레임 여부 표.
+    - 한 번 스캔해서 사이드카(.npz)로 저장해 두고 다음 실행부터는 읽기만 한다.
+    - 시간 → 프레임 변환을 컨테이너가 보고하는 FPS 대신 실제 PTS 로 하므로
+      가변 프레임레이트(VFR) 영상에서도 정확하다.
+    - 탐색은 목표 직전 키프레임으로 점프한 뒤 grab() 으로 전진한다.
+    """
+
+    def __init__(self, pts_ms: np.ndarray, keyframe: np.ndarray, has_keyframes: bool = True):
+        self.pts_ms = pts_ms.astype(np.float64)      # 표시 순서 기준 프레임별 PTS
+        self.keyframe = keyframe.astype(bool)
+        self.has_keyframes = has_keyframes           # False 면 키프레임 정보 없음 (기본 seek 사용)
+        self._key_idx = np.flatnonzero(self.keyframe)
+
+    # 메타
+    @property
+    def frame_count(self) -> int:
+        return len(self.pts_ms)
+
+    @property
+    def fps(self) -> float:
+        """평균 FPS (PTS 간격의 중앙값 기준)."""
+        if self.frame_count < 2:
+            return 0.0
+        step = float(np.median(np.diff(self.pts_ms)))
+        return round(1000.0 / step, 6) if step > 0 else 0.0
+
+    @property
+    def duration_sec(self) -> float:
+        if self.frame_count == 0:
+            return 0.0
+        step = 1000.0 / self.fps if self.fps > 0 else 0.0
+        return (self.pts_ms[-1] - self.pts_ms[0] + step) / 1000.0
+
+    # 조회
+    def time_to_frame(self, sec: float) -> int:
+        """sec 에 가장 가까운 PTS 를 가진 프레임 인덱스 (범위 밖이면 양 끝으로 고정)."""
+        t = self.pts_ms[0] + sec * 1000.0
+        i = int(np.searchsorted(self.pts_ms, t))
+        if i <= 0:
+            return 0
+        if i >= self.frame_count:
+            return self.frame_count - 1
+        return i if (self.pts_ms[i] - t) < (t - self.pts_ms[i - 1]) else i - 1
+
+    def keyframe_before(self, frame_idx: int) -> int:
+        """frame_idx 이하에서 가장 가까운 키프레임 인덱스 (has_keyframes=False 면 항상 0 - 거리 판단에 쓰지 말 것)."""
+        j = int(np.searchsorted(self._key_idx, frame_idx, side="right")) - 1
+        return int(self._key_idx[j]) if j >= 0 else 0
+
+    def seek(self, cap, frame_idx: int):
+        """
+        cap 을 frame_idx 로 이동 (다음 read() 가 frame_idx 를 돌려줌).
+        - 직전 키프레임으로 점프 후 grab() 으로 디코딩만 하며 전진한다.
+        """
+        if not self.has_keyframes:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            return
+        k = self.keyframe_before(frame_idx)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, k)
+        for _ in range(frame_idx - k):
+            if not cap.grab():
+                break
+
+    # 저장/읽기
+    def save(self, path: Path):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # 여러 프로세스가 동시에 만들어도 안전
+        with open(tmp, "wb") as fh:
+            np.savez(fh, pts_ms=self.pts_ms, keyframe=self.keyframe,
+                     has_keyframes=np.array(self.has_keyframes))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SeekIndex":
+        with np.load(path) as data:
+            return cls(data["pts_ms"], data["keyframe"], bool(data["has_keyframes"]))
+
+    # 스캔
+    @classmethod
+    def build(cls, video_path: Path) -> "SeekIndex":
+        """
+        (1회 스캔) 디코딩 없이 패킷만 읽어 PTS / 키프레임 플래그를 모은다.
+        - FFmpeg 백엔드의 raw 모드(CAP_PROP_FORMAT=-1)를 쓰므로 전체 디코딩보다 훨씬 빠르다.
+        - raw 모드를 못 쓰면 grab() 으로 스캔하고 키프레임 정보 없이 만든다.
+        """
+        cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+        raw = cap.isOpened() and hasattr(cv2, "CAP_PROP_LRF_HAS_KEY_FRAME")
+        if not raw:
+            cap.release()
+            cap = cv2.VideoCapture(str(video_path))
+            if not cap.isOpened():
+                raise RuntimeError(f"cannot open video: {video_path}")
+            warn("seek index: raw packet mode unavailable, scanning without keyframe flags")
+
+        pts, keys = [], []
+        try:
+            while cap.grab():
+                pts.append(cap.get(cv2.CAP_PROP_POS_MSEC))
+                keys.append(bool(cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME)) if raw else False)
+        finally:
+            cap.release()
+
+        pts = np.array(pts, dtype=np.float64)
+        keys = np.array(keys, dtype=bool)
+        # 패킷은 디코딩 순서(B 프레임)라 PTS 로 정렬해야 표시 순서 프레임 인덱스가 된다
+        order = np.argsort(pts, kind="stable")
+        pts, keys = pts[order], keys[order]
+        if len(keys):
+            keys[0] = True  # 첫 프레임은 항상 탐색 시작점으로 쓸 수 있다
+        return cls(pts, keys, has_keyframes=raw)
+
+
+def sidecar_path(video_path: Path, index_dir: Path) -> Path:
+    """영상 내용이 바뀌면 이름도 바뀌도록 지문을 파일명에 넣는다."""
+    return Path(index_dir) / f"{video_path.stem}.{video_fingerprint(video_path)}.seekidx.npz"
+
+
+def load_or_build(video_path: Path, index_dir: Path) -> SeekIndex:
+    """사이드카가 있으면 읽고, 없거나 깨졌으면 스캔해서 저장한다."""
+    path = sidecar_path(video_path, index_dir)
+    if path.exists():
+        try:
+            return SeekIndex.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            warn(f"seek index unreadable, rebuilding: {path} ({e})")
+
+    index = SeekIndex.build(video_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index.save(path)
+    keyframes = int(index.keyframe.sum())
+    info(f"seek index: {index.frame_count} frames, {keyframes} keyframes -> {path}")
+    return index
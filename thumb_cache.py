@@ -0,0 +1,139 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from instrument import span
+
+
+class ThumbCache:
+    """
+    (썸네일 캐시) 디코딩+축소한 PIL 썸네일을 메모리에 보관하는 LRU 캐시.
+    - 키: (파일 경로, 목표 크기, 파일 mtime) → 같은 경로에 프레임을 다시 써도 옛 썸네일이 안 나옴
+      (stamp 를 주면 mtime 대신 stamp(경로) - 예: 메모리 프레임의 FrameStore.version)
+    - max_mb 를 넘으면 가장 오래 안 쓴 항목부터 버린다.
+    - hits / misses 카운터로 적중률 확인 (stats()).
+    - 여러 스레드에서 동시에 get 해도 안전하다.
+    """
+
+    def __init__(self, loader, max_mb: float = 256, stamp=None):
+        self._loader = loader            # 경로 → 원본 크기 RGB PIL 이미지
+        self._stamp = stamp or (lambda fp: os.stat(fp).st_mtime_ns)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._items = OrderedDict()      # key -> (PIL.Image, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, fp, size):
+        return (str(fp), tuple(size), self._stamp(fp))
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def get(self, fp, size, derive_from=None) -> Image.Image:
+        """
+        fp 를 size 안에 맞춘 썸네일을 돌려준다 (캐시에 없으면 디코딩 후 저장).
+        - derive_from: 더 큰 썸네일 크기. 그 크기가 캐시에 있으면 원본 대신 그걸 줄여서 만든다
+          (예: 우측 선택 패널의 절반 크기 미리보기).
+        """
+        key = self._key(fp, size)
+        img = self._lookup(key)
+        if img is not None:
+            self.hits += 1
+            return img
+
+        self.misses += 1
+        base = self._lookup(self._key(fp, derive_from)) if derive_from else None
+        if base is not None:
+            img = base.copy()
+        else:
+            with span("thumb_decode"):
+                img = self._loader(fp)
+        with span("thumb_resize"):
+            img.thumbnail(size)
+        self._put(key, img)
+        return img
+
+    def peek(self, fp, size):
+        """디코딩 없이 캐시에 있을 때만 돌려준다 (없으면 None)."""
+        try:
+            key = self._key(fp, size)
+        except OSError:
+            return None
+        img = self._lookup(key)
+        if img is not None:
+            self.hits += 1
+        return img
+
+    def _put(self, key, img: Image.Image):
+        nbytes = img.width * img.height * len(img.getbands())
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (img, nbytes)
+            self._bytes += nbytes
+            # (LRU) 용량 초과 시 오래된 것부터 제거 (방금 넣은 항목은 남김)
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, (_, n) = self._items.popitem(last=False)
+                self._bytes -= n
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self._items),
+            "mb": round(self._bytes / (1024 * 1024), 2),
+        }
+
+
+class ThumbLoader:
+    """
+    (비동기 썸네일) 워커 스레드 풀에서 ThumbCache.get 을 돌려 디코딩/축소를 UI 스레드 밖에서 한다.
+    - request: 끝나면 callback(fp, img, err) 호출 (워커 스레드에서 호출되므로
+      Tk 쪽에서는 after() 로 메인 스레드에 넘겨야 한다)
+    - prefetch: 결과는 버리고 캐시만 채운다 (다음 페이지 미리 디코딩용)
+    """
+
+    def __init__(self, cache: ThumbCache, workers: int = 2):
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumb")
+
+    def request(self, fp, size, callback, derive_from=None):
+        def job():
+            try:
+                img = self.cache.get(fp, size, derive_from)
+            except Exception as e:
+                callback(fp, None, e)
+                return
+            callback(fp, img, None)
+        self._pool.submit(job)
+
+    def prefetch(self, files, size):
+        for fp in files:
+            self._pool.submit(self._warm, fp, size)
+
+    def _warm(self, fp, size):
+        try:
+            self.cache.get(fp, size)
+        except Exception:
+            pass  # 실제로 표시할 때 다시 시도하면서 경고가 남는다
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,167 @@
+"""
+(가상 스크롤 그리드) 한 페이지에 후보 썸네일이 수백~수천 장이어도 보이는 행만 위젯으로 만드는 그리드.
+
+화면에 보이는 행(+ 여분 OVERSCAN_ROWS 행)의 셀만 만들어 두고, 스크롤하면 화면 밖으로 나간 셀을
+새로 보이는 항목에 다시 배정한다. 셀 내용(번호/테두리/이미지)은 bind_cell 콜백이 채우므로
+Tk 위젯과 PhotoImage 수는 항목이 12장이든 2,000장이든 (보이는 행 + 여분) × cols 개로 일정하다.
+"""
+import math
+import tkinter as tk
+
+OVERSCAN_ROWS = 1   # (설정) 보이는 행 아래로 미리 배정해 둘 여분 행 (스크롤할 때 빈 칸이 덜 보임)
+BORDER = 5          # 썸네일 캔버스 테두리 최대 두께 (bd 3 + highlight 2, 선택 시)
+
+
+def visible_rows(top: float, height: float, row_h: int, n_rows: int,
+                 overscan: int = OVERSCAN_ROWS) -> range:
+    """스크롤 위치 top(px)부터 height 만큼 보일 때 셀을 배정할 행 범위."""
+    if n_rows <= 0 or row_h <= 0:
+        return range(0)
+    first = min(n_rows - 1, max(0, int(top // row_h)))
+    last = min(n_rows, int(math.ceil((top + max(height, 1)) / row_h)) + overscan)
+    return range(first, max(first + 1, last))
+
+
+class GridCell:
+    """
+    다시 쓰는 셀 1개 (번호 라벨 + 썸네일 캔버스).
+    - index / item 이 None 이면 지금 배정된 항목이 없음 (숨김)
+    - tkimg: 이 셀이 보여 주는 PhotoImage (다시 배정하면 교체 → 살아 있는 PhotoImage 도 셀 수만큼)
+    - selected: 지금 그려 둔 선택 테두리 상태 (같으면 config 를 다시 하지 않음)
+    """
+
+    def __init__(self, grid: "ThumbGrid", font):
+        self.frame = tk.Frame(grid.canvas)
+        self.label = tk.Label(self.frame, font=font, anchor="w")
+        self.label.pack(side=tk.TOP, anchor="w")
+        self.canvas = tk.Canvas(self.frame, width=grid.thumb_size[0], height=grid.thumb_size[1],
+                                bg="#DDDDDD")
+        self.canvas.pack(side=tk.TOP)
+        self.window = grid.canvas.create_window(0, 0, anchor="nw", window=self.frame, state="hidden")
+        self.index = None
+        self.item = None
+        self.tkimg = None
+        self.selected = None
+
+        # (동작) 번호 라벨/이미지 클릭 → 지금 배정된 항목으로 on_click, 휠 → 그리드 스크롤
+        for w in (self.frame, self.label, self.canvas):
+            w.bind("<Button-1>", lambda e: self.item is not None and grid.on_click(self.item))
+            grid.bind_wheel(w)
+
+
+class ThumbGrid(tk.Frame):
+    """
+    (썸네일 그리드) cols 열 × 행, 세로 스크롤. 한 번에 view_rows 행이 보인다.
+    - show(items): 페이지 내용 교체 (셀 위젯은 그대로 다시 씀)
+    - refresh(): 보이는 셀만 bind_cell 을 다시 호출 (선택 테두리/번호 갱신)
+    - cell_of(item): 그 항목이 배정된 셀 (화면 밖이면 None) - 셀 1개만 고칠 때
+    - bind_cell(cell, item, index): 셀에 항목을 채우는 콜백 (메인 스레드)
+    - on_click(item): 셀 클릭 콜백
+    """
+
+    def __init__(self, master, cols: int, view_rows: int, thumb_size, bind_cell, on_click,
+                 font, pad: int = 12):
+        super().__init__(master)
+        self.cols = max(1, int(cols))
+        self.view_rows = max(1, int(view_rows))
+        self.thumb_size = tuple(thumb_size)
+        self.bind_cell = bind_cell
+        self.on_click = on_click
+        self._font = font
+        self.cell_w = self.thumb_size[0] + 2 * BORDER + 2 * pad
+        self.cell_h = self.thumb_size[1] + 2 * BORDER + 2 * pad + font.metrics("linespace")
+        self._pad = pad
+        self.items = []
+        self._cells = []         # 셀 풀 (필요할 때만 늘어나고, 보이는 범위 밖의 셀은 숨겨 두었다가 다시 씀)
+
+        self.canvas = tk.Canvas(self, width=self.cols * self.cell_w, height=self.cell_h,
+                                highlightthickness=0, yscrollincrement=max(1, self.cell_h // 8))
+        self.canvas.pack(side=tk.LEFT, fill=tk.Y, expand=True)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.config(yscrollcommand=self._on_yscroll)
+        self.canvas.bind("<Configure>", lambda e: self._layout())
+        self.bind_wheel(self.canvas)
+
+    @property
+    def n_rows(self) -> int:
+        return -(-len(self.items) // self.cols)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)                           # Windows / macOS
+        widget.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-3, "units"))  # X11
+        widget.bind("<Button-5>", lambda e: self.canvas.yview_scroll(3, "units"))
+
+    def _on_wheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step * max(1, abs(event.delta) // 40), "units")
+
+    def show(self, items, keep_scroll: bool = False, rebuild: bool = False):
+        """
+        페이지 항목 교체. keep_scroll=False 면 맨 위로 (같은 페이지를 다시 그릴 땐 True).
+        - rebuild: 셀 위젯까지 모두 지우고 새로 만든다 (보통은 다시 씀 / 벤치마크의 비교용)
+        """
+        if rebuild:
+            for cell in self._cells:
+                self.canvas.delete(cell.window)
+                cell.frame.destroy()
+            self._cells = []
+        self.items = list(items)
+        rows = self.n_rows
+        self.canvas.config(height=max(1, min(rows, self.view_rows)) * self.cell_h,
+                           scrollregion=(0, 0, self.cols * self.cell_w, max(1, rows) * self.cell_h))
+        if rows > self.view_rows:
+            self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        else:
+            self.scrollbar.pack_forget()
+        if not keep_scroll:
+            self.canvas.yview_moveto(0)
+        for cell in self._cells:
+            cell.index = None     # 모든 셀을 다시 배정
+        self._layout()
+
+    def refresh(self):
+        for cell in self.cells():
+            self.bind_cell(cell, cell.item, cell.index)
+
+    def cell_of(self, item):
+        for cell in self._cells:
+            if cell.index is not None and cell.item == item:
+                return cell
+        return None
+
+    def cells(self):
+        """지금 항목이 배정된 셀들."""
+        return [c for c in self._cells if c.index is not None]
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._layout()
+
+    def _layout(self):
+        # 보이는 행의 항목 중 셀이 없는 것만 (밖으로 나간 셀을 가져와) 배정 - 계속 보이는 셀은 그대로 둔다
+        height = max(self.canvas.winfo_height(), 1) if self.canvas.winfo_ismapped() \
+            else int(self.canvas.cget("height"))
+        rows = visible_rows(self.canvas.canvasy(0), height, self.cell_h, self.n_rows)
+        wanted = [i for r in rows for i in range(r * self.cols, min((r + 1) * self.cols, len(self.items)))]
+        placed = {c.index: c for c in self._cells if c.index is not None}
+        keep = set(wanted)
+        free = [c for c in self._cells if c.index is None or c.index not in keep]
+        while len(free) < sum(1 for i in wanted if i not in placed):
+            cell = GridCell(self, self._font)
+            self._cells.append(cell)
+            free.append(cell)
+
+        for i in wanted:
+            if i in placed:
+                continue
+            cell = free.pop()
+            cell.index, cell.item = i, self.items[i]
+            row, col = divmod(i, self.cols)
+            self.canvas.coords(cell.window, col * self.cell_w + self._pad, row * self.cell_h + self._pad)
+            self.canvas.itemconfigure(cell.window, state="normal")
+            self.bind_cell(cell, cell.item, i)
+        for cell in free:
+            if cell.index is not None or cell.item is not None:
+                self.canvas.itemconfigure(cell.window, state="hidden")
+            cell.index = cell.item = None
+            cell.tkimg = None   # 화면 밖 셀의 이미지는 놓아 준다
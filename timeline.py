@@ -0,0 +1,113 @@
+import json
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from console import info, warn
+from frame_cache import video_fingerprint
+from video_to_frames import iter_frames_at, resize_to_fit
+
+TIMELINE_SIZE = (160, 90)   # (설정) 프록시 1장 최대 크기 (w, h) - 비율 유지
+TIMELINE_FRAMES = 600       # (설정) 영상 전체에서 모을 최대 장수 (step = 총 프레임 / 이 값)
+PROGRESS_EVERY = 24         # 만드는 중 이만큼 모일 때마다 on_progress
+
+
+class TimelineProxy:
+    """
+    (타임라인 프록시) 영상 1개를 step 프레임마다 1장씩 아주 작게 줄인 RGB 프레임 모음.
+    - .npy 를 메모리 매핑(np.memmap)으로 쓰고 읽는다 → 긴 영상도 RAM 을 거의 쓰지 않고, 다시 열 때 즉시.
+    - 한 번 만들면 사이드카로 재사용한다 (영상 내용이 바뀌면 지문이 달라져 다시 만듦).
+    - 만드는 중에도 filled 장까지는 읽을 수 있다 (스크러버 점진 표시).
+    """
+
+    def __init__(self, frames: np.ndarray, step: int, filled: int):
+        self.frames = frames        # (n, h, w, 3) uint8 RGB (memmap)
+        self.step = step            # i 번째 프록시 = 영상 프레임 i * step
+        self.filled = filled        # 지금까지 채워진 장수 (다 만들면 영상 끝까지의 장수)
+
+    def frame_of(self, i: int) -> int:
+        return i * self.step
+
+    def nearest(self, frame_idx: int) -> int:
+        """영상 프레임 인덱스에 가장 가까운 프록시 번호 (아직 안 채워졌을 수 있음 → has 로 확인)."""
+        return int(min(max(0, round(frame_idx / self.step)), len(self.frames) - 1))
+
+    def has(self, i: int) -> bool:
+        return 0 <= i < self.filled
+
+    def image(self, i: int) -> np.ndarray:
+        return self.frames[i]
+
+
+def sidecar_paths(video_path: Path, index_dir: Path, max_frames: int, size) -> tuple[Path, Path]:
+    """(프레임 .npy, 완료 표시 .json). 설정(장수/크기)이 다르면 다른 파일."""
+    stem = f"{video_path.stem}.{video_fingerprint(video_path)}.timeline-{max_frames}-{size[0]}x{size[1]}"
+    return Path(index_dir) / f"{stem}.npy", Path(index_dir) / f"{stem}.json"
+
+
+def load(npy: Path, meta: Path):
+    """완료 표시가 있으면 읽기 전용 memmap 으로 연다 (없거나 깨졌으면 None)."""
+    if not meta.exists():
+        return None
+    try:
+        m = json.loads(meta.read_text(encoding="utf-8"))
+        frames = np.load(npy, mmap_mode="r")
+        filled = int(m["filled"])
+        if filled > len(frames):
+            raise ValueError("frame count mismatch")
+    except (OSError, ValueError, KeyError) as e:
+        warn(f"timeline proxy unreadable, rebuilding: {npy} ({e})")
+        return None
+    return TimelineProxy(frames, int(m["step"]), filled)
+
+
+def load_or_build(source, index_dir: Path, max_frames: int = TIMELINE_FRAMES,
+                  size=TIMELINE_SIZE, index=None, on_progress=None, keep_going=None):
+    """
+    (1회 생성) 사이드카가 있으면 바로 열고, 없으면 step 프레임마다 1장씩 디코딩해 만든다.
+    - source: video_to_frames.VideoSource (캡처 1개를 빌려 만드는 동안 씀)
+    - 건너뛰는 프레임은 grab() 으로 넘기고, index(SeekIndex)가 있으면 사이에 키프레임이 있을 때만 점프
+      (iter_frames_at). 읽은 프레임만 축소 + RGB 변환.
+    - on_progress(proxy): PROGRESS_EVERY 장마다 (만드는 스레드에서 호출, 마지막은 반환값으로)
+    - keep_going(): 매 장마다 호출. 기다렸다가 돌아오면 계속, False 면 중단 (None 반환, 저장 안 함)
+    - 파일은 처음부터 최종 경로에 memmap 으로 쓰고, 다 채운 뒤 .json 을 써서 완료를 표시한다
+      (.json 이 없는 .npy 는 만들다 만 것 → 다음에 다시 만듦).
+    """
+    npy, meta = sidecar_paths(source.path, index_dir, max_frames, size)
+    proxy = load(npy, meta)
+    if proxy is not None:
+        return proxy
+
+    total, _ = source.meta()
+    if total <= 0:
+        raise RuntimeError(f"unknown frame count: {source.path}")
+    step = max(1, -(-total // max_frames))   # 올림 나눗셈 → 최대 max_frames 장
+    n = -(-total // step)
+
+    frames = None
+    proxy = None
+    for f, frame in iter_frames_at(source, range(0, total, step), index=index):
+        small = cv2.cvtColor(resize_to_fit(frame, size), cv2.COLOR_BGR2RGB)
+        if frames is None:
+            npy.parent.mkdir(parents=True, exist_ok=True)
+            frames = open_memmap(npy, mode="w+", dtype=np.uint8, shape=(n,) + small.shape)
+            proxy = TimelineProxy(frames, step, 0)
+        i = f // step
+        frames[i] = small
+        proxy.filled = i + 1
+        if on_progress is not None and proxy.filled % PROGRESS_EVERY == 0:
+            on_progress(proxy)
+        if keep_going is not None and not keep_going():
+            return None
+    if proxy is None:
+        raise RuntimeError(f"cannot decode frames: {source.path}")
+
+    frames.flush()
+    tmp = meta.with_name(f"{meta.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"step": step, "filled": proxy.filled, "total": total}), encoding="utf-8")
+    os.replace(tmp, meta)
+    info(f"timeline proxy: {proxy.filled} frames (every {step}) -> {npy}")
+    return proxy
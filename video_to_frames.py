@@ -1,27 +1,346 @@
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+import multiprocessing
+import os
+import queue
+import threading
 import cv2
+import numpy as np
 
-def info(msg):  print(f"[info] {msg}")
-def warn(msg):  print(f"[warn] {msg}")
-def error(msg): print(f"[error] {msg}")
-def done(msg):  print(f"[done] {msg}")
+from frame_quality import FrameScorer
+import instrument
+from instrument import span
+from console import info, warn, error, done  # 다른 모듈은 예전처럼 여기서 가져다 써도 됨
+from workspace import DiskQuotaExceeded
 
-def get_video_meta(video_path: Path):
+# (중간 프레임 포맷) 썸네일용 임시 파일 포맷 → 확장자
+#  - png: quality = 압축 레벨 0~9 (무손실, 낮을수록 빠르고 큼)
+#  - jpg / webp: quality = 0~100 (손실, 빠르고 작음)
+#  - npy: 무압축 BGR 배열 그대로 (인코딩 비용 0, 가장 큼)
+#  - memory: 파일을 쓰지 않고 frame_store.FrameStore 에 보관 (store 인자 필요, 확장자는 키 이름용)
+FRAME_FORMATS = {"png": ".png", "jpg": ".jpg", "webp": ".webp", "npy": ".npy", "memory": ".mem"}
+
+def frame_ext(frame_format: str) -> str:
+    """포맷 이름 → 확장자 (알 수 없는 포맷이면 ValueError)."""
+    try:
+        return FRAME_FORMATS[frame_format]
+    except KeyError:
+        raise ValueError(f"unknown frame format: {frame_format} "
+                         f"(choose from {', '.join(FRAME_FORMATS)})") from None
+
+def resize_to_fit(frame, size):
     """
-    (메타 읽기) 영상 파일에서 총 프레임 수와 FPS를 읽어온다.
-    - 실패 시 RuntimeError 발생.
+    (프록시) 비율을 유지하며 size=(w, h) 안에 들어가도록 축소 (INTER_AREA).
+    - 이미 작으면 그대로 돌려준다 (확대하지 않음).
+    """
+    h, w = frame.shape[:2]
+    scale = min(size[0] / w, size[1] / h)
+    if scale >= 1.0:
+        return frame
+    new_w = max(1, int(round(w * scale)))
+    new_h = max(1, int(round(h * scale)))
+    return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+def write_frame(path: Path, frame, frame_format: str = "png", quality=None,
+                proxy_size=None) -> bool:
+    """
+    BGR 프레임 1장을 지정 포맷으로 저장. 성공 여부 반환 (cv2.imwrite 와 동일).
+    - quality 가 None 이면 각 포맷의 기본값 사용.
+    - proxy_size=(w, h) 를 주면 그 크기에 맞춰 축소한 프록시만 저장한다.
+    """
+    if proxy_size is not None:
+        with span("resize"):
+            frame = resize_to_fit(frame, proxy_size)
+
+    if frame_format == "npy":
+        with span("write"), open(path, "wb") as fh:
+            np.save(fh, frame)
+        return True
+    if frame_format == "memory":
+        raise ValueError("memory frames are kept in a FrameStore (pass store=...)")
+
+    with span("write"):
+        return cv2.imwrite(str(path), frame, _imwrite_params(frame_format, quality))
+
+def _imwrite_params(frame_format: str, quality=None) -> list:
+    if quality is None:
+        return []
+    flag = {"png": cv2.IMWRITE_PNG_COMPRESSION,
+            "jpg": cv2.IMWRITE_JPEG_QUALITY,
+            "webp": cv2.IMWRITE_WEBP_QUALITY}[frame_format]
+    return [flag, int(quality)]
+
+def read_frame(path: Path):
+    """write_frame 으로 저장한 파일을 BGR 배열로 읽는다."""
+    if Path(path).suffix == ".npy":
+        return np.load(path)
+    return cv2.imread(str(path), cv2.IMREAD_COLOR)
+
+class _ProgressBatcher:
+    """
+    (진행 이벤트) 저장이 끝난 프레임 인덱스를 모아 every 장마다 callback(인덱스 리스트) 호출.
+    - 쓰기 스레드 여러 개에서 add 해도 안전하다.
+    """
+
+    def __init__(self, callback, every: int = 25):
+        self._callback = callback
+        self._every = max(1, every)
+        self._batch = []
+        self._lock = threading.Lock()
+
+    def add(self, frame_idx: int):
+        with self._lock:
+            self._batch.append(frame_idx)
+            if len(self._batch) < self._every:
+                return
+            batch, self._batch = self._batch, []
+        self._callback(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch:
+            self._callback(batch)
+
+def _make_progress(on_progress, progress_every: int):
+    return _ProgressBatcher(on_progress, progress_every) if on_progress else None
+
+def _charge(quota, path: Path):
+    """(용량 한도) 방금 쓴 파일 크기를 quota 에 더한다 (넘으면 DiskQuotaExceeded)."""
+    if quota is not None:
+        quota.charge(os.path.getsize(path))
+
+def _save_frame(out_path: Path, frame, save_opts: dict, quota=None, store=None):
     """
-    cap = cv2.VideoCapture(str(video_path))
+    (저장 1장) store(FrameStore) 가 있으면 메모리에 보관, 없으면 파일로 쓰고 quota 에 크기를 더한다.
+    - 쓰기 실패는 RuntimeError, 한도 초과는 DiskQuotaExceeded.
+    """
+    if store is not None:
+        with span("write"):
+            store.put(out_path, frame)
+        return
+    if not write_frame(out_path, frame, **save_opts):
+        raise RuntimeError(f"failed to write image: {out_path}")
+    _charge(quota, out_path)
+
+def _open_capture(video_path: Path):
+    """VideoCapture 열기 (실패 시 RuntimeError)."""
+    with span("open"):
+        cap = cv2.VideoCapture(str(video_path))
     if not cap.isOpened():
         raise RuntimeError(f"cannot open video: {video_path}")
-    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))  # 총 프레임 수
-    fps   = float(cap.get(cv2.CAP_PROP_FPS)) or 0.0  # 초당 프레임(FPS)
-    cap.release()
-    return total, fps
+    return cap
+
+class VideoSource:
+    """
+    (공유 영상 핸들) 영상 1개의 열린 캡처 + 메타(총 프레임 수 / FPS) 캐시.
+    - 메타 읽기, 구간 추출, 원본 해상도 재추출이 같은 캡처를 다시 쓰므로 매번 여는 비용
+      (네트워크 드라이브 / moov 가 끝에 있는 큰 MP4 에서 수백 ms) 이 처음 한 번만 든다.
+    - 캡처는 lease() 로 빌려 쓰는 동안 한 스레드만 쓴다 (seek/read 가 섞이지 않음).
+      이미 다른 스레드가 쓰고 있으면 max_handles 개까지 캡처를 더 열어 돌려 쓴다 (스레드 병렬 읽기용).
+    - 처음 쓸 때 열리고, close() 전까지 열린 캡처는 닫지 않고 재사용한다.
+    - 이 모듈의 함수들은 video_path 자리에 경로 대신 VideoSource 를 받을 수 있다.
+      (병렬 추출 워커 프로세스에는 캡처를 넘길 수 없으므로 워커가 경로로 각자 연다)
+    """
+
+    def __init__(self, video_path: Path, index=None, max_handles: int = 3):
+        self.path = Path(video_path)
+        self.index = index              # seek_index.SeekIndex (있으면 메타/탐색에 사용)
+        self.max_handles = max(1, max_handles)
+        self._cond = threading.Condition()
+        self._idle = []                 # 빌려 갈 수 있는 캡처들
+        self._opened = 0                # 열린 캡처 수 (빌려 간 것 포함)
+        self._meta = None
+        self._closed = False
+
+    @contextmanager
+    def lease(self):
+        """with source.lease() as cap: ... → 그동안 cap 을 혼자 쓴다 (위치는 보장하지 않음)."""
+        cap = self._acquire()
+        try:
+            yield cap
+        finally:
+            self._release(cap)
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"video source closed: {self.path}")
+                if self._idle:
+                    instrument.count("source_reuse")
+                    return self._idle.pop()
+                if self._opened < self.max_handles:
+                    self._opened += 1
+                    break
+                self._cond.wait()
+        try:
+            return _open_capture(self.path)
+        except Exception:
+            with self._cond:
+                self._opened -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, cap):
+        with self._cond:
+            if self._closed:
+                cap.release()
+                self._opened -= 1
+            else:
+                self._idle.append(cap)
+            self._cond.notify()
+
+    def meta(self):
+        """(총 프레임 수, FPS). 처음 한 번만 캡처에서 읽고 이후엔 캐시 (index 가 있으면 index 값)."""
+        if self.index is not None:
+            return self.index.frame_count, self.index.fps
+        if self._meta is None:
+            with self.lease() as cap:
+                self._meta = (int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                              float(cap.get(cv2.CAP_PROP_FPS)) or 0.0)
+        return self._meta
+
+    def read(self, frame_idx: int):
+        """프레임 1장 (BGR 배열). 영상 끝을 넘으면 None."""
+        for _, frame in self.read_many([frame_idx]):
+            return frame
+        return None
+
+    def read_many(self, frame_indices, seek_gap: int = 30):
+        """지정한 프레임들을 오름차순으로 (frame_idx, BGR 배열) 로 (iter_frames_at 과 같음)."""
+        return iter_frames_at(self, frame_indices, seek_gap, self.index)
+
+    def close(self):
+        """쉬고 있는 캡처를 닫는다. 빌려 간 캡처는 돌려받을 때 닫힌다."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for cap in idle:
+            cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+@contextmanager
+def _source(video):
+    """video 가 VideoSource 면 그대로, 경로면 이번 호출 동안만 쓸 VideoSource 를 만들어 준다."""
+    if isinstance(video, VideoSource):
+        yield video
+        return
+    src = VideoSource(video, max_handles=1)
+    try:
+        yield src
+    finally:
+        src.close()
+
+def _seek(cap, frame_idx: int, index=None):
+    """cap 을 frame_idx 로 이동. index(SeekIndex) 가 있으면 직전 키프레임 + grab() 으로."""
+    with span("seek"):
+        if index is not None:
+            index.seek(cap, frame_idx)
+        else:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+
+def _skip_to(cap, pos: int, target: int, index=None, seek_gap: int = 30) -> bool:
+    """
+    (건너뛰기) 다음 read() 위치를 pos → target 으로 옮긴다 (target > pos).
+    - 가까우면 grab() 으로 (색변환/복사 없이) 넘기고, 멀면 seek.
+      index 에 키프레임 정보가 있으면 사이에 키프레임이 있을 때만 seek (iter_frames_at 과 같은 기준).
+    반환값: False 면 영상 끝
+    """
+    if index is not None and index.has_keyframes:
+        far = index.keyframe_before(target) > pos
+    else:
+        far = target - pos > seek_gap  # 키프레임 정보가 없는 인덱스도 거리로 판단
+    if far:
+        _seek(cap, target, index)
+        return True
+    with span("grab"):
+        for _ in range(target - pos):
+            if not cap.grab():
+                return False
+    return True
+
+def budget_stride(start_f: int, end_f: int, max_frames=None) -> int:
+    """(예산) start_f ~ end_f 에서 최대 max_frames 장만 남기려면 몇 프레임마다 1장인지."""
+    if not max_frames:
+        return 1
+    return max(1, -(-(end_f - start_f + 1) // int(max_frames)))
+
+def estimate_frame_bytes(video_path: Path, frame_idx: int, frame_format: str = "png",
+                         quality=None, proxy_size=None, index=None) -> int:
+    """frame_idx 1장을 저장 옵션대로 메모리에서 인코딩해 본 크기 (바이트 예산 계산용)."""
+    for _, frame in iter_frames_at(video_path, [frame_idx], index=index):
+        if proxy_size is not None:
+            frame = resize_to_fit(frame, proxy_size)
+        if frame_format == "npy":
+            return frame.nbytes + 128  # np.save 헤더
+        if frame_format == "memory":
+            return frame.shape[0] * frame.shape[1] * 4  # FrameStore 는 RGBA 로 보관
+        ok, buf = cv2.imencode(frame_ext(frame_format), frame, _imwrite_params(frame_format, quality))
+        if ok:
+            return len(buf)
+    raise RuntimeError(f"cannot read frame {frame_idx}: {video_path}")
+
+def choose_stride(video_path: Path, start_f: int, end_f: int, max_frames=None, max_bytes=None,
+                  frame_format: str = "png", quality=None, proxy_size=None, index=None) -> int:
+    """
+    (예산 간격) 저장 장수가 max_frames 이하, 예상 용량이 max_bytes 이하가 되는 가장 작은 간격.
+    - 바이트 예산은 구간 첫 프레임을 인코딩해 본 크기로 장수를 환산한다.
+    """
+    stride = budget_stride(start_f, end_f, max_frames)
+    if max_bytes:
+        per_frame = estimate_frame_bytes(video_path, start_f, frame_format, quality,
+                                         proxy_size, index)
+        stride = max(stride, budget_stride(start_f, end_f, max(1, int(max_bytes) // per_frame)))
+    return stride
+
+def get_video_meta(video_path: Path, index=None):
+    """
+    (메타 읽기) 영상 파일에서 총 프레임 수와 FPS를 읽어온다.
+    - index: seek_index.SeekIndex. 주면 컨테이너가 보고하는 값(CAP_PROP_FRAME_COUNT,
+      추정치일 수 있음) 대신 스캔한 실제 프레임 수를 쓴다.
+    - video_path 자리에 VideoSource 를 주면 캐시된 메타를 돌려준다 (캡처를 다시 열지 않음).
+    - 실패 시 RuntimeError 발생.
+    """
+    if index is not None:
+        return index.frame_count, index.fps
+    with _source(video_path) as src:
+        return src.meta()  # (총 프레임 수, 초당 프레임(FPS))
+
+def sec_to_frame_range(start_sec: float, end_sec: float, fps: float, index=None):
+    """
+    (초 → 프레임 인덱스) start_sec ~ end_sec 구간을 (start_f, end_f) 로 변환한다.
+    - index: SeekIndex 를 주면 fps 곱셈 대신 실제 PTS 로 찾는다 (가변 FPS 영상도 정확).
+    - end_f 가 start_f 보다 앞이면 ValueError 발생.
+    """
+    if index is not None:
+        start_f = index.time_to_frame(max(0.0, start_sec))
+        end_f   = index.time_to_frame(max(0.0, end_sec))
+    else:
+        start_f = max(0, int(round(start_sec * fps)))
+        end_f   = max(0, int(round(end_sec   * fps)))
+    if end_f < start_f:
+        raise ValueError("end frame is before start frame.")
+    return start_f, end_f
 
 def extract_frames_range(video_path: Path, output_dir: Path,
                          start_sec: float, end_sec: float,
-                         zero_pad: int = 6, start_index: int = 0) -> int:
+                         zero_pad: int = 6, start_index: int = 0,
+                         workers: int = 1, writers: int = 0,
+                         frame_format: str = "png", quality=None,
+                         proxy_size=None, on_progress=None,
+                         progress_every: int = 25, scorer=None, index=None,
+                         quota=None, stride: int = 1, max_frames=None,
+                         max_bytes=None, store=None) -> int:
     """
     (프레임 추출 핵심)
     - video_path: 입력 영상 경로
@@ -29,70 +348,486 @@ def extract_frames_range(video_path: Path, output_dir: Path,
     - start_sec ~ end_sec: 잘라낼 구간(초 단위)
     - zero_pad: 출력 파일명에 사용할 제로패딩 자릿수 (예: 000123.png)
     - start_index: 저장 파일의 시작 인덱스 (연속 저장 시 유용)
+    - workers: 2 이상이면 구간을 연속 세그먼트로 나눠 프로세스별로 병렬 추출
+      (0 이하면 CPU 코어 수). 파일명/개수는 1 (직렬)일 때와 같다.
+    - writers: 1 이상이면 디코딩과 PNG 인코딩/쓰기를 분리한 파이프라인으로 저장
+      (디코더 1 + 쓰기 스레드 writers 개, 큐 크기 제한으로 메모리 일정)
+    - frame_format / quality: 저장 포맷 (FRAME_FORMATS 참고, 기본은 PNG 기본 압축)
+    - proxy_size: (w, h) 를 주면 원본 대신 그 크기의 썸네일 프록시만 저장
+      (원본 해상도는 필요할 때 iter_frames_at 으로 다시 디코딩)
+    - on_progress: 저장이 끝난 (영상 기준) 프레임 인덱스 리스트를 progress_every 장마다 받는 콜백.
+      추출이 끝나기 전에 화면을 먼저 띄우는 용도 (추출 스레드/수집 스레드에서 호출됨)
+    - scorer: frame_quality.FrameScorer. 주면 디코딩한 프레임마다 품질 점수를 같이 계산
+      (저장 파일을 다시 읽지 않음, 병렬 모드는 워커에서 계산해 부모로 전달)
+    - index: seek_index.SeekIndex. 주면 초 → 프레임 변환을 실제 PTS 로 하고,
+      시작점 이동을 직전 키프레임 점프 + grab() 으로 한다
+    - quota: workspace.DiskQuota. 파일을 쓸 때마다 크기를 더하고, 한도를 넘으면
+      그때까지 저장한 프레임은 남긴 채 DiskQuotaExceeded 로 멈춘다
+    - stride: stride 프레임마다 1장만 저장 (사이는 grab()/seek 로 건너뜀).
+      파일명은 stride 와 상관없이 구간 시작 기준 오프셋 (start_index + (f - start_f)).
+    - max_frames / max_bytes: (예산) 주면 저장 장수/예상 용량이 넘지 않도록 stride 를 자동으로 키운다
+      (choose_stride). 구간이 아무리 길어도 시간/디스크가 예산 안에서 끝난다.
+
+    - video_path: 경로 대신 VideoSource 를 주면 그 캡처/메타를 다시 쓴다 (열기 비용 없음)
+    - store: frame_store.FrameStore (frame_format="memory"). 파일 대신 메모리에 보관하고,
+      파일명 규칙의 경로를 키로 쓴다. 프레임이 이 프로세스에 있어야 하므로 workers 는 1 로 고정
 
     반환값: 저장한 프레임 수
     """
-    cap = cv2.VideoCapture(str(video_path))
-    if not cap.isOpened():
-        raise RuntimeError(f"cannot open video: {video_path}")
+    with _source(video_path) as src:
+        return _extract_range(src, output_dir, start_sec, end_sec, zero_pad, start_index,
+                              workers, writers, frame_format, quality, proxy_size,
+                              on_progress, progress_every, scorer, index, quota, stride,
+                              max_frames, max_bytes, store)
 
-    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    fps   = float(cap.get(cv2.CAP_PROP_FPS)) or 0.0
+def _extract_range(src: VideoSource, output_dir: Path, start_sec: float, end_sec: float,
+                   zero_pad: int, start_index: int, workers: int, writers: int,
+                   frame_format: str, quality, proxy_size, on_progress, progress_every: int,
+                   scorer, index, quota, stride: int, max_frames, max_bytes, store) -> int:
+    ext = frame_ext(frame_format)
+    save_opts = {"frame_format": frame_format, "quality": quality, "proxy_size": proxy_size}
+
+    total, fps = get_video_meta(src, index)
 
     # (로그) 입력/출력 정보 표시
-    info(f"video: {video_path}")
+    info(f"video: {src.path}")
     info(f"total frames (reported): {total if total > 0 else 'unknown'}")
-    info(f"saving to: {output_dir.resolve()}")
+    info(f"saving to: {'memory' if store is not None else output_dir.resolve()}")
     # 파일명 패턴 안내 (예: 000001.png 형태)
-    info(f"filename pattern: {{index:0{zero_pad}d}}.png (start={start_index})")
+    info(f"filename pattern: {{index:0{zero_pad}d}}{ext} (start={start_index})")
 
     # FPS가 0 또는 NaN이면 추출 불가
     if fps <= 0:
-        cap.release()
         raise RuntimeError("invalid FPS (0 or NaN).")
 
     # (초 → 프레임 인덱스) 변환 및 유효성 체크
-    start_f = max(0, int(round(start_sec * fps)))
-    end_f   = max(0, int(round(end_sec   * fps)))
+    start_f, end_f = sec_to_frame_range(start_sec, end_sec, fps, index)
+
+    if max_frames or max_bytes:
+        budget_opts = save_opts if store is None else {**save_opts, "proxy_size": store.size}
+        stride = max(stride, choose_stride(src, start_f, end_f, max_frames, max_bytes,
+                                           index=index, **budget_opts))
+    if stride > 1:
+        info(f"budget: every {stride} frames (~{(end_f - start_f) // stride + 1} frames)")
+
+    return _extract_span(src, output_dir, start_f, end_f,
+                         zero_pad, start_index, workers, writers, save_opts,
+                         _make_progress(on_progress, progress_every), scorer, index, quota,
+                         stride, store)
+
+def extract_frames_span(video_path: Path, output_dir: Path, start_f: int, end_f: int,
+                        zero_pad: int = 6, start_index: int = 0,
+                        workers: int = 1, writers: int = 0,
+                        frame_format: str = "png", quality=None,
+                        proxy_size=None, on_progress=None,
+                        progress_every: int = 25, scorer=None, index=None,
+                        quota=None, stride: int = 1, store=None) -> int:
+    """
+    (프레임 인덱스 구간 추출) extract_frames_range 와 같지만 구간을 초 대신
+    프레임 인덱스 start_f ~ end_f (양끝 포함) 로 받는다.
+    - 파일명은 start_index 부터 (start_f 에 해당).
+    - stride: start_f, start_f + stride, ... 만 저장 (예산 간격은 choose_stride 로 계산)
+    반환값: 저장한 프레임 수
+    """
+    frame_ext(frame_format)
+    save_opts = {"frame_format": frame_format, "quality": quality, "proxy_size": proxy_size}
     if end_f < start_f:
-        cap.release()
         raise ValueError("end frame is before start frame.")
 
-    # 출력 디렉터리 준비
-    output_dir.mkdir(parents=True, exist_ok=True)   # 폴더 보장
+    with _source(video_path) as src:
+        return _extract_span(src, output_dir, start_f, end_f,
+                             zero_pad, start_index, workers, writers, save_opts,
+                             _make_progress(on_progress, progress_every), scorer, index, quota,
+                             stride, store)
+
+def score_frames_span(video_path: Path, start_f: int, end_f: int, scorer,
+                      index=None) -> int:
+    """
+    (점수만 계산) start_f ~ end_f 를 디코딩해 scorer 에 넣기만 하고 파일은 쓰지 않는다.
+    - 헤드리스 일괄 처리처럼 고른 프레임만 저장하면 될 때 임시 프레임 쓰기/삭제 비용을 없앤다.
+    반환값: 디코딩한 프레임 수
+    """
+    n = 0
+    with _source(video_path) as src, src.lease() as cap:
+        _seek(cap, start_f, index)
+        for f in range(start_f, end_f + 1):
+            with span("read"):
+                ok, frame = cap.read()
+            if not ok:
+                break
+            scorer.add(f, frame)
+            n += 1
+    scorer.flush()
+    return n
+
+def _extract_span(src: VideoSource, output_dir: Path, start_f: int, end_f: int,
+                  zero_pad: int, start_index: int, workers: int, writers: int,
+                  save_opts: dict, progress=None, scorer=None, index=None,
+                  quota=None, stride: int = 1, store=None) -> int:
+    """src 로 start_f ~ end_f 를 저장 (직렬: src 의 캡처를 빌려 씀 / 병렬: 워커가 각자 염)."""
+    # 출력 디렉터리 준비 (메모리 보관이면 디스크는 건드리지 않음)
+    if store is None:
+        output_dir.mkdir(parents=True, exist_ok=True)   # 폴더 보장
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, (end_f - start_f) // stride + 1)
+    if store is not None:
+        workers = 1  # (메모리) 워커 프로세스의 프레임은 이 프로세스 메모리로 못 가져옴
+
+    try:
+        if workers > 1:
+            # (병렬) 세그먼트마다 워커 프로세스가 자기 캡처를 연다
+            saved = _extract_parallel(src.path, output_dir, start_f, end_f,
+                                      zero_pad, start_index, workers, writers, save_opts,
+                                      progress, scorer, index, quota, stride)
+        else:
+            with src.lease() as cap:
+                saved = _write_frames(cap, output_dir, start_f, end_f, zero_pad, start_index,
+                                      writers, save_opts, progress, scorer, index, quota,
+                                      stride, store)
+    finally:
+        # (순서) 점수를 먼저 마무리해야 마지막 진행 이벤트를 받은 쪽에서 점수까지 볼 수 있다
+        # (용량 한도 등으로 중간에 멈춰도 그때까지 저장한 프레임은 알린다)
+        if scorer is not None:
+            scorer.flush()
+        if progress is not None:
+            progress.flush()
 
+    done(f"saved {saved} frames to {'memory' if store is not None else output_dir.resolve()}")
+    return saved
+
+def _write_frames(cap, output_dir: Path, start_f: int, end_f: int,
+                  zero_pad: int, idx_out: int, writers: int = 0,
+                  save_opts=None, progress=None, scorer=None, index=None,
+                  quota=None, stride: int = 1, store=None) -> int:
+    """
+    (핵심 루프) 열린 cap 을 start_f 로 옮긴 뒤 end_f 까지 한 프레임씩 읽어 저장.
+    - idx_out: start_f 에 해당하는 저장 파일명 인덱스
+    - writers: 1 이상이면 _write_frames_pipelined 로 처리
+    - save_opts: write_frame 에 넘길 저장 옵션 (frame_format / quality / proxy_size)
+    - progress: _ProgressBatcher (저장이 끝난 프레임 인덱스 통지, 마지막 flush 는 호출자 몫)
+    - scorer: FrameScorer (프레임마다 품질 점수 계산, 마지막 flush 는 호출자 몫)
+    - index: SeekIndex (시작점 이동에 사용)
+    - quota: DiskQuota (저장한 파일 크기 누적, 한도 초과 시 DiskQuotaExceeded)
+    - stride: 1 보다 크면 저장한 프레임 사이를 _skip_to 로 건너뛴다
+      (파일명 인덱스도 stride 만큼 건너뛰어 프레임 오프셋과 맞춘다)
+    - store: FrameStore 면 파일 대신 메모리에 보관 (키는 같은 파일명 경로)
+    반환값: 저장한 프레임 수 (영상이 먼저 끝나면 그만큼 적음)
+    """
     # (중요) 시작 프레임으로 이동
-    cap.set(cv2.CAP_PROP_POS_FRAMES, start_f)
+    _seek(cap, start_f, index)
+
+    if writers > 0:
+        return _write_frames_pipelined(cap, output_dir, start_f, end_f,
+                                       zero_pad, idx_out, writers, save_opts,
+                                       progress=progress, scorer=scorer, quota=quota,
+                                       index=index, stride=stride, store=store)
+
+    save_opts = save_opts or {}
+    ext = frame_ext(save_opts.get("frame_format", "png"))
 
-    # 저장 인덱스 및 카운터 초기화
-    idx_out = start_index  # 저장 파일명 인덱스 시작값
     saved = 0              # 실제 저장된 프레임 수
     cur_f = start_f        # 현재 읽을 프레임 인덱스
 
-    # (핵심 루프) start_f ~ end_f 구간을 한 프레임씩 읽어 PNG로 저장
     while cur_f <= end_f:
-        ok, frame = cap.read()
+        with span("read"):
+            ok, frame = cap.read()
         if not ok:
             # 영상이 여기서 끝나거나 읽기 실패 시 중단
             break
 
         # 출력 파일 경로
-        out_path = output_dir / f"{idx_out:0{zero_pad}d}.png"  # 예: ...\zzalkak_video\000000.png
+        out_path = output_dir / f"{idx_out:0{zero_pad}d}{ext}"  # 예: ...\zzalkak_video\000000.png
 
-        # PNG 저장 실패 시 즉시 에러
-        if not cv2.imwrite(str(out_path), frame):   # 프레임 저장
-            cap.release()
-            raise RuntimeError(f"failed to write image: {out_path}")
+        # 프레임 저장 (실패 시 즉시 에러)
+        _save_frame(out_path, frame, save_opts, quota, store)
+        if scorer is not None:
+            scorer.add(cur_f, frame)
 
         # 100장 단위로 진행 로그
         if idx_out % 100 == 0:
             info(f"saved: {out_path.name}")
+        if progress is not None:
+            progress.add(cur_f)
 
         # 다음 프레임/파일 인덱스로 진행
-        idx_out += 1
+        idx_out += stride
         saved += 1
-        cur_f  += 1
+        cur_f  += stride
+        if stride > 1 and cur_f <= end_f and not _skip_to(cap, cur_f - stride + 1, cur_f, index):
+            break
+
+    return saved
+
+def _write_frames_pipelined(cap, output_dir: Path, start_f: int, end_f: int,
+                           zero_pad: int, idx_out: int, writers: int,
+                           save_opts=None, queue_size: int = 0, progress=None,
+                           scorer=None, quota=None, index=None, stride: int = 1,
+                           store=None) -> int:
+    """
+    (파이프라인) 현재 스레드는 cap.read() 만 하고, 쓰기 스레드 writers 개가
+    인코딩/저장을 맡는다.
+    - 큐 크기(기본 writers*2)가 차면 디코더가 기다리므로 메모리에 쌓이는 프레임 수가 고정된다.
+    - 어느 쓰기 스레드에서든 실패하면 디코딩을 멈추고 직렬 경로와 같은 예외
+      (RuntimeError / DiskQuotaExceeded) 를 던진다.
+    """
+    save_opts = save_opts or {}
+    ext = frame_ext(save_opts.get("frame_format", "png"))
+    q = queue.Queue(maxsize=queue_size or writers * 2)
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            if stop.is_set():
+                continue  # 실패 이후 남은 프레임은 버리고 종료 신호까지 비우기만
+            frame_idx, out_path, frame = item
+            try:
+                try:
+                    _save_frame(out_path, frame, save_opts, quota, store)
+                except DiskQuotaExceeded:
+                    raise
+                except (cv2.error, OSError, RuntimeError) as e:
+                    raise RuntimeError(f"failed to write image: {out_path}") from e
+                if scorer is not None:
+                    scorer.add(frame_idx, frame)  # 점수 계산도 쓰기 스레드에서 (디코더는 안 기다림)
+                if int(out_path.stem) % 100 == 0:
+                    info(f"saved: {out_path.name}")
+                if progress is not None:
+                    progress.add(frame_idx)
+            except Exception as e:
+                # (중요) 어떤 예외든 기록하고 디코더를 멈춘다 - 쓰기 스레드가 그냥 죽으면
+                # 디코더가 가득 찬 큐의 put 에서 영원히 기다린다
+                errors.append(e)
+                stop.set()
+
+    threads = [threading.Thread(target=writer, daemon=True) for _ in range(writers)]
+    for t in threads:
+        t.start()
+
+    saved = 0
+    cur_f = start_f
+    try:
+        while cur_f <= end_f and not stop.is_set():
+            with span("read"):
+                ok, frame = cap.read()
+            if not ok:
+                break
+            out_path = output_dir / f"{idx_out:0{zero_pad}d}{ext}"
+            q.put((cur_f, out_path, frame))  # 큐가 가득 차면 여기서 대기 (back-pressure)
+            idx_out += stride
+            saved += 1
+            cur_f  += stride
+            if stride > 1 and cur_f <= end_f and not _skip_to(cap, cur_f - stride + 1, cur_f, index):
+                break
+    finally:
+        for _ in threads:
+            q.put(None)
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+    return saved
+
+def split_segments(start_f: int, end_f: int, n: int) -> list[tuple[int, int]]:
+    """
+    [start_f, end_f] 를 n 개의 연속 구간 (a, b) 로 나눈다 (양끝 포함).
+    - 구간끼리 겹치거나 비는 프레임이 없고, 길이 차이는 최대 1.
+    """
+    total = end_f - start_f + 1
+    n = max(1, min(n, total))
+    base, extra = divmod(total, n)
+    segs = []
+    a = start_f
+    for i in range(n):
+        b = a + base + (1 if i < extra else 0) - 1
+        segs.append((a, b))
+        a = b + 1
+    return segs
+
+def _init_worker(instrumented: bool = False):
+    # OpenCV 내부 스레드 수가 프로세스 수와 곱해지지 않도록 워커당 1 스레드
+    cv2.setNumThreads(1)
+    # (계측) 새 프로세스는 계측 상태를 물려받지 않으므로 부모 설정을 그대로 적용
+    instrument.enable(instrumented)
+
+def _extract_segment(video_path: Path, output_dir: Path, seg_start: int, seg_end: int,
+                     zero_pad: int, idx_out: int, writers: int = 0,
+                     save_opts=None, progress_q=None, progress_every: int = 0,
+                     score: bool = False, index=None, quota=None, stride: int = 1) -> int:
+    """
+    (워커 프로세스) 자기 캡처를 열어 seg_start ~ seg_end 만 저장.
+    - progress_q: 부모로 보낼 Manager 큐
+      · progress_every > 0 이면 진행 이벤트(프레임 인덱스 리스트)
+      · score 이면 품질 점수와 지각 해시 ("scores", {frame_idx: 지표}, {frame_idx: 해시})
+      · 계측이 켜져 있으면 끝날 때 구간 시간 ("spans", instrument.raw())
+      · quota 가 있으면 끝날 때 쓴 바이트 수 ("bytes", n)
+    - quota: 이 세그먼트 몫의 DiskQuota (부모 한도를 워커 수로 나눈 것)
+    """
+    progress = None
+    if progress_q is not None and progress_every > 0:
+        progress = _ProgressBatcher(progress_q.put, progress_every)
+    scorer = None
+    if progress_q is not None and score:
+        scorer = FrameScorer(on_batch=lambda m, h: progress_q.put(("scores", m, h)))
+
+    cap = _open_capture(video_path)
+    try:
+        return _write_frames(cap, output_dir, seg_start, seg_end, zero_pad, idx_out,
+                             writers, save_opts, progress, scorer, index, quota, stride)
+    finally:
+        cap.release()
+        if scorer is not None:
+            scorer.flush()
+        if progress is not None:
+            progress.flush()
+        if progress_q is not None and quota is not None:
+            progress_q.put(("bytes", quota.used))
+        if progress_q is not None and instrument.enabled():
+            # 풀 워커는 여러 세그먼트에 재사용되므로 보낸 만큼은 비운다
+            progress_q.put(("spans", instrument.raw()))
+            instrument.reset()
+
+def _extract_parallel(video_path: Path, output_dir: Path, start_f: int, end_f: int,
+                      zero_pad: int, start_index: int, workers: int,
+                      writers: int = 0, save_opts=None, progress=None,
+                      scorer=None, index=None, quota=None, stride: int = 1) -> int:
+    """
+    (병렬 추출) 구간을 workers 개의 연속 세그먼트로 나눠 프로세스 풀에서 추출.
+    - 각 세그먼트는 start_index + (a - start_f) 부터 자기 몫의 파일명만 쓰므로
+      직렬 추출과 같은 파일들이 만들어진다.
+    - 세그먼트 시작점 이동은 cap.set(POS_FRAMES) 에 의존하므로, 프레임 단위 seek 이
+      정확한 컨테이너(일반적인 MP4/MKV)를 전제로 한다. index 를 주면 키프레임에서
+      grab() 으로 전진하므로 이 전제가 약해진다.
+    - progress / scorer / quota 가 있거나 계측이 켜져 있으면 워커들이 Manager 큐로 보낸
+      진행 이벤트/점수/쓴 바이트/구간 시간을 이 스레드에서 전달한다.
+    - quota: 남은 한도를 세그먼트 수로 나눠 워커마다 따로 검사한다 (프로세스끼리 공유 안 함).
+    """
+    # (간격) stride 격자 위의 표본 번호로 나눈 뒤 프레임 인덱스로 되돌린다
+    #  → 세그먼트마다 시작점이 격자 위에 있어 직렬과 같은 프레임이 저장된다
+    samples = split_segments(0, (end_f - start_f) // stride, workers)
+    segs = [(start_f + a * stride, start_f + b * stride) for a, b in samples]
+    info(f"parallel: {len(segs)} segments over {workers} workers")
+    instrumented = instrument.enabled()
+
+    shares = quota.split(len(segs)) if quota is not None else [None] * len(segs)
+
+    if progress is None and scorer is None and quota is None and not instrumented:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+            futures = [
+                ex.submit(_extract_segment, video_path, output_dir, a, b,
+                          zero_pad, start_index + (a - start_f), writers, save_opts,
+                          index=index, stride=stride)
+                for a, b in segs
+            ]
+            # 영상이 세그먼트 중간에 끝나면 그 뒤 세그먼트들은 0장 → 구멍 없이 직렬과 같은 결과
+            return sum(fut.result() for fut in futures)
+
+    with multiprocessing.Manager() as mgr, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(instrumented,)) as ex:
+        progress_q = mgr.Queue()
+        futures = [
+            ex.submit(_extract_segment, video_path, output_dir, a, b,
+                      zero_pad, start_index + (a - start_f), writers, save_opts,
+                      progress_q, progress._every if progress else 0, scorer is not None,
+                      index, share, stride)
+            for (a, b), share in zip(segs, shares)
+        ]
+
+        def drain():
+            while True:
+                try:
+                    item = progress_q.get_nowait()
+                except queue.Empty:
+                    return
+                if isinstance(item, tuple) and item[0] == "scores":
+                    scorer.merge(item[1], item[2])
+                    continue
+                if isinstance(item, tuple) and item[0] == "spans":
+                    instrument.merge(item[1])
+                    continue
+                if isinstance(item, tuple) and item[0] == "bytes":
+                    quota.record(item[1])
+                    continue
+                for f in item:
+                    progress.add(f)
+
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            drain()
+        drain()
+        return sum(fut.result() for fut in futures)
+
+def iter_frames_at(video_path: Path, frame_indices, seek_gap: int = 30, index=None):
+    """
+    (희소 디코딩) 지정한 프레임 인덱스들만 디코딩해서 (frame_idx, BGR 배열) 로 하나씩 돌려준다.
+    - frame_indices: 읽을 (영상 기준) 프레임 인덱스들. 순서/중복 무관 (오름차순으로 나옴).
+    - seek_gap: 다음 목표까지 이 값보다 멀면 cap.set 으로 점프, 가까우면 grab() 으로 건너뛴다.
+      (grab 은 디코딩/색변환 없이 다음 프레임으로만 이동하므로 짧은 거리에선 seek 보다 싸다)
+    - index: SeekIndex 를 주면 seek_gap 대신 키프레임 위치로 판단한다. 현재 위치와 목표 사이에
+      키프레임이 있을 때만 점프하고 (어차피 그 키프레임부터 디코딩해야 하므로), 없으면 grab().
+      raw 패킷 모드를 못 써서 키프레임 정보가 없는 인덱스(has_keyframes=False)면 seek_gap 기준을 쓴다.
+    - video_path 자리에 VideoSource 를 주면 그 캡처를 빌려 쓴다 (다 돌 때까지 그 캡처는 이 호출 전용).
+    - 영상 끝을 넘은 인덱스는 나오지 않는다.
+    """
+    targets = sorted(set(int(f) for f in frame_indices))
+    if not targets:
+        return
+
+    pos = -1  # 다음 read() 가 돌려줄 프레임 인덱스 (-1: 아직 모름)
+    with _source(video_path) as src, src.lease() as cap:
+        for f in targets:
+            # (이동) 뒤로 가야 하거나 멀면 seek, 가까우면 grab 으로 전진
+            if index is not None and index.has_keyframes:
+                jump = pos < 0 or f < pos or index.keyframe_before(f) > pos
+            else:
+                jump = pos < 0 or f < pos or f - pos > seek_gap
+            if jump:
+                _seek(cap, f, index)
+                pos = f
+            while pos < f:
+                if not cap.grab():
+                    break
+                pos += 1
+            if pos != f:
+                break  # grab 도중 영상 끝
+
+            with span("read"):
+                ok, frame = cap.read()
+            if not ok:
+                break  # 영상 끝 또는 읽기 실패 → 이후 인덱스도 없음
+            pos += 1
+            yield f, frame
+
+def extract_frames_at(video_path: Path, output_dir: Path, frame_indices,
+                      base_frame: int = 0, zero_pad: int = 6, start_index: int = 0,
+                      seek_gap: int = 30, frame_format: str = "png", quality=None,
+                      proxy_size=None, index=None, quota=None, store=None) -> list[int]:
+    """
+    (희소 추출) 지정한 프레임 인덱스들만 디코딩해서 저장한다.
+    - base_frame: 파일명 0번에 해당하는 프레임 인덱스 (보통 구간의 start_f)
+      → 파일명은 start_index + (frame - base_frame) 로, 전체 추출 때와 같은 이름이 된다.
+    - 나머지 인자는 iter_frames_at / extract_frames_range 와 같다 (store 도 같음).
+
+    반환값: 실제로 저장한 프레임 인덱스 리스트 (영상 끝을 넘은 인덱스는 빠짐)
+    """
+    ext = frame_ext(frame_format)
+    save_opts = {"frame_format": frame_format, "quality": quality, "proxy_size": proxy_size}
+    if store is None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    saved = []
+    for f, frame in iter_frames_at(video_path, frame_indices, seek_gap, index):
+        out_path = output_dir / f"{start_index + f - base_frame:0{zero_pad}d}{ext}"
+        _save_frame(out_path, frame, save_opts, quota, store)
+        saved.append(f)
 
-    cap.release()
-    done(f"saved {saved} frames to {output_dir.resolve()}")
+    info(f"sparse: saved {len(saved)} frames to {'memory' if store is not None else output_dir.resolve()}")
     return saved
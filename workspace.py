@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from console import info, warn
+from instrument import span
+
+SESSION_PREFIX = "session-"
+TRASH_SUFFIX = ".trash"
+OWNER_FILE = ".owner.json"
+TMPFS_ROOT = Path("/dev/shm")   # (설정) Linux 메모리 파일시스템 (없으면 디스크 사용)
+
+
+class DiskQuotaExceeded(RuntimeError):
+    """작업 공간 용량 한도(또는 디스크 여유 공간 하한)에 걸려 추출을 멈춤."""
+
+
+class DiskQuota:
+    """
+    (용량 한도) 작업 공간에 쓴 바이트를 세다가 한도를 넘으면 DiskQuotaExceeded.
+    - max_bytes: 작업 공간 최대 용량 (None 이면 제한 없음)
+    - min_free_bytes: 디스크 여유 공간이 이보다 적어지면 멈춤 (check_every 바이트마다 확인)
+    - 여러 스레드에서 charge 해도 안전하고, 병렬 추출 워커로 보낼 수 있도록 pickle 가능.
+    """
+
+    def __init__(self, path: Path, max_bytes=None, min_free_bytes: int = 0,
+                 check_every: int = 32 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.min_free_bytes = min_free_bytes
+        self.check_every = check_every
+        self.used = 0
+        self._next_check = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, nbytes: int):
+        """한도 검사 없이 더하기만 (병렬 워커가 끝난 뒤 보고한 양)."""
+        with self._lock:
+            self.used += nbytes
+
+    def charge(self, nbytes: int):
+        with self._lock:
+            self.used += nbytes
+            used = self.used
+            check_disk = self.min_free_bytes > 0 and used >= self._next_check
+            if check_disk:
+                self._next_check = used + self.check_every
+        if self.max_bytes is not None and used > self.max_bytes:
+            raise DiskQuotaExceeded(f"workspace quota exceeded: {used / 1024 ** 2:.0f} MB "
+                                    f"> {self.max_bytes / 1024 ** 2:.0f} MB ({self.path})")
+        if check_disk and shutil.disk_usage(self.path).free < self.min_free_bytes:
+            raise DiskQuotaExceeded(f"disk almost full: less than "
+                                    f"{self.min_free_bytes / 1024 ** 3:.2f} GB free ({self.path})")
+
+    def split(self, n: int) -> list["DiskQuota"]:
+        """남은 한도를 n 등분한 독립 DiskQuota 들 (병렬 세그먼트용, used 는 0 부터)."""
+        remaining = None if self.max_bytes is None else max(0, self.max_bytes - self.used) // n
+        return [DiskQuota(self.path, remaining, self.min_free_bytes, self.check_every)
+                for _ in range(n)]
+
+    def reset(self):
+        with self._lock:
+            self.used = 0
+            self._next_check = 0
+
+
+def _pid_alive(pid: int):
+    """POSIX 에서만 확인 가능 (Windows 의 os.kill 은 프로세스를 종료시키므로 쓰지 않음). 모르면 None."""
+    if sys.platform == "win32":
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _delete_tree(path: Path):
+    """이름을 먼저 바꿔 즉시 안 보이게 한 뒤 지운다 (중간에 죽어도 다음 sweep 이 정리)."""
+    trash = path.with_name(path.name + TRASH_SUFFIX)
+    try:
+        path.rename(trash)
+    except OSError:
+        trash = path
+    with span("rmtree"):
+        shutil.rmtree(trash, ignore_errors=True)
+
+
+class Workspace:
+    """
+    (작업 공간) 실행(세션)마다 임시 프레임 폴더를 따로 만든다.
+    - 구조: <root>/<name>/session-<시각>-<pid>-<임의>/run-<n>/  (시간을 다시 설정할 때마다 run 이 바뀜)
+    - tmpfs=True 이고 /dev/shm 이 있으면 메모리 파일시스템에 만든다 (디스크 IO 없음, 대신 RAM 사용).
+    - 이전 run / 세션 폴더는 백그라운드 스레드에서 지워서 창이 멈추지 않는다.
+    - sweep_stale: 이전에 비정상 종료한 실행이 남긴 세션 폴더를 정리한다.
+    """
+
+    def __init__(self, base: Path, name: str, tmpfs: bool = False,
+                 quota_gb=None, min_free_gb: float = 1.0, stale_hours: float = 24):
+        root = Path(base)
+        if tmpfs:
+            if TMPFS_ROOT.is_dir():
+                root = TMPFS_ROOT / "frame_selector"
+            else:
+                warn(f"tmpfs not available ({TMPFS_ROOT}), using {root}")
+        self.root = root
+        self.stale_hours = stale_hours
+        # 같은 초에 같은 이름으로 만들어도 (큐 모드 미리 준비) 겹치지 않도록 mkdtemp 의 임의 접미사를 붙인다
+        (root / name).mkdir(parents=True, exist_ok=True)
+        prefix = f"{SESSION_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-"
+        self.dir = Path(tempfile.mkdtemp(prefix=prefix, dir=root / name))
+        (self.dir / OWNER_FILE).write_text(
+            json.dumps({"pid": os.getpid(), "started": time.time()}), encoding="utf-8")
+
+        max_bytes = None if quota_gb is None else int(quota_gb * 1024 ** 3)
+        self.quota = DiskQuota(self.dir, max_bytes, int(min_free_gb * 1024 ** 3))
+        self.run_dir = None
+        self._runs = 0
+        self._threads = []
+
+    def new_run(self) -> Path:
+        """새 run 폴더를 만들고, 이전 run 폴더는 백그라운드에서 지운다."""
+        old = self.run_dir
+        self._runs += 1
+        self.run_dir = self.dir / f"run-{self._runs}"
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.quota.reset()
+        if old is not None:
+            self.delete_async(old)
+        return self.run_dir
+
+    def delete_async(self, path: Path):
+        # daemon 이 아니므로 창을 닫은 뒤에도 삭제가 끝날 때까지 프로세스가 남는다
+        t = threading.Thread(target=_delete_tree, args=(path,), name="workspace-rm")
+        t.start()
+        self._threads.append(t)
+
+    def close(self):
+        """세션 폴더 전체를 백그라운드에서 삭제 (기다리지 않음)."""
+        if self.dir.exists():
+            info(f"cleanup: deleting session directory in background: {self.dir}")
+            self.delete_async(self.dir)
+
+    def wait(self, timeout=None):
+        for t in self._threads:
+            t.join(timeout)
+
+    def _is_stale(self, session: Path) -> bool:
+        if session == self.dir:
+            return False
+        if session.name.endswith(TRASH_SUFFIX):
+            return True  # 지우다 만 폴더
+        try:
+            owner = json.loads((session / OWNER_FILE).read_text(encoding="utf-8"))
+            alive = _pid_alive(int(owner["pid"]))
+            started = float(owner["started"])
+        except (OSError, ValueError, KeyError):
+            alive, started = None, session.stat().st_mtime
+        if alive is not None:
+            return not alive
+        # 살아 있는지 알 수 없는 OS 면 나이로만 판단
+        return time.time() - started > self.stale_hours * 3600
+
+    def sweep_stale(self) -> list[Path]:
+        """(시작 시) 죽은 프로세스 / 오래된 세션 폴더를 찾아 백그라운드 삭제. 찾은 목록 반환."""
+        with span("glob"):
+            sessions = list(self.root.glob(f"*/{SESSION_PREFIX}*"))
+        stale = []
+        for session in sessions:
+            try:
+                if session.is_dir() and self._is_stale(session):
+                    stale.append(session)
+            except OSError:
+                continue
+        for session in stale:
+            info(f"cleanup: removing stale session {session}")
+            self.delete_async(session)
+        return stale